@@ -1,80 +1,184 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 import numpy as np
-from sqlalchemy import func, and_
+from sqlalchemy import func, case, literal, select, union_all
 from models import (
-    User, MoodEntry, GratitudeEntry, UserStrategies,
+    MoodEntry, GratitudeEntry, UserStrategies,
     UserResources, VoiceInteractions, UserGroups
 )
+from utils.report_cache import get_report_cache
 
 logger = logging.getLogger(__name__)
 
+# Engagement metric -> (per-user event table, its time column)
+ENGAGEMENT_SOURCES = {
+    'mood_entries': (MoodEntry, MoodEntry.created_at),
+    'gratitude_entries': (GratitudeEntry, GratitudeEntry.created_at),
+    'voice_interactions': (VoiceInteractions, VoiceInteractions.created_at),
+    'resource_access': (UserResources, UserResources.accessed_at),
+    'strategy_usage': (UserStrategies, UserStrategies.tried_at),
+}
+
+# Trailing windows (in days) that voice interactions are counted over
+SOCIAL_WINDOWS = {'last_7_days': 7, 'last_30_days': 30}
+
 class AnalyticsProcessor:
+    # User ids per engagement statement; keeps IN lists well under driver bind limits
+    ENGAGEMENT_BATCH_SIZE = 1000
+    # Active groups and voice interactions per week that max out their part of the social score
+    SOCIAL_TARGET_GROUPS = 2
+    SOCIAL_TARGET_WEEKLY_INTERACTIONS = 3
+
     def __init__(self, db):
         self.db = db
 
     def calculate_user_engagement(self, user_id: int, days: int = 30) -> Dict:
         """Calculate user engagement metrics over a specified period."""
+        return self.calculate_users_engagement([user_id], days)[user_id]
+
+    def calculate_users_engagement(self, user_ids: List[int], days: int = 30) -> Dict[int, Dict]:
+        """
+        Engagement metrics for many users at once, keyed by user id.
+        
+        All five counts for up to ENGAGEMENT_BATCH_SIZE users come back from a
+        single UNION ALL of grouped counts, one index range scan per table.
+        """
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        metrics = {
-            'mood_entries': self._count_mood_entries(user_id, start_date, end_date),
-            'gratitude_entries': self._count_gratitude_entries(user_id, start_date, end_date),
-            'voice_interactions': self._count_voice_interactions(user_id, start_date, end_date),
-            'resource_access': self._count_resource_access(user_id, start_date, end_date),
-            'strategy_usage': self._count_strategy_usage(user_id, start_date, end_date)
-        }
+        user_ids = list(dict.fromkeys(user_ids))
+        counts = {user_id: dict.fromkeys(ENGAGEMENT_SOURCES, 0) for user_id in user_ids}
+        for i in range(0, len(user_ids), self.ENGAGEMENT_BATCH_SIZE):
+            query = self._engagement_query(user_ids[i:i + self.ENGAGEMENT_BATCH_SIZE], start_date, end_date)
+            for user_id, metric, count in self.db.session.execute(query):
+                counts[user_id][metric] = count
         
         return {
-            'total_engagement': sum(metrics.values()),
-            'metrics': metrics,
-            'period': {'start': start_date, 'end': end_date}
+            user_id: {
+                'total_engagement': sum(metrics.values()),
+                'metrics': metrics,
+                'period': {'start': start_date, 'end': end_date}
+            }
+            for user_id, metrics in counts.items()
         }
 
     def analyze_mood_trends(self, user_id: int, days: int = 30) -> Dict:
-        """Analyze mood trends and patterns."""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        """Analyze mood trends and patterns from the daily rollup (one row per day)."""
+        return self._section(user_id, 'mood_trends', days)
+
+    def generate_resilience_insights(self, user_id: int) -> Dict:
+        """Generate insights about resilience strategy effectiveness."""
+        return self._section(user_id, 'resilience_insights')
+
+    def analyze_social_engagement(self, user_id: int) -> Dict:
+        """Analyze social engagement patterns."""
+        return self._section(user_id, 'social_engagement')
+
+    def _section(self, user_id: int, section: str, days: int = 30) -> Dict:
+        # One report section, loaded and computed the way full reports are (utils.cohort_reports)
+        from utils.cohort_reports import CohortReportEngine, compute_sections
+        snapshot = CohortReportEngine(self, days=days).load([user_id], sections=(section,))
+        return compute_sections(snapshot, self)[0][1][section]
+
+    def count_users_social_activity(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Group membership and voice interaction aggregates for many users, keyed by user id.
         
-        entries = MoodEntry.query.filter(
-            and_(
-                MoodEntry.user_id == user_id,
-                MoodEntry.created_at.between(start_date, end_date)
-            )
-        ).all()
+        Two grouped statements per ENGAGEMENT_BATCH_SIZE users. No membership
+        or interaction rows (or transcripts) are loaded, so memory does not
+        grow with a user's history.
+        
+        Returns:
+            dict: user id -> {'group_participation', 'active_groups',
+                  'voice_interactions': {'total', <SOCIAL_WINDOWS name>...},
+                  'average_sentiment'}
+        """
+        now = datetime.now()
+        counters = ['total', *SOCIAL_WINDOWS]
         
-        if not entries:
-            return {'error': 'No mood entries found for the period'}
+        user_ids = list(dict.fromkeys(user_ids))
+        activity = {
+            user_id: {
+                'group_participation': 0,
+                'active_groups': [],
+                'voice_interactions': dict.fromkeys(counters, 0),
+                'average_sentiment': None
+            }
+            for user_id in user_ids
+        }
+        for i in range(0, len(user_ids), self.ENGAGEMENT_BATCH_SIZE):
+            groups, voice = self._social_activity_queries(user_ids[i:i + self.ENGAGEMENT_BATCH_SIZE], now)
+            for user_id, group_id, memberships, active_memberships in self.db.session.execute(groups):
+                activity[user_id]['group_participation'] += memberships
+                if active_memberships:
+                    activity[user_id]['active_groups'].append(group_id)
+            for user_id, average_sentiment, *counts in self.db.session.execute(voice):
+                activity[user_id]['voice_interactions'] = dict(zip(counters, counts))
+                activity[user_id]['average_sentiment'] = average_sentiment
+        
+        return activity
+
+    def generate_wellness_report(self, user_id: int, days: int = 30) -> Dict:
+        """
+        Generate a comprehensive wellness report.
+        
+        Every section reads from one snapshot of the user's data, taken with
+        a single statement per table (see utils.cohort_reports), instead of
+        each analysis querying the same tables again.
+        """
+        from utils.cohort_reports import CohortReportEngine, compute_reports
+        snapshot = CohortReportEngine(self, days=days).load([user_id])
+        return compute_reports(snapshot, self)[0][1]
+
+    def get_wellness_report(self, user_id: int, days: int = 30) -> Dict:
+        """
+        generate_wellness_report, served from the report cache while the user's data is unchanged.
         
-        mood_scores = [entry.mood_score for entry in entries]
-        homesickness_scores = [entry.homesickness_level for entry in entries]
+        Cached per day, since the report's window ends today.
+        """
+        return get_report_cache().get_or_compute(
+            self.db.session, user_id, f'wellness:{days}', lambda: self.generate_wellness_report(user_id, days)
+        )
+
+    def generate_cohort_reports(self, user_ids: List[int], write, days: int = 30,
+                                workers: int = 0, batch_size: int = 500) -> int:
+        """
+        Wellness reports for a whole cohort, passed to write(user_id, report) as each batch finishes.
         
+        Uses a few grouped queries per batch of users instead of a dozen per
+        user; see utils.cohort_reports. Returns the number of reports written.
+        """
+        from utils.cohort_reports import CohortReportEngine
+        engine = CohortReportEngine(self, days=days, workers=workers, batch_size=batch_size)
+        return engine.run(user_ids, write)
+
+    # Section builders, shared by the per-user queries above and utils.cohort_reports
+    def _build_mood_trends(self, entry_count: float, mood_sum: float, mood_sum_sq: float,
+                           homesickness_sum: float, homesickness_trend: str, mood_patterns: Dict) -> Dict:
+        """Mood trends from a user's entry count and score sums over the window."""
+        average_mood = mood_sum / entry_count
         return {
-            'average_mood': np.mean(mood_scores),
-            'mood_volatility': np.std(mood_scores),
-            'average_homesickness': np.mean(homesickness_scores),
-            'homesickness_trend': self._calculate_trend(homesickness_scores),
-            'mood_patterns': self._identify_mood_patterns(entries)
+            'average_mood': average_mood,
+            'mood_volatility': np.sqrt(max(mood_sum_sq / entry_count - average_mood ** 2, 0.0)),
+            'average_homesickness': homesickness_sum / entry_count,
+            'homesickness_trend': homesickness_trend,
+            'mood_patterns': mood_patterns
         }
 
-    def generate_resilience_insights(self, user_id: int) -> Dict:
-        """Generate insights about resilience strategy effectiveness."""
-        strategies = UserStrategies.query.filter_by(user_id=user_id).all()
-        
+    def _build_resilience_insights(self, strategies: List, categories: List[str]) -> Dict:
+        """Resilience insights from a user's strategies and each one's category."""
         if not strategies:
             return {'error': 'No strategy usage data found'}
         
         effectiveness_by_category = {}
-        for strategy in strategies:
-            category = strategy.resilience_strategy.category
+        for strategy, category in zip(strategies, categories):
             if category not in effectiveness_by_category:
                 effectiveness_by_category[category] = []
             if strategy.effectiveness_score:
                 effectiveness_by_category[category].append(strategy.effectiveness_score)
         
-        insights = {
+        return {
             'most_effective_category': max(
                 effectiveness_by_category.items(),
                 key=lambda x: np.mean(x[1]) if x[1] else 0
@@ -85,28 +189,23 @@ class AnalyticsProcessor:
             },
             'recommendations': self._generate_strategy_recommendations(strategies)
         }
-        
-        return insights
 
-    def analyze_social_engagement(self, user_id: int) -> Dict:
-        """Analyze social engagement patterns."""
-        groups = UserGroups.query.filter_by(user_id=user_id).all()
-        voice_interactions = VoiceInteractions.query.filter_by(user_id=user_id).all()
-        
+    def _build_social_engagement(self, group_participation: int, active_groups: List[int],
+                                 voice_interactions: Dict[str, int], average_sentiment: Optional[float]) -> Dict:
+        """Social engagement from a user's aggregates, see count_users_social_activity."""
         return {
-            'group_participation': len(groups),
-            'active_groups': [g.group_id for g in groups if g.role != 'inactive'],
-            'voice_interaction_frequency': len(voice_interactions),
-            'social_engagement_score': self._calculate_social_engagement_score(groups, voice_interactions)
+            'group_participation': group_participation,
+            'active_groups': active_groups,
+            'voice_interaction_frequency': voice_interactions['total'],
+            'voice_interactions_by_window': {name: voice_interactions[name] for name in SOCIAL_WINDOWS},
+            'average_voice_sentiment': average_sentiment,
+            'social_engagement_score': self._calculate_social_engagement_score(
+                len(active_groups), voice_interactions, average_sentiment
+            )
         }
 
-    def generate_wellness_report(self, user_id: int) -> Dict:
-        """Generate a comprehensive wellness report."""
-        mood_trends = self.analyze_mood_trends(user_id)
-        resilience_insights = self.generate_resilience_insights(user_id)
-        social_engagement = self.analyze_social_engagement(user_id)
-        engagement_metrics = self.calculate_user_engagement(user_id)
-        
+    def _build_wellness_report(self, mood_trends: Dict, resilience_insights: Dict,
+                               social_engagement: Dict, engagement_metrics: Dict) -> Dict:
         return {
             'overview': {
                 'mood_status': self._interpret_mood_status(mood_trends),
@@ -126,51 +225,49 @@ class AnalyticsProcessor:
         }
 
     # Helper methods
-    def _count_mood_entries(self, user_id: int, start_date: datetime, end_date: datetime) -> int:
-        return MoodEntry.query.filter(
-            and_(
-                MoodEntry.user_id == user_id,
-                MoodEntry.created_at.between(start_date, end_date)
+    def _engagement_query(self, user_ids: List[int], start_date: datetime, end_date: datetime):
+        """(user_id, metric, count) rows for every metric a user has events for."""
+        per_table = []
+        for metric, (model, timestamp) in ENGAGEMENT_SOURCES.items():
+            user_filter = model.user_id == user_ids[0] if len(user_ids) == 1 else model.user_id.in_(user_ids)
+            per_table.append(
+                select(model.user_id, literal(metric).label('metric'), func.count().label('count'))
+                .where(user_filter, timestamp.between(start_date, end_date))
+                .group_by(model.user_id)
             )
-        ).count()
+        return union_all(*per_table)
 
-    def _count_gratitude_entries(self, user_id: int, start_date: datetime, end_date: datetime) -> int:
-        return GratitudeEntry.query.filter(
-            and_(
-                GratitudeEntry.user_id == user_id,
-                GratitudeEntry.created_at.between(start_date, end_date)
-            )
-        ).count()
-
-    def _count_voice_interactions(self, user_id: int, start_date: datetime, end_date: datetime) -> int:
-        return VoiceInteractions.query.filter(
-            and_(
-                VoiceInteractions.user_id == user_id,
-                VoiceInteractions.created_at.between(start_date, end_date)
-            )
-        ).count()
-
-    def _count_resource_access(self, user_id: int, start_date: datetime, end_date: datetime) -> int:
-        return UserResources.query.filter(
-            and_(
-                UserResources.user_id == user_id,
-                UserResources.accessed_at.between(start_date, end_date)
-            )
-        ).count()
-
-    def _count_strategy_usage(self, user_id: int, start_date: datetime, end_date: datetime) -> int:
-        return UserStrategies.query.filter(
-            and_(
-                UserStrategies.user_id == user_id,
-                UserStrategies.tried_at.between(start_date, end_date)
+    def _social_activity_queries(self, user_ids: List[int], now: datetime):
+        """
+        Two grouped statements: (user_id, group_id, memberships, active memberships)
+        in join order, and (user_id, average sentiment, total, one count per
+        SOCIAL_WINDOWS entry) for voice interactions.
+        """
+        # Like the Python `role != 'inactive'` it replaces, NULL roles count as active
+        active = UserGroups.role.is_distinct_from('inactive')
+        groups = (
+            select(UserGroups.user_id, UserGroups.group_id, func.count(), func.count(case((active, 1))))
+            .where(UserGroups.user_id.in_(user_ids))
+            .group_by(UserGroups.user_id, UserGroups.group_id)
+            .order_by(UserGroups.user_id, func.min(UserGroups.id))
+        )
+        
+        # Every window is a range of the (user_id, created_at) index
+        window_starts = [now - timedelta(days=days) for days in SOCIAL_WINDOWS.values()]
+        voice = (
+            select(
+                VoiceInteractions.user_id,
+                func.avg(case((VoiceInteractions.created_at >= min(window_starts),
+                               VoiceInteractions.sentiment_score))),
+                func.count(),
+                *[func.count(case((VoiceInteractions.created_at >= start, 1))) for start in window_starts]
             )
-        ).count()
+            .where(VoiceInteractions.user_id.in_(user_ids))
+            .group_by(VoiceInteractions.user_id)
+        )
+        return groups, voice
 
-    def _calculate_trend(self, values: List[float]) -> str:
-        if len(values) < 2:
-            return 'insufficient_data'
-        
-        slope = np.polyfit(range(len(values)), values, 1)[0]
+    def _trend_label(self, slope: float) -> str:
         if slope > 0.1:
             return 'increasing'
         elif slope < -0.1:
@@ -178,17 +275,10 @@ class AnalyticsProcessor:
         else:
             return 'stable'
 
-    def _identify_mood_patterns(self, entries: List[MoodEntry]) -> Dict:
-        # Implement pattern recognition logic
-        # This could include:
-        # - Day of week patterns
-        # - Time of day patterns
-        # - Correlation with specific events
-        return {
-            'day_of_week_patterns': {},
-            'time_of_day_patterns': {},
-            'event_correlations': {}
-        }
+    def _build_mood_patterns(self, patterns: Dict) -> Dict:
+        # No event data is recorded yet to correlate moods with
+        patterns['event_correlations'] = {}
+        return patterns
 
     def _generate_strategy_recommendations(self, strategies: List[UserStrategies]) -> List[str]:
         # Implement recommendation logic based on:
@@ -197,13 +287,19 @@ class AnalyticsProcessor:
         # - Recent mood patterns
         return []
 
-    def _calculate_social_engagement_score(self, groups: List[UserGroups], 
-                                         voice_interactions: List[VoiceInteractions]) -> float:
-        # Implement scoring logic based on:
-        # - Group participation
-        # - Voice interaction frequency
-        # - Interaction quality
-        return 0.0
+    def _calculate_social_engagement_score(self, active_group_count: int, voice_interactions: Dict[str, int],
+                                         average_sentiment: Optional[float]) -> float:
+        """
+        0-1 score from the aggregates alone:
+        - Group participation (40%): active groups against SOCIAL_TARGET_GROUPS
+        - Voice interaction frequency (40%): the last week against SOCIAL_TARGET_WEEKLY_INTERACTIONS
+        - Interaction quality (20%): average sentiment over the longest window, neutral when unknown
+        """
+        participation = min(active_group_count / self.SOCIAL_TARGET_GROUPS, 1.0)
+        frequency = min(voice_interactions['last_7_days'] / self.SOCIAL_TARGET_WEEKLY_INTERACTIONS, 1.0)
+        quality = 0.5 if average_sentiment is None else min(max((average_sentiment + 1) / 2, 0.0), 1.0)
+        
+        return round(0.4 * participation + 0.4 * frequency + 0.2 * quality, 2)
 
     def _interpret_mood_status(self, mood_trends: Dict) -> str:
         # Implement interpretation logic
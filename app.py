@@ -61,6 +61,14 @@ def create_app(test_config=None):
     with app.app_context():
         init_db()
     
+    # Index resources for recommendations now and refresh them in the background,
+    # so requests never sync the Resource table themselves
+    from config import Config
+    from utils.recommendation_index import get_recommendation_index
+    get_recommendation_index().start_resource_refresh(
+        app, app.config.get('RECOMMENDATION_REFRESH_INTERVAL', Config.RECOMMENDATION_REFRESH_INTERVAL)
+    )
+    
     return app
 
 def init_db():
@@ -72,6 +80,14 @@ def init_db():
         # Create all tables
         db.create_all()
         
+        # Schema changes create_all can't make to existing tables
+        from utils.migrations import upgrade
+        upgrade(db.engine)
+        
+        # Full-text index for /resources search (FTS5 on SQLite, tsvector on Postgres)
+        from utils.resource_search import ensure_search_index
+        ensure_search_index(db.engine)
+        
         # Create demo user if it doesn't exist
         if not User.query.filter_by(username='demo').first():
             demo_user = User(
@@ -0,0 +1,128 @@
+"""
+Benchmark: wellness reports for a cohort, per-user loop vs the batch engine.
+
+Builds a synthetic SQLite database of 5,000 students with mood entries,
+strategies, group memberships and voice interactions, checks that
+generate_cohort_reports produces the same reports as running each analysis
+method per user, and times both (the batch engine inline and with a
+2-process pool).
+
+Run from the repository root:
+    python benchmarks/bench_cohort_reports.py
+"""
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from models import (
+    db, User, MoodEntry, ResilienceStrategy, UserStrategies, SupportGroup, UserGroups, VoiceInteractions
+)
+from analytics_processor import AnalyticsProcessor
+from utils import mood_rollup
+
+USERS = 5000
+LOOP_SAMPLE = 500
+CATEGORIES = ['social', 'cultural', 'routine', 'academic']
+
+
+def populate():
+    rng = random.Random(42)
+    now = datetime.now()
+
+    def when(days):
+        return now - timedelta(seconds=rng.randint(0, days * 24 * 3600))
+
+    db.session.execute(User.__table__.insert(), [
+        {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, USERS + 1)
+    ])
+    db.session.execute(ResilienceStrategy.__table__.insert(), [
+        {'id': i, 'name': f'Strategy {i}', 'category': CATEGORIES[i % len(CATEGORIES)]} for i in range(1, 21)
+    ])
+    db.session.execute(SupportGroup.__table__.insert(), [
+        {'id': i, 'name': f'Group {i}'} for i in range(1, 11)
+    ])
+    db.session.execute(MoodEntry.__table__.insert(), [
+        {'user_id': user_id, 'mood_score': rng.randint(1, 10), 'homesickness_level': rng.randint(1, 10),
+         'entry_text': 'Today was a long day.', 'created_at': when(45)}
+        for user_id in range(1, USERS + 1) for _ in range(rng.randint(0, 40))
+    ])
+    db.session.execute(UserStrategies.__table__.insert(), [
+        {'user_id': user_id, 'strategy_id': rng.randint(1, 20), 'effectiveness_score': rng.choice([None, 0, 1, 3, 5]),
+         'tried_at': when(60)}
+        for user_id in range(1, USERS + 1) for _ in range(rng.randint(0, 6))
+    ])
+    db.session.execute(UserGroups.__table__.insert(), [
+        {'user_id': user_id, 'group_id': rng.randint(1, 10), 'role': rng.choice(['member', 'member', 'inactive'])}
+        for user_id in range(1, USERS + 1) for _ in range(rng.randint(0, 3))
+    ])
+    db.session.execute(VoiceInteractions.__table__.insert(), [
+        # Half a day off whole days, clear of the social windows' start while the benchmark runs
+        {'user_id': user_id, 'transcript': 'I talked about home.', 'sentiment_score': rng.uniform(-1, 1),
+         'created_at': now - timedelta(days=rng.randint(0, 59), hours=12)}
+        for user_id in range(1, USERS + 1) for _ in range(rng.randint(0, 10))
+    ])
+    db.session.commit()
+    with db.engine.begin() as connection:
+        mood_rollup.rebuild(connection)
+
+
+def sectioned_report(processor, user_id):
+    """A report assembled from the per-user analysis methods, each querying on its own."""
+    return processor._build_wellness_report(
+        processor.analyze_mood_trends(user_id),
+        processor.generate_resilience_insights(user_id),
+        processor.analyze_social_engagement(user_id),
+        processor.calculate_user_engagement(user_id)
+    )
+
+
+def comparable(report):
+    # Engagement periods end at datetime.now() of each call
+    analysis = dict(report['detailed_analysis'])
+    analysis['engagement_metrics'] = dict(analysis['engagement_metrics'], period=None)
+    return dict(report, detailed_analysis=analysis)
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        print(f"Populating {USERS:,} users...")
+        populate()
+        processor = AnalyticsProcessor(db)
+        user_ids = list(range(1, USERS + 1))
+
+        start = time.perf_counter()
+        expected = {user_id: sectioned_report(processor, user_id) for user_id in user_ids[:LOOP_SAMPLE]}
+        loop = (time.perf_counter() - start) / LOOP_SAMPLE
+        db.session.expunge_all()
+
+        timings = {}
+        for workers in (0, 2):
+            reports = {}
+            start = time.perf_counter()
+            written = processor.generate_cohort_reports(user_ids, reports.__setitem__, workers=workers)
+            timings[workers] = time.perf_counter() - start
+            assert written == USERS
+            for user_id, report in expected.items():
+                assert comparable(reports[user_id]) == comparable(report), user_id
+
+        print(f"\n{USERS:,} reports:")
+        print(f"  per-user loop       {loop * USERS:8.2f} s (extrapolated from {LOOP_SAMPLE})")
+        for workers, elapsed in timings.items():
+            label = 'batch engine' if not workers else f'batch, {workers} workers'
+            print(f"  {label:<19} {elapsed:8.2f} s  ({loop * USERS / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
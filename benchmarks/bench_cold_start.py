@@ -0,0 +1,57 @@
+"""
+Cold-start benchmark: ml_processor import time and first analyze_text latency.
+
+Each measurement runs in a fresh interpreter, once with the lexicon artifact
+and once with it hidden so the analyzers fall back to parsing NLTK data.
+
+Run from the repository root after building the artifact:
+    python -m utils.lexicon_artifact build
+    python benchmarks/bench_cold_start.py
+"""
+import os
+import sys
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+PROBE = """
+import json, time
+t0 = time.perf_counter()
+import ml_processor
+t1 = time.perf_counter()
+ml_processor.analyze_text("I miss my family and the food from home, everything here feels different.")
+t2 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'first_request': t2 - t1}))
+"""
+
+
+def measure(artifact_path):
+    env = dict(os.environ, HOMEBRIDGE_LEXICON_PATH=artifact_path)
+    samples = []
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return {key: sorted(s[key] for s in samples)[RUNS // 2] for key in samples[0]}
+
+
+def main():
+    from utils.lexicon_artifact import DEFAULT_ARTIFACT_PATH
+
+    modes = [('nltk data', os.path.join(ROOT, 'does-not-exist.bin'))]
+    if os.path.exists(DEFAULT_ARTIFACT_PATH):
+        modes.append(('artifact', DEFAULT_ARTIFACT_PATH))
+    else:
+        print(f"{DEFAULT_ARTIFACT_PATH} not built; measuring the NLTK fallback only")
+
+    for label, path in modes:
+        result = measure(path)
+        print(f"{label:>10}: import {result['import'] * 1000:7.1f} ms  "
+              f"first request {result['first_request'] * 1000:7.1f} ms  (median of {RUNS})")
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, ROOT)
+    main()
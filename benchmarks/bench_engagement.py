@@ -0,0 +1,111 @@
+"""
+Benchmark: AnalyticsProcessor engagement queries on 100k users.
+
+Builds a synthetic SQLite database of 100,000 users with ~1M event rows
+spread over the five per-user event tables, then compares:
+
+* per-user: five COUNT queries (the previous implementation) vs the single
+  UNION ALL statement of calculate_user_engagement
+* cohort: every user through calculate_users_engagement vs five COUNTs per user
+  (extrapolated from the per-user sample)
+
+Run from the repository root:
+    python benchmarks/bench_engagement.py
+"""
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import text
+
+from models import db, User
+from analytics_processor import AnalyticsProcessor, ENGAGEMENT_SOURCES
+from utils.migrations import upgrade
+
+USERS = 100_000
+EVENTS_PER_TABLE = 200_000
+SAMPLE = 2000
+
+
+def populate():
+    rng = random.Random(42)
+    now = datetime.now()
+    db.session.execute(User.__table__.insert(), [
+        {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, USERS + 1)
+    ])
+    extra = {
+        'mood_entries': {'mood_score': 5, 'homesickness_level': 5},
+        'gratitude_entries': {'entry_text': 'thanks'},
+        'user_resources': {'resource_id': 1},
+        'user_strategies': {'strategy_id': 1},
+    }
+    for model, timestamp in ENGAGEMENT_SOURCES.values():
+        table = model.__table__
+        db.session.execute(table.insert(), [
+            dict(extra.get(table.name, {}), user_id=rng.randint(1, USERS),
+                 **{timestamp.key: now - timedelta(minutes=rng.randint(0, 90 * 24 * 60))})
+            for _ in range(EVENTS_PER_TABLE)
+        ])
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+
+
+def five_counts(user_id, days=30):
+    """The previous calculate_user_engagement: one COUNT query per table."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    metrics = {
+        metric: model.query.filter(model.user_id == user_id, timestamp.between(start_date, end_date)).count()
+        for metric, (model, timestamp) in ENGAGEMENT_SOURCES.items()
+    }
+    return {'total_engagement': sum(metrics.values()), 'metrics': metrics}
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        upgrade(db.engine)
+        print(f"Populating {USERS:,} users, {EVENTS_PER_TABLE * len(ENGAGEMENT_SOURCES):,} events...")
+        populate()
+
+        processor = AnalyticsProcessor(db)
+        sample = random.Random(7).sample(range(1, USERS + 1), SAMPLE)
+
+        for user_id in sample[:200]:
+            assert processor.calculate_user_engagement(user_id)['metrics'] == five_counts(user_id)['metrics']
+
+        start = time.perf_counter()
+        for user_id in sample:
+            five_counts(user_id)
+        old = (time.perf_counter() - start) / SAMPLE
+
+        start = time.perf_counter()
+        for user_id in sample:
+            processor.calculate_user_engagement(user_id)
+        new = (time.perf_counter() - start) / SAMPLE
+
+        start = time.perf_counter()
+        cohort = processor.calculate_users_engagement(range(1, USERS + 1))
+        batched = time.perf_counter() - start
+        assert len(cohort) == USERS
+
+        print(f"\nper user ({SAMPLE} users):")
+        print(f"  five COUNT queries   {old * 1e3:8.3f} ms")
+        print(f"  one UNION ALL        {new * 1e3:8.3f} ms  ({old / new:.1f}x)")
+        print(f"\ncohort ({USERS:,} users):")
+        print(f"  five COUNTs per user {old * USERS:8.2f} s (extrapolated)")
+        print(f"  batched              {batched:8.2f} s  ({old * USERS / batched:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
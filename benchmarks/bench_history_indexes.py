@@ -0,0 +1,104 @@
+"""
+Benchmark: per-user time-window queries with and without the composite indexes.
+
+Builds a synthetic SQLite database (2,000 users, ~200k event rows) and
+times calculate_user_engagement with the indexes in place and after
+dropping them. tests/test_query_plans.py checks that the queries use them.
+
+Run from the repository root:
+    python benchmarks/bench_history_indexes.py
+"""
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import text
+
+from models import db, User, MoodEntry, GratitudeEntry, VoiceInteractions, UserResources, UserStrategies
+from analytics_processor import AnalyticsProcessor
+from utils.migrations import MIGRATIONS, upgrade
+
+USERS = 2000
+EVENTS_PER_USER = 20  # per table
+
+# (table, time column, index) for every per-user event table
+INDEXED = [
+    ('mood_entries', 'created_at', 'ix_mood_entries_user_created_at'),
+    ('gratitude_entries', 'created_at', 'ix_gratitude_entries_user_created_at'),
+    ('voice_interactions', 'created_at', 'ix_voice_interactions_user_created_at'),
+    ('user_resources', 'accessed_at', 'ix_user_resources_user_accessed_at'),
+    ('user_strategies', 'tried_at', 'ix_user_strategies_user_tried_at'),
+]
+
+
+def populate():
+    rng = random.Random(42)
+    now = datetime.now()
+
+    def when():
+        return now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+
+    db.session.execute(User.__table__.insert(), [
+        {'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, USERS + 1)
+    ])
+    rows = range(USERS * EVENTS_PER_USER)
+    db.session.execute(MoodEntry.__table__.insert(), [
+        {'user_id': rng.randint(1, USERS), 'mood_score': rng.randint(1, 10),
+         'homesickness_level': rng.randint(1, 10), 'created_at': when()} for _ in rows
+    ])
+    db.session.execute(GratitudeEntry.__table__.insert(), [
+        {'user_id': rng.randint(1, USERS), 'entry_text': 'thanks', 'created_at': when()} for _ in rows
+    ])
+    db.session.execute(VoiceInteractions.__table__.insert(), [
+        {'user_id': rng.randint(1, USERS), 'transcript': 'hello', 'created_at': when()} for _ in rows
+    ])
+    db.session.execute(UserResources.__table__.insert(), [
+        {'user_id': rng.randint(1, USERS), 'resource_id': 1, 'accessed_at': when()} for _ in rows
+    ])
+    db.session.execute(UserStrategies.__table__.insert(), [
+        {'user_id': rng.randint(1, USERS), 'strategy_id': 1, 'tried_at': when()} for _ in rows
+    ])
+    db.session.commit()
+
+
+def time_engagement(processor, repeat=500):
+    rng = random.Random(7)
+    user_ids = [rng.randint(1, USERS) for _ in range(repeat)]
+    start = time.perf_counter()
+    for user_id in user_ids:
+        processor.calculate_user_engagement(user_id)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        upgrade(db.engine)
+        print(f"Populating {USERS} users x {EVENTS_PER_USER} events x {len(INDEXED)} tables...")
+        populate()
+        db.session.execute(text("ANALYZE"))
+
+        processor = AnalyticsProcessor(db)
+        indexed = time_engagement(processor)
+        for _, _, index in INDEXED:
+            db.session.execute(text(f"DROP INDEX {index}"))
+        db.session.commit()
+        scanned = time_engagement(processor)
+
+        print(f"\ncalculate_user_engagement ({len(MIGRATIONS)} migration(s) applied):")
+        print(f"  with indexes    {indexed * 1e3:8.3f} ms/user")
+        print(f"  without indexes {scanned * 1e3:8.3f} ms/user  ({scanned / indexed:.1f}x slower)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Microbenchmark: legacy word_tokenize + list scans vs. the compiled LexiconAnalyzer.
+
+Run from the repository root:
+    python benchmarks/bench_lexicon_engine.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nltk.corpus import stopwords
+from nltk.tokenize import word_tokenize
+
+from ml_processor import HOMESICKNESS_KEYWORDS
+from utils.lexicon_engine import LexiconAnalyzer
+
+SAMPLES = [
+    "I miss my family so much. Everything here feels different and I can't adjust to the food.",
+    "Today was great! I made new friends in my lecture and we're going to explore Vancouver.",
+    "It's hard being so far from home. My parents call every week but I still feel lonely and isolated.",
+    "The language barrier makes it difficult to talk to people, and I don't know where I belong.",
+]
+TEXTS = [" ".join(SAMPLES[i % len(SAMPLES)] for i in range(n)) for n in (1, 4, 16)]
+
+
+def legacy_scan(text, stop_words):
+    tokens = word_tokenize(text.lower())
+    filtered_tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
+    count = sum(1 for word in filtered_tokens if word in HOMESICKNESS_KEYWORDS)
+    keywords = set(word for word in filtered_tokens if word in HOMESICKNESS_KEYWORDS)
+    return filtered_tokens, keywords, count
+
+
+def main():
+    stop_words = set(stopwords.words('english'))
+    analyzer = LexiconAnalyzer(HOMESICKNESS_KEYWORDS, stop_words)
+
+    for text in TEXTS:
+        tokens, keywords, count = legacy_scan(text, stop_words)
+        scan = analyzer.scan(text)
+        assert scan.tokens == tokens, (scan.tokens, tokens)
+        assert set(scan.keyword_counts) == keywords
+        assert scan.keyword_total == count
+
+        number = 2000
+        legacy = timeit.timeit(lambda: legacy_scan(text, stop_words), number=number)
+        compiled = timeit.timeit(lambda: analyzer.scan(text), number=number)
+        print(f"{len(text):>6} chars  legacy {legacy / number * 1e6:8.1f} us  "
+              f"compiled {compiled / number * 1e6:8.1f} us  speedup {legacy / compiled:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
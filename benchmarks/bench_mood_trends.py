@@ -0,0 +1,124 @@
+"""
+Benchmark: analyze_mood_trends for users with 100 to 10,000 entries.
+
+Compares the current implementation (daily rollup + column-only pattern
+query into NumPy) with the previous one, which loaded every MoodEntry ORM
+object in the window. The previous version returned empty patterns, so the
+baseline here adds the same patterns with a plain Python loop over the
+loaded objects. Reports latency and peak Python memory (tracemalloc).
+
+Run from the repository root:
+    python benchmarks/bench_mood_trends.py
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from flask import Flask
+
+from models import db, User, MoodEntry
+from analytics_processor import AnalyticsProcessor
+from utils import mood_rollup
+from utils.mood_trends import WEEKDAYS, DAY_PERIODS
+
+SIZES = [100, 1000, 10000]
+DAYS = 30
+
+
+def populate(user_id, entries):
+    rng = random.Random(user_id)
+    now = datetime.now()
+    db.session.execute(MoodEntry.__table__.insert(), [
+        {'user_id': user_id, 'mood_score': rng.randint(1, 10), 'homesickness_level': rng.randint(1, 10),
+         'entry_text': 'Some journal text about the day. ' * 20,
+         'created_at': now - timedelta(seconds=rng.randint(0, DAYS * 24 * 3600))}
+        for _ in range(entries)
+    ])
+
+
+def previous(user_id, days=DAYS):
+    """ORM objects for every entry, np.polyfit trend, patterns via Python loops."""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
+    entries = MoodEntry.query.filter(
+        MoodEntry.user_id == user_id, MoodEntry.created_at.between(start_date, end_date)
+    ).all()
+    mood_scores = [entry.mood_score for entry in entries]
+    homesickness_scores = [entry.homesickness_level for entry in entries]
+
+    def describe(labels, key):
+        buckets = {}
+        for entry in entries:
+            buckets.setdefault(labels[key(entry.created_at)], []).append(entry)
+        return {
+            label: {'entries': len(group),
+                    'average_mood': round(float(np.mean([e.mood_score for e in group])), 2),
+                    'average_homesickness': round(float(np.mean([e.homesickness_level for e in group])), 2)}
+            for label, group in buckets.items()
+        }
+
+    return {
+        'average_mood': np.mean(mood_scores),
+        'mood_volatility': np.std(mood_scores),
+        'average_homesickness': np.mean(homesickness_scores),
+        'homesickness_trend': np.polyfit(range(len(homesickness_scores)), homesickness_scores, 1)[0],
+        'mood_patterns': {
+            'day_of_week_patterns': describe(WEEKDAYS, lambda ts: ts.weekday()),
+            'time_of_day_patterns': describe(DAY_PERIODS, lambda ts: ts.hour // 6),
+        }
+    }
+
+
+def measure(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return elapsed, peak
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        for user_id, entries in enumerate(SIZES, start=1):
+            db.session.add(User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@example.com',
+                                password_hash='x'))
+            populate(user_id, entries)
+        db.session.commit()
+        with db.engine.begin() as connection:
+            mood_rollup.rebuild(connection)
+
+        processor = AnalyticsProcessor(db)
+        print(f"{'entries':>8} {'previous':>12} {'current':>12} {'prev peak':>11} {'cur peak':>10}")
+        for user_id, entries in enumerate(SIZES, start=1):
+            old_result, new_result = previous(user_id), processor.analyze_mood_trends(user_id)
+            for section in ('day_of_week_patterns', 'time_of_day_patterns'):
+                assert old_result['mood_patterns'][section] == new_result['mood_patterns'][section]
+            assert abs(old_result['average_mood'] - new_result['average_mood']) < 1e-9
+
+            repeat = max(3, 3000 // entries)
+            old_time, old_peak = measure(lambda: previous(user_id), repeat)
+            new_time, new_peak = measure(lambda: processor.analyze_mood_trends(user_id), repeat)
+            print(f"{entries:>8} {old_time * 1e3:>10.2f}ms {new_time * 1e3:>10.2f}ms "
+                  f"{old_peak / 1024:>9.0f}KB {new_peak / 1024:>8.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: top_k latency of the TF-IDF recommendation index.
+
+Indexes both strategy catalogs plus synthetic resources (0, 1,000 and
+10,000 rows) and times top_k for typical journal-length queries.
+
+Run from the repository root:
+    python benchmarks/bench_recommendation_index.py
+"""
+import os
+import sys
+import time
+import random
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ml_processor
+from utils import resilience_strategies
+from utils.recommendation_index import RecommendationIndex
+
+FakeResource = namedtuple('FakeResource', ['id', 'name', 'description', 'category', 'location', 'url'])
+
+QUERIES = [
+    "I miss my family so much. Everything here feels different and I can't adjust to the food.",
+    "My exams are stressful and I don't have any friends in my lecture to study with.",
+    "It's hard being so far from home. My parents call every week but I still feel lonely.",
+]
+WORDS = ("counselling support group international student academic advising wellness food "
+         "bank language exchange career housing peer mentor cultural club health clinic "
+         "library tutoring workshop family community volunteer sports").split()
+CATEGORIES = ['Mental Health', 'Student Services', 'Academic Support', 'International Student Support']
+
+
+def fake_resources(count):
+    rng = random.Random(42)
+    return [
+        FakeResource(i + 1, ' '.join(rng.choices(WORDS, k=3)).title(), ' '.join(rng.choices(WORDS, k=25)),
+                     rng.choice(CATEGORIES), 'UBC', None)
+        for i in range(count)
+    ]
+
+
+def main():
+    for count in (0, 1_000, 10_000):
+        index = RecommendationIndex({
+            'levels': ml_processor.strategy_store,
+            'themes': resilience_strategies.strategy_store,
+        })
+        started = time.perf_counter()
+        index.refresh_strategies()
+        index.add_resources(fake_resources(count))
+        index.index.top_k(QUERIES[0])
+        build = time.perf_counter() - started
+
+        number = 200
+        started = time.perf_counter()
+        for i in range(number):
+            index.index.top_k(QUERIES[i % len(QUERIES)], k=5)
+        query = (time.perf_counter() - started) / number
+
+        best = index.index.top_k(QUERIES[0], k=1)
+        print(f"{len(index.index):>6} docs  build {build * 1e3:8.1f} ms  top_k {query * 1e6:8.1f} us  "
+              f"best: {best[0].item.get('title') or best[0].item.get('name')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: cached wellness reports (get_wellness_report) vs recomputing them.
+
+Times a cache miss (a full generate_wellness_report) and a hit for an
+unchanged user, then checks that writing any tracked row (mood entry,
+gratitude entry, strategy, resource access, voice interaction, group
+membership) through
+the session invalidates that user's report and no one else's.
+
+Run from the repository root:
+    python benchmarks/bench_report_cache.py
+"""
+import os
+import sys
+import time
+import random
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from models import (
+    db, User, MoodEntry, GratitudeEntry, ResilienceStrategy, UserStrategies, Resource, UserResources,
+    SupportGroup, UserGroups, VoiceInteractions
+)
+from analytics_processor import AnalyticsProcessor
+from utils.report_cache import get_report_cache
+
+USERS = 2
+ENTRIES = 2000
+HIT_REPEAT = 10000
+
+
+def populate():
+    rng = random.Random(42)
+    now = datetime.now()
+    db.session.add(ResilienceStrategy(id=1, name='Call home', category='social'))
+    db.session.add(SupportGroup(id=1, name='Newcomers'))
+    db.session.add(Resource(id=1, name='Counselling', category='health'))
+    for user_id in range(1, USERS + 1):
+        db.session.add(User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@example.com',
+                            password_hash='x'))
+        for _ in range(ENTRIES):
+            db.session.add(MoodEntry(user_id=user_id, mood_score=rng.randint(1, 10),
+                                     homesickness_level=rng.randint(1, 10),
+                                     created_at=now - timedelta(seconds=rng.randint(0, 29 * 24 * 3600))))
+    db.session.commit()
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        populate()
+        processor = AnalyticsProcessor(db)
+        cache = get_report_cache()
+
+        start = time.perf_counter()
+        report = processor.get_wellness_report(1)
+        miss = time.perf_counter() - start
+        processor.get_wellness_report(2)
+
+        start = time.perf_counter()
+        for _ in range(HIT_REPEAT):
+            processor.get_wellness_report(1)
+        hit = (time.perf_counter() - start) / HIT_REPEAT
+        assert processor.get_wellness_report(1) == report
+        print(f"miss {miss * 1e3:8.2f} ms   hit {hit * 1e6:6.1f} us   ({miss / hit:,.0f}x)")
+
+        now = datetime.now()
+        writes = [
+            MoodEntry(user_id=1, mood_score=10, homesickness_level=1, created_at=now),
+            GratitudeEntry(user_id=1, entry_text='A good call with my sister', created_at=now),
+            UserStrategies(user_id=1, strategy_id=1, effectiveness_score=5, tried_at=now),
+            UserResources(user_id=1, resource_id=1, accessed_at=now),
+            VoiceInteractions(user_id=1, transcript='Feeling better', sentiment_score=0.6, created_at=now),
+            UserGroups(user_id=1, group_id=1, role='member'),
+        ]
+        other = processor.get_wellness_report(2)
+        for row in writes:
+            db.session.add(row)
+            db.session.commit()
+            misses = cache.misses
+            fresh = processor.get_wellness_report(1)
+            assert cache.misses == misses + 1 and fresh != report, type(row).__name__
+            hits = cache.hits
+            assert processor.get_wellness_report(2) == other and cache.hits == hits + 1, type(row).__name__
+            report = fresh
+        print(f"Each of {len(writes)} tracked writes invalidated only its user's report")
+
+        social = report['detailed_analysis']['social_engagement']
+        assert social['group_participation'] == 1 and social['voice_interaction_frequency'] == 1
+        print(cache.stats())
+
+
+if __name__ == '__main__':
+    main()
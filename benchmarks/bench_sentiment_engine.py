@@ -0,0 +1,58 @@
+"""
+Benchmark: nltk SentimentIntensityAnalyzer vs. the batched BatchSentimentScorer.
+
+Checks that every compound score matches nltk within COMPOUND_TOLERANCE,
+then times both at batch sizes 1, 100 and 10,000.
+
+Run from the repository root (needs the lexicon artifact or NLTK's vader_lexicon):
+    python benchmarks/bench_sentiment_engine.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import lexicon_artifact
+from utils.sentiment_engine import BatchSentimentScorer, COMPOUND_TOLERANCE
+
+SAMPLES = [
+    "I miss my family so much. Everything here feels different and I can't adjust to the food.",
+    "Today was GREAT! I made new friends in my lecture and we're going to explore Vancouver!!",
+    "It's hard being so far from home. My parents call every week but I still feel lonely and isolated.",
+    "The language barrier makes it difficult to talk to people, and I don't know where I belong.",
+    "Not bad at all, kind of fun actually :)",
+    "I am never so happy as when I talk to my sister... but today was the worst?!?",
+]
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    sia = lexicon_artifact.sentiment_analyzer()
+    scorer = BatchSentimentScorer(sia.lexicon, sia.constants)
+
+    for size in (1, 100, 10_000):
+        texts = [f"{SAMPLES[i % len(SAMPLES)]} ({i})" for i in range(size)]
+
+        expected = [sia.polarity_scores(text)['compound'] for text in texts]
+        actual = scorer.compound_scores(texts)
+        worst = max(abs(a - e) for a, e in zip(actual, expected))
+        assert worst <= COMPOUND_TOLERANCE, worst
+
+        repeat = 3 if size >= 10_000 else 20
+        nltk_time = timed(lambda: [sia.polarity_scores(text) for text in texts], repeat)
+        batch_time = timed(lambda: scorer.compound_scores(texts), repeat)
+        print(f"batch {size:>6}  nltk {nltk_time * 1e3:9.2f} ms  batched {batch_time * 1e3:9.2f} ms  "
+              f"speedup {nltk_time / batch_time:5.1f}x  max |d compound| {worst:.1e}")
+
+
+if __name__ == '__main__':
+    main()
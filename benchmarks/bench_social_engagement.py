@@ -0,0 +1,100 @@
+"""
+Benchmark: analyze_social_engagement for users with 100 to 50,000 voice interactions.
+
+Compares the current aggregate queries with the previous implementation,
+which loaded every UserGroups and VoiceInteractions ORM object (transcripts
+included) to take len() and filter roles. Checks both agree on the shared
+fields and reports latency and peak Python memory (tracemalloc).
+
+Run from the repository root:
+    python benchmarks/bench_social_engagement.py
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from models import db, User, SupportGroup, UserGroups, VoiceInteractions
+from analytics_processor import AnalyticsProcessor
+
+SIZES = [100, 5000, 50000]
+
+
+def populate(user_id, interactions):
+    rng = random.Random(user_id)
+    now = datetime.now()
+    db.session.execute(UserGroups.__table__.insert(), [
+        {'user_id': user_id, 'group_id': group_id, 'role': role}
+        for group_id, role in [(1, 'member'), (2, 'inactive'), (3, None), (4, 'moderator')]
+    ])
+    db.session.execute(VoiceInteractions.__table__.insert(), [
+        {'user_id': user_id, 'transcript': 'I talked about missing home and my family. ' * 30,
+         'sentiment_score': rng.uniform(-1, 1),
+         'created_at': now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))}
+        for _ in range(interactions)
+    ])
+
+
+def previous(user_id):
+    """ORM objects for every membership and voice interaction."""
+    groups = UserGroups.query.filter_by(user_id=user_id).order_by(UserGroups.id).all()
+    voice_interactions = VoiceInteractions.query.filter_by(user_id=user_id).all()
+    return {
+        'group_participation': len(groups),
+        'active_groups': [g.group_id for g in groups if g.role != 'inactive'],
+        'voice_interaction_frequency': len(voice_interactions),
+    }
+
+
+def measure(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    db.session.expunge_all()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.expunge_all()
+    return elapsed, peak
+
+
+def main():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(SupportGroup.__table__.insert(), [{'id': i, 'name': f'Group {i}'} for i in range(1, 5)])
+        for user_id, interactions in enumerate(SIZES, start=1):
+            db.session.add(User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@example.com',
+                                password_hash='x'))
+            populate(user_id, interactions)
+        db.session.commit()
+
+        processor = AnalyticsProcessor(db)
+        print(f"{'voice rows':>10} {'previous':>12} {'current':>12} {'prev peak':>11} {'cur peak':>10}")
+        for user_id, interactions in enumerate(SIZES, start=1):
+            old_result, new_result = previous(user_id), processor.analyze_social_engagement(user_id)
+            for key, value in old_result.items():
+                assert new_result[key] == value, (key, value, new_result[key])
+            db.session.expunge_all()
+
+            repeat = max(3, 1000 // interactions)
+            old_time, old_peak = measure(lambda: previous(user_id), repeat)
+            new_time, new_peak = measure(lambda: processor.analyze_social_engagement(user_id), repeat)
+            print(f"{interactions:>10} {old_time * 1e3:>10.2f}ms {new_time * 1e3:>10.2f}ms "
+                  f"{old_peak / 1024:>9.0f}KB {new_peak / 1024:>8.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
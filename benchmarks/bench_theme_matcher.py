@@ -0,0 +1,71 @@
+"""
+Microbenchmark: legacy substring theme checks vs. the Aho-Corasick ThemeMatcher.
+
+The legacy version lowercases the text once per keyword and uses substring
+search, so it also fires inside unrelated words ('who' in 'whole'); the
+matcher only counts whole words (plus inflections), so theme sets can
+differ on purpose. Both are timed on 10k and 50k character inputs, once on
+journal-like text where every theme appears early (the legacy any() exits
+after the first hit) and once on text with few theme words, where the legacy
+version has to search the whole text for every keyword. ``match`` also
+returns counts and positions, which the legacy version cannot produce.
+
+Run from the repository root:
+    python benchmarks/bench_theme_matcher.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_pipeline import THEME_KEYWORDS, theme_matcher
+
+SAMPLES = [
+    "I miss my family so much. Everything here feels different and I can't adjust to the food.",
+    "Today was great! I made new friends in my lecture and we're going to explore Vancouver.",
+    "It's hard being so far from home. My parents call every week but I still feel lonely and isolated.",
+    "The language barrier makes it difficult to talk to people, and I don't know where I belong.",
+    "The weather was nice and the bus was on time, so the whole morning went smoothly.",
+]
+QUIET_SAMPLE = "The weather was nice and the bus was on time, so the whole morning went smoothly."
+
+
+def legacy_identify_themes(text):
+    themes = []
+    for theme, words in THEME_KEYWORDS.items():
+        if any(word in text.lower() for word in words):
+            themes.append(theme)
+    return themes
+
+
+def build_text(chars, samples):
+    parts = []
+    length = 0
+    i = 0
+    while length < chars:
+        parts.append(samples[i % len(samples)])
+        length += len(parts[-1]) + 1
+        i += 1
+    return " ".join(parts)
+
+
+def main():
+    for label, samples in (('journal', SAMPLES), ('quiet', [QUIET_SAMPLE])):
+        for chars in (10_000, 50_000):
+            text = build_text(chars, samples)
+            hits = theme_matcher.match(text)
+            print(f"{label:>8} {len(text):>6} chars  "
+                  f"themes {len(legacy_identify_themes(text))} legacy / {len(hits)} matcher  "
+                  f"hits {sum(h.count for h in hits.values())}")
+
+            number = 50
+            legacy = timeit.timeit(lambda: legacy_identify_themes(text), number=number)
+            themes = timeit.timeit(lambda: theme_matcher.themes(text), number=number)
+            match = timeit.timeit(lambda: theme_matcher.match(text), number=number)
+            print(f"{'':>22}legacy {legacy / number * 1e3:7.2f} ms  "
+                  f"themes() {themes / number * 1e3:7.2f} ms  match() {match / number * 1e3:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
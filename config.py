@@ -48,6 +48,47 @@ class Config:
     CACHE_TYPE = 'simple'
     CACHE_DEFAULT_TIMEOUT = 300
     
+    # Analysis result cache ('memory' per worker, or 'sqlite' shared by all workers on a host)
+    ANALYSIS_CACHE_BACKEND = os.getenv('ANALYSIS_CACHE_BACKEND', 'memory')
+    ANALYSIS_CACHE_PATH = os.getenv('ANALYSIS_CACHE_PATH', os.path.join('instance', 'analysis_cache.db'))
+    ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '2048'))
+    ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', '3600'))  # seconds
+    LEMMA_CACHE_SIZE = int(os.getenv('LEMMA_CACHE_SIZE', '50000'))  # Lemmas memoized per worker beyond the artifact's
+    
+    # Gemini client
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))  # Concurrent Gemini calls per worker
+    GEMINI_REQUEST_TIMEOUT = float(os.getenv('GEMINI_REQUEST_TIMEOUT', '20'))  # Seconds per Gemini call
+    GEMINI_DEADLINE = float(os.getenv('GEMINI_DEADLINE', '8'))  # Seconds generate_insights waits for all parts
+    GEMINI_PROMPT_CACHE_PATH = os.getenv('GEMINI_PROMPT_CACHE_PATH', os.path.join('instance', 'gemini_cache.db'))
+    GEMINI_PROMPT_CACHE_SIZE = int(os.getenv('GEMINI_PROMPT_CACHE_SIZE', '5000'))
+    GEMINI_PROMPT_CACHE_TTL = int(os.getenv('GEMINI_PROMPT_CACHE_TTL', str(7 * 24 * 3600)))  # seconds
+    
+    # Tiered analysis routing (local analyzer first, Gemini only when needed)
+    ROUTER_CONFIDENCE_THRESHOLD = float(os.getenv('ROUTER_CONFIDENCE_THRESHOLD', '0.5'))  # Escalate below this
+    ROUTER_LONG_TEXT_CHARS = int(os.getenv('ROUTER_LONG_TEXT_CHARS', '1500'))  # Always escalate at this length
+    ROUTER_LATENCY_BUDGET = float(os.getenv('ROUTER_LATENCY_BUDGET', '3.0'))  # Seconds per request
+    ROUTER_MIN_ESCALATION_TIME = float(os.getenv('ROUTER_MIN_ESCALATION_TIME', '0.5'))  # Skip Gemini with less left
+    
+    # Async /process_voice jobs
+    PROCESS_VOICE_ASYNC = os.getenv('PROCESS_VOICE_ASYNC', 'false').lower() == 'true'  # Default mode when the client doesn't say
+    VOICE_JOB_WORKERS = int(os.getenv('VOICE_JOB_WORKERS', '4'))  # Concurrent jobs per gunicorn worker
+    VOICE_JOB_MAX_PENDING = int(os.getenv('VOICE_JOB_MAX_PENDING', '32'))  # Queued + running jobs before rejecting
+    VOICE_JOB_TTL = int(os.getenv('VOICE_JOB_TTL', '600'))  # Seconds a finished job's result is kept
+    
+    # Recommendation index
+    RECOMMENDATION_REFRESH_INTERVAL = int(os.getenv('RECOMMENDATION_REFRESH_INTERVAL', '300'))  # Seconds between Resource table checks; 0 = startup only
+    
+    # /resources search
+    RESOURCES_PAGE_SIZE = int(os.getenv('RESOURCES_PAGE_SIZE', '20'))  # Results per page, capped at 100
+    
+    # Wellness report cache (per worker, keyed by each user's data version; see utils.report_cache)
+    REPORT_CACHE_SIZE = int(os.getenv('REPORT_CACHE_SIZE', '1024'))
+    REPORT_CACHE_TTL = int(os.getenv('REPORT_CACHE_TTL', '3600'))  # seconds; reports also age as their window moves
+    
+    # History views (/progress and /api/history/<kind>)
+    HISTORY_PAGE_SIZE = int(os.getenv('HISTORY_PAGE_SIZE', '50'))  # Entries per page / initial window
+    HISTORY_MAX_PAGE_SIZE = 200  # Largest page a client may ask for
+    
     # Rate Limiting
     RATELIMIT_STORAGE_URL = os.getenv('REDIS_URL', 'memory://')
     RATELIMIT_STRATEGY = 'fixed-window'
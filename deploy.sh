@@ -5,8 +5,10 @@ mkdir -p /tmp/nltk_data
 
 # Download required NLTK data
 python -c "import nltk; nltk.download('punkt', download_dir='/tmp/nltk_data')"
-python -c "import nltk; nltk.download('stopwords', download_dir='/tmp/nltk_data')"
-python -c "import nltk; nltk.download('vader_lexicon', download_dir='/tmp/nltk_data')"
+python -c "import nltk; nltk.download('wordnet', download_dir='/tmp/nltk_data')"
+
+# Build the lexicon artifact (VADER lexicon, stopwords, keyword tables)
+python -m utils.lexicon_artifact build --download
 
 # Deploy to Vercel
 vercel --prod 
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 import json
 from models import db, Resource, SupportGroup, User
 from config import Config
+from utils.recommendation_index import get_recommendation_index
 
 logger = logging.getLogger(__name__)
 
@@ -201,7 +202,7 @@ class ExternalIntegrations:
 
     def sync_all_resources(self) -> Dict:
         """Sync all external resources"""
-        return {
+        results = {
             'counselling_services': self.sync_ubc_counselling_services(),
             'support_groups': self.sync_ubc_support_groups(),
             'student_services': self.sync_ubc_student_services(),
@@ -210,6 +211,14 @@ class ExternalIntegrations:
             'events': self.sync_ubc_events()
         }
 
+        # Index the new rows now rather than at the next background refresh
+        try:
+            get_recommendation_index().sync_resources()
+        except Exception as e:
+            logger.error(f"Error updating recommendation index: {str(e)}")
+
+        return results
+
     def update_user_profile(self, user_id: int, external_data: Dict) -> bool:
         """Update user profile with external data"""
         try:
@@ -1,58 +1,23 @@
-import nltk
-import json
 import random
 import logging
 import os
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.sentiment import SentimentIntensityAnalyzer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+from functools import lru_cache
+from utils import lexicon_artifact
+from utils.lexicon_engine import LexiconAnalyzer
+from utils.text_pipeline import get_pipeline
+from utils.sentiment_engine import BatchSentimentScorer
+from utils.batch_analysis import analyze_in_batches
+from utils.strategy_store import StrategyStore
+from utils.analysis_cache import get_cache
+from utils import recommendation_index
+from utils.recommendation_index import KIND_STRATEGY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def download_nltk_data():
-    """Download required NLTK data to /tmp directory."""
-    try:
-        # Set NLTK data path to /tmp
-        nltk.data.path.append('/tmp/nltk_data')
-        
-        # Create directory if it doesn't exist
-        os.makedirs('/tmp/nltk_data', exist_ok=True)
-        
-        # Download only required resources
-        required_data = {
-            'tokenizers/punkt': 'punkt',
-            'corpora/stopwords': 'stopwords',
-            'sentiment/vader_lexicon': 'vader_lexicon'
-        }
-        
-        for path, resource in required_data.items():
-            try:
-                nltk.data.find(path)
-                logger.info(f"NLTK resource {resource} already downloaded")
-            except LookupError:
-                logger.info(f"Downloading NLTK resource: {resource}")
-                nltk.download(resource, download_dir='/tmp/nltk_data')
-                logger.info(f"Successfully downloaded {resource}")
-                
-    except Exception as e:
-        logger.error(f"Error downloading NLTK data: {str(e)}")
-        raise
-
-# Download NLTK data on import
-download_nltk_data()
-
-# Initialize NLTK components
-try:
-    sia = SentimentIntensityAnalyzer()
-    stop_words = set(stopwords.words('english'))
-except Exception as e:
-    logger.error(f"Error initializing NLTK components: {str(e)}")
-    raise
+# Bump whenever score_text's output for a given input changes, so cached scores are dropped
+ANALYZER_VERSION = '2'
 
 # Keywords related to homesickness
 HOMESICKNESS_KEYWORDS = [
@@ -62,161 +27,206 @@ HOMESICKNESS_KEYWORDS = [
     'homesick', 'memory', 'memories', 'parents', 'siblings', 'comfort'
 ]
 
-def load_resilience_strategies():
-    """Load resilience strategies from JSON file or return defaults."""
-    try:
-        file_path = os.path.join('static', 'data', 'resilience_strategies.json')
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        else:
-            logger.warning("Resilience strategies file not found, using defaults")
-            return {
-                'social': [
-                    {
-                        'name': 'Connect with Home',
-                        'description': 'Maintain meaningful connections with family and friends back home',
-                        'steps': [
-                            'Schedule regular video calls with loved ones',
-                            'Share your daily experiences and photos',
-                            'Create a shared digital space (e.g., family chat)',
-                            'Plan virtual activities together'
-                        ]
-                    },
-                    {
-                        'name': 'Build Local Support',
-                        'description': 'Develop a support network in your new environment',
-                        'steps': [
-                            'Join international student groups',
-                            'Attend cultural events and meetups',
-                            'Connect with peers from similar backgrounds',
-                            'Participate in mentorship programs'
-                        ]
-                    }
-                ],
-                'cultural': [
-                    {
-                        'name': 'Cultural Integration',
-                        'description': 'Gradually adapt to the new cultural environment',
-                        'steps': [
-                            'Explore local cultural events and festivals',
-                            'Try local foods and restaurants',
-                            'Learn about Canadian customs and traditions',
-                            'Share your own culture with others'
-                        ]
-                    },
-                    {
-                        'name': 'Language Practice',
-                        'description': 'Improve language skills in a supportive environment',
-                        'steps': [
-                            'Join language exchange programs',
-                            'Attend conversation circles',
-                            'Practice with native speakers',
-                            'Use language learning apps'
-                        ]
-                    }
-                ],
-                'routine': [
-                    {
-                        'name': 'Structured Daily Life',
-                        'description': 'Create a balanced daily routine',
-                        'steps': [
-                            'Set regular study and sleep schedules',
-                            'Include time for self-care and relaxation',
-                            'Plan meals and grocery shopping',
-                            'Schedule regular exercise'
-                        ]
-                    },
-                    {
-                        'name': 'Academic Organization',
-                        'description': 'Manage academic responsibilities effectively',
-                        'steps': [
-                            'Use a planner or digital calendar',
-                            'Break tasks into smaller steps',
-                            'Set realistic goals and deadlines',
-                            'Utilize academic support services'
-                        ]
-                    }
-                ],
-                'emotional': [
-                    {
-                        'name': 'Emotional Awareness',
-                        'description': 'Develop healthy emotional processing habits',
-                        'steps': [
-                            'Keep a personal journal',
-                            'Practice mindfulness and meditation',
-                            'Identify and express your feelings',
-                            'Seek professional support when needed'
-                        ]
-                    },
-                    {
-                        'name': 'Self-Care Practices',
-                        'description': 'Maintain physical and mental well-being',
-                        'steps': [
-                            'Establish a regular sleep routine',
-                            'Engage in physical activity',
-                            'Practice relaxation techniques',
-                            'Maintain a balanced diet'
-                        ]
-                    }
-                ]
-            }
-    except Exception as e:
-        logger.error(f"Error loading resilience strategies: {str(e)}")
-        return {
-            'social': [],
-            'cultural': [],
-            'routine': [],
-            'emotional': []
+@lru_cache(maxsize=None)
+def get_sentiment_analyzer():
+    """VADER analyzer, built from the lexicon artifact on first use."""
+    return lexicon_artifact.sentiment_analyzer()
+
+@lru_cache(maxsize=None)
+def get_batch_sentiment_scorer():
+    """Vectorized VADER-compatible scorer for batches, sharing the analyzer's lexicon."""
+    sia = get_sentiment_analyzer()
+    return BatchSentimentScorer(sia.lexicon, sia.constants)
+
+@lru_cache(maxsize=None)
+def get_lexicon():
+    """Compiled keyword matcher, built on first use and reused for every request."""
+    return LexiconAnalyzer(HOMESICKNESS_KEYWORDS, lexicon_artifact.stop_words())
+
+# Fallback catalog used when static/data/resilience_strategies.json is missing
+DEFAULT_RESILIENCE_STRATEGIES = {
+    'social': [
+        {
+            'name': 'Connect with Home',
+            'description': 'Maintain meaningful connections with family and friends back home',
+            'steps': [
+                'Schedule regular video calls with loved ones',
+                'Share your daily experiences and photos',
+                'Create a shared digital space (e.g., family chat)',
+                'Plan virtual activities together'
+            ]
+        },
+        {
+            'name': 'Build Local Support',
+            'description': 'Develop a support network in your new environment',
+            'steps': [
+                'Join international student groups',
+                'Attend cultural events and meetups',
+                'Connect with peers from similar backgrounds',
+                'Participate in mentorship programs'
+            ]
         }
+    ],
+    'cultural': [
+        {
+            'name': 'Cultural Integration',
+            'description': 'Gradually adapt to the new cultural environment',
+            'steps': [
+                'Explore local cultural events and festivals',
+                'Try local foods and restaurants',
+                'Learn about Canadian customs and traditions',
+                'Share your own culture with others'
+            ]
+        },
+        {
+            'name': 'Language Practice',
+            'description': 'Improve language skills in a supportive environment',
+            'steps': [
+                'Join language exchange programs',
+                'Attend conversation circles',
+                'Practice with native speakers',
+                'Use language learning apps'
+            ]
+        }
+    ],
+    'routine': [
+        {
+            'name': 'Structured Daily Life',
+            'description': 'Create a balanced daily routine',
+            'steps': [
+                'Set regular study and sleep schedules',
+                'Include time for self-care and relaxation',
+                'Plan meals and grocery shopping',
+                'Schedule regular exercise'
+            ]
+        },
+        {
+            'name': 'Academic Organization',
+            'description': 'Manage academic responsibilities effectively',
+            'steps': [
+                'Use a planner or digital calendar',
+                'Break tasks into smaller steps',
+                'Set realistic goals and deadlines',
+                'Utilize academic support services'
+            ]
+        }
+    ],
+    'emotional': [
+        {
+            'name': 'Emotional Awareness',
+            'description': 'Develop healthy emotional processing habits',
+            'steps': [
+                'Keep a personal journal',
+                'Practice mindfulness and meditation',
+                'Identify and express your feelings',
+                'Seek professional support when needed'
+            ]
+        },
+        {
+            'name': 'Self-Care Practices',
+            'description': 'Maintain physical and mental well-being',
+            'steps': [
+                'Establish a regular sleep routine',
+                'Engage in physical activity',
+                'Practice relaxation techniques',
+                'Maintain a balanced diet'
+            ]
+        }
+    ]
+}
+
+# Parsed once and re-read only when the JSON file changes on disk
+strategy_store = StrategyStore(
+    path=os.path.join('static', 'data', 'resilience_strategies.json'),
+    defaults=DEFAULT_RESILIENCE_STRATEGIES
+)
+
+def load_resilience_strategies():
+    """Return the cached resilience strategy catalog (category -> strategies)."""
+    return strategy_store.categories()
+
+def _vader_compound(doc):
+    return get_sentiment_analyzer().polarity_scores(doc.text)['compound']
+
+def score_sentiments(texts):
+    """
+    Score a chunk of texts with one vectorized VADER call.
+    
+    The compound scores are stored on the shared pipeline documents, so the
+    score_text calls that follow for these texts skip per-text VADER.
+    """
+    pipeline = get_pipeline()
+    docs = [pipeline.document(text) for text in texts]
+    pending = [doc for doc in docs if not doc.has_score('vader_compound')]
+    if not pending:
+        return
+    compounds = get_batch_sentiment_scorer().compound_scores([doc.text for doc in pending])
+    for doc, compound in zip(pending, compounds.tolist()):
+        doc.set_score('vader_compound', compound)
+
+def score_text(text):
+    """
+    Deterministic part of analyze_text: sentiment, keywords and homesickness level.
+    
+    Raises on analyzer errors; callers decide on the fallback.
+    """
+    # Tokens and stopword filtering come from the shared pipeline document
+    doc = get_pipeline().document(text)
+    
+    # Get sentiment score
+    sentiment_score = doc.score('vader_compound', _vader_compound)
+    
+    # Match keywords against the filtered tokens
+    keyword_counts, keyword_total = get_lexicon().count_keywords(doc.filtered)
+    
+    # Calculate homesickness level based on keyword presence
+    text_length_factor = max(1, len(doc.filtered) / 10)
+    normalized_count = keyword_total / text_length_factor
+    
+    # Convert to 1-10 scale
+    homesickness_level = min(10, max(1, round(normalized_count * 3 + (1 - sentiment_score) * 5)))
+    
+    return {
+        'sentiment': sentiment_score,
+        'keywords': list(keyword_counts),
+        'homesickness_level': homesickness_level,
+        'token_count': len(doc.filtered),
+        'keyword_count': keyword_total
+    }
 
 def analyze_text(text):
     """
     Analyze text to determine sentiment and homesickness level.
+    
+    Scores are served from the analysis cache when the same text was seen
+    recently; strategy suggestions come from the TF-IDF recommendation index.
     Returns:
         dict: Analysis results containing sentiment, keywords, and suggestions
     """
     try:
-        # Get sentiment score
-        sentiment = sia.polarity_scores(text)
-        sentiment_score = sentiment['compound']
-        
-        # Tokenize and clean text
-        try:
-            tokens = word_tokenize(text.lower())
-        except Exception as e:
-            logger.error(f"Error with word_tokenize: {str(e)}")
-            # Fallback if word_tokenize fails
-            tokens = text.lower().split()
+        cache = get_cache('ml_processor', ANALYZER_VERSION)
+        scores = cache.get_or_compute(text, score_text)
+        sentiment_score = scores['sentiment']
+        homesickness_level = scores['homesickness_level']
         
-        filtered_tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
+        # Suggest the strategies whose TF-IDF vectors best match the text
+        suggestions = [match.item for match in recommendation_index.top_k(text, k=3, kind=KIND_STRATEGY)]
         
-        # Calculate homesickness level based on keyword presence
-        homesickness_count = sum(1 for word in filtered_tokens if word in HOMESICKNESS_KEYWORDS)
-        text_length_factor = max(1, len(filtered_tokens) / 10)
-        normalized_count = homesickness_count / text_length_factor
-        
-        # Convert to 1-10 scale
-        homesickness_level = min(10, max(1, round(normalized_count * 3 + (1 - sentiment_score) * 5)))
-        
-        # Get matching keywords
-        keywords = list(set(word for word in filtered_tokens if word in HOMESICKNESS_KEYWORDS))
-        
-        # Get suggestions based on homesickness level
-        strategies = load_resilience_strategies()
-        suggestions = []
-        
-        # Select strategies from each category
-        for category in ['social', 'cultural', 'routine']:
-            if category in strategies and strategies[category]:
-                suggestions.append(random.choice(strategies[category]))
+        # Nothing matched: select strategies from each category
+        if not suggestions:
+            for category in ['social', 'cultural', 'routine']:
+                category_strategies = strategy_store.by_category(category)
+                if category_strategies:
+                    suggestions.append(random.choice(category_strategies))
         
         logger.debug(f"Text analysis - Sentiment: {sentiment_score}, Homesickness level: {homesickness_level}")
         return {
             'sentiment': sentiment_score,
-            'keywords': keywords,
+            'keywords': list(scores['keywords']),
             'suggestions': suggestions,
-            'homesickness_level': homesickness_level
+            'homesickness_level': homesickness_level,
+            'token_count': scores['token_count'],
+            'keyword_count': scores['keyword_count']
         }
         
     except Exception as e:
@@ -226,5 +236,25 @@ def analyze_text(text):
             'sentiment': 0.0,
             'keywords': [],
             'suggestions': [],
-            'homesickness_level': 5
+            'homesickness_level': 5,
+            'token_count': 0,
+            'keyword_count': 0
         }
+
+def analyze_texts(texts, workers=None, chunk_size=64):
+    """
+    Analyze many texts, fanning out over worker processes for large batches.
+    
+    Each chunk's sentiment is scored in one vectorized call (score_sentiments)
+    before the texts are analyzed one by one.
+    
+    Args:
+        texts (iterable): Texts to analyze
+        workers (int): Number of worker processes (defaults to the CPU count)
+        chunk_size (int): Number of texts handed to a worker at a time
+        
+    Returns:
+        generator: analyze_text results, in input order
+    """
+    return analyze_in_batches(analyze_text, texts, workers=workers, chunk_size=chunk_size,
+                              prepare=score_sentiments)
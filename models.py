@@ -1,10 +1,12 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from utils import mood_rollup, report_cache
 
 db = SQLAlchemy()
 
-class User(db.Model):
+class User(UserMixin, db.Model):
     __tablename__ = 'users'
     
     id = db.Column(db.Integer, primary_key=True)
@@ -48,6 +50,9 @@ class UserProfile(db.Model):
 
 class MoodEntry(db.Model):
     __tablename__ = 'mood_entries'
+    __table_args__ = (
+        db.Index('ix_mood_entries_user_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -57,8 +62,29 @@ class MoodEntry(db.Model):
     entry_text = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class DailyMoodRollup(db.Model):
+    """Per-user daily mood/homesickness aggregates, maintained by utils.mood_rollup."""
+    __tablename__ = 'daily_mood_rollup'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    entry_count = db.Column(db.Integer, nullable=False)
+    mood_sum = db.Column(db.Integer, nullable=False)
+    mood_sum_sq = db.Column(db.Integer, nullable=False)
+    mood_min = db.Column(db.Integer, nullable=False)
+    mood_max = db.Column(db.Integer, nullable=False)
+    homesickness_sum = db.Column(db.Integer, nullable=False)
+    homesickness_sum_sq = db.Column(db.Integer, nullable=False)
+    homesickness_min = db.Column(db.Integer, nullable=False)
+    homesickness_max = db.Column(db.Integer, nullable=False)
+
+mood_rollup.track(MoodEntry)
+
 class GratitudeEntry(db.Model):
     __tablename__ = 'gratitude_entries'
+    __table_args__ = (
+        db.Index('ix_gratitude_entries_user_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -81,6 +107,9 @@ class ResilienceStrategy(db.Model):
 
 class UserStrategies(db.Model):
     __tablename__ = 'user_strategies'
+    __table_args__ = (
+        db.Index('ix_user_strategies_user_tried_at', 'user_id', 'tried_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -108,6 +137,9 @@ class Resource(db.Model):
 
 class UserResources(db.Model):
     __tablename__ = 'user_resources'
+    __table_args__ = (
+        db.Index('ix_user_resources_user_accessed_at', 'user_id', 'accessed_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -118,6 +150,9 @@ class UserResources(db.Model):
 
 class VoiceInteractions(db.Model):
     __tablename__ = 'voice_interactions'
+    __table_args__ = (
+        db.Index('ix_voice_interactions_user_created_at', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -127,6 +162,37 @@ class VoiceInteractions(db.Model):
     homesickness_level = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class Interaction(db.Model):
+    """A /process_voice request and the JSON analysis returned for it."""
+    __tablename__ = 'interactions'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    input_text = db.Column(db.Text, nullable=False)
+    response_text = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ProgressLog(db.Model):
+    __tablename__ = 'progress_logs'
+    __table_args__ = (
+        db.Index('ix_progress_logs_user_created_at', 'user_id', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    mood_score = db.Column(db.Integer)
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Feedback(db.Model):
+    __tablename__ = 'feedback'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    rating = db.Column(db.Integer, nullable=False)
+    comments = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class SupportGroup(db.Model):
     __tablename__ = 'support_groups'
     
@@ -150,3 +216,12 @@ class UserGroups(db.Model):
     group_id = db.Column(db.Integer, db.ForeignKey('support_groups.id'), nullable=False)
     joined_at = db.Column(db.DateTime, default=datetime.utcnow)
     role = db.Column(db.String(20), default='member')
+
+class UserDataVersion(db.Model):
+    """Per-user counter of writes to report inputs, maintained by utils.report_cache."""
+    __tablename__ = 'user_data_versions'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+report_cache.track(MoodEntry, GratitudeEntry, UserStrategies, UserResources, VoiceInteractions, UserGroups)
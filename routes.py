@@ -1,8 +1,16 @@
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, flash, session, current_app
+from flask import Response, stream_with_context
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import login_user, logout_user, login_required, current_user
-from .models import db, User, Interaction, ProgressLog, Feedback, Resource
-from .ml_processor import process_voice_input, load_resilience_strategies
+from models import db, User, Interaction, ProgressLog, Feedback
+from ml_processor import load_resilience_strategies
+from ml_processor import analyze_text
+from utils.gemini_integration import FALLBACK_STRATEGIES, iter_insights, valid_strategies
+from utils.analysis_router import get_router, route_text
+from config import Config
+from utils.job_queue import JobQueue, QueueFull
+from utils.resource_search import search_resources
+from utils.pagination import InvalidCursor, history_page, parse_datetime, serialize_row
 import json
 import datetime
 import logging
@@ -13,6 +21,13 @@ main = Blueprint('main', __name__)
 # Simulated user for MVP without full authentication
 DEMO_USER_ID = 1
 
+# Background runner for /process_voice requests made in async mode
+voice_jobs = JobQueue(
+    max_workers=Config.VOICE_JOB_WORKERS,
+    max_pending=Config.VOICE_JOB_MAX_PENDING,
+    ttl=Config.VOICE_JOB_TTL
+)
+
 @main.route('/')
 def index():
     if not current_user.is_authenticated:
@@ -25,6 +40,11 @@ def index():
         login_user(demo_user)
     return render_template('index.html')
 
+@main.route('/health')
+def health():
+    """Liveness check, with the analysis router's per-tier counters."""
+    return jsonify({'status': 'ok', 'analysis_router': get_router().stats()})
+
 @main.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -52,6 +72,40 @@ def logout():
 def dashboard():
     return render_template('dashboard.html')
 
+def _process_and_log(text, user_id):
+    """
+    Analyze text through the tiered analysis router and record the
+    interaction; returns the analysis response.
+    """
+    result = route_text(text)
+    response = {
+        'sentiment_score': result['sentiment'],
+        'homesickness_level': result['homesickness_level'],
+        'keywords': result['keywords'],
+        'strategies': [_strategy_card(s) for s in result['suggestions']],
+        'tier': result['tier']
+    }
+    if 'insights' in result:
+        response['insights'] = result['insights']
+    
+    # Log the interaction
+    interaction = Interaction(
+        user_id=user_id,
+        input_text=text,
+        response_text=json.dumps(response)
+    )
+    db.session.add(interaction)
+    db.session.commit()
+    
+    return response
+
+def _run_voice_job(app, text, user_id):
+    with app.app_context():
+        try:
+            return _process_and_log(text, user_id)
+        finally:
+            db.session.remove()
+
 @main.route('/process_voice', methods=['POST'])
 @login_required
 def process_voice():
@@ -59,38 +113,162 @@ def process_voice():
         text = request.json.get('text', '')
         if not text:
             return jsonify({'error': 'No text provided'}), 400
+        
+        # Async mode: queue the job and let the client poll for the result
+        if request.json.get('async', Config.PROCESS_VOICE_ASYNC):
+            try:
+                job_id = voice_jobs.submit(
+                    _run_voice_job, current_app._get_current_object(), text, current_user.id,
+                    owner=current_user.id
+                )
+            except QueueFull:
+                return jsonify({'error': 'Too many pending requests, please retry shortly'}), 503
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': url_for('main.process_voice_status', job_id=job_id)
+            }), 202
             
-        response = process_voice_input(text)
+        response = _process_and_log(text, current_user.id)
         
-        # Log the interaction
+        return jsonify({'response': response})
+    except Exception as e:
+        logging.error(f"Error processing voice input: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@main.route('/process_voice/<job_id>', methods=['GET'])
+@login_required
+def process_voice_status(job_id):
+    job = voice_jobs.get(job_id, owner=current_user.id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    payload = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == 'done':
+        payload['response'] = job['result']
+    elif job['status'] == 'failed':
+        payload['error'] = 'Internal server error'
+    return jsonify(payload)
+
+def _sse(event, data):
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _strategy_card(strategy):
+    return {
+        'title': strategy.get('title') or strategy.get('name'),
+        'description': strategy.get('description'),
+        'steps': strategy.get('steps', [])
+    }
+
+@main.route('/process_voice/stream', methods=['POST'])
+@login_required
+def process_voice_stream():
+    """
+    Streaming variant of /process_voice.
+    
+    Emits the local sentiment/keyword result immediately ('local'), then
+    Gemini's analysis ('insights') and personalized strategies ('strategies')
+    as each arrives, and finally the persisted interaction id ('done').
+
+    Strategies from Gemini that are not a list of title/description/steps
+    objects are replaced by FALLBACK_STRATEGIES. The interaction is saved
+    with whatever was produced even if a later part fails or the client
+    disconnects mid-stream.
+    """
+    text = (request.get_json(silent=True) or {}).get('text', '')
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    user_id = current_user.id
+
+    def save(response):
         interaction = Interaction(
-            user_id=current_user.id,
+            user_id=user_id,
             input_text=text,
-            response_text=response
+            response_text=json.dumps(response)
         )
         db.session.add(interaction)
         db.session.commit()
-        
-        return jsonify({'response': response})
-    except Exception as e:
-        logging.error(f"Error processing voice input: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return interaction.id
+
+    def generate():
+        response = None
+        saved = False
+        try:
+            local = analyze_text(text)
+            response = {
+                'sentiment_score': local['sentiment'],
+                'homesickness_level': local['homesickness_level'],
+                'keywords': local['keywords'],
+                'strategies': [_strategy_card(s) for s in local['suggestions']]
+            }
+            yield _sse('local', response)
+
+            for part, value in iter_insights(text, local['homesickness_level']):
+                if part == 'analysis':
+                    response['insights'] = value
+                    yield _sse('insights', {'insights': value})
+                else:
+                    if not valid_strategies(value):
+                        logging.warning("Gemini strategies have an unexpected shape; using fallback strategies")
+                        value = FALLBACK_STRATEGIES
+                    response['strategies'] = [_strategy_card(s) for s in value]
+                    yield _sse('strategies', {'strategies': response['strategies']})
+
+            saved = True
+            interaction_id = save(response)
+            yield _sse('done', {'interaction_id': interaction_id})
+        except Exception as e:
+            logging.error(f"Error streaming voice analysis: {str(e)}")
+            yield _sse('error', {'error': 'Internal server error'})
+        finally:
+            if response is not None and not saved:
+                try:
+                    save(response)
+                except Exception as e:
+                    db.session.rollback()
+                    logging.error(f"Error saving streamed voice interaction: {str(e)}")
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def _wants_json():
+    if request.args.get('format') == 'json':
+        return True
+    return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
 
 @main.route('/resources')
 @login_required
 def resources():
+    """
+    Search and browse resources.
+    
+    Query args: q (full-text query), category, cursor (from the previous
+    page's next_cursor) and limit. Returns JSON with ?format=json or an
+    Accept: application/json header, otherwise the resources page.
+    """
+    query = request.args.get('q', '').strip()
     category = request.args.get('category', 'all')
-    if category == 'all':
-        resources = Resource.query.all()
-    else:
-        resources = Resource.query.filter_by(category=category).all()
-    return render_template('resources.html', resources=resources)
+    cursor = request.args.get('cursor') or None
+    limit = request.args.get('limit', Config.RESOURCES_PAGE_SIZE, type=int)
+    
+    try:
+        page = search_resources(db.session, query=query, category=category, cursor=cursor, limit=limit)
+    except InvalidCursor:
+        if _wants_json():
+            return jsonify({'error': 'Invalid cursor'}), 400
+        page = search_resources(db.session, query=query, category=category, limit=limit)
+    
+    if _wants_json():
+        return jsonify(page)
+    return render_template('resources.html', resources=page['items'], facets=page['facets']['category'],
+                           next_cursor=page['next_cursor'], query=query, category=category)
 
 @main.route('/log_progress', methods=['POST'])
 def log_progress():
-    from models import ProgressLog
-    from app import db
-    
     try:
         data = request.get_json()
         if not data:
@@ -133,5 +311,48 @@ def feedback():
 @main.route('/progress')
 @login_required
 def progress():
-    logs = ProgressLog.query.filter_by(user_id=current_user.id).order_by(ProgressLog.created_at.desc()).all()
-    return render_template('progress.html', logs=logs)
+    """
+    Progress page with the newest window of logs; older ones lazy-load from
+    /api/history/progress. The total is only counted when the history runs
+    past this first window.
+    """
+    user_logs = ProgressLog.query.filter_by(user_id=current_user.id)
+    logs, next_cursor = history_page(user_logs, ProgressLog, limit=Config.HISTORY_PAGE_SIZE)
+    log_count = len(logs) if next_cursor is None else user_logs.count()
+    return render_template('progress.html', logs=logs, next_cursor=next_cursor, log_count=log_count)
+
+def _history_models():
+    from models import MoodEntry, GratitudeEntry, VoiceInteractions
+    return {
+        'progress': ProgressLog,
+        'mood': MoodEntry,
+        'gratitude': GratitudeEntry,
+        'voice': VoiceInteractions,
+    }
+
+@main.route('/api/history/<kind>')
+@login_required
+def history(kind):
+    """
+    One page of the current user's progress, mood, gratitude or voice history, newest first.
+    
+    Query args: cursor (next_cursor of the previous page), limit, and an
+    optional since/until ISO date range.
+    """
+    model = _history_models().get(kind)
+    if model is None:
+        return jsonify({'error': f'Unknown history: {kind}'}), 404
+    limit = max(1, min(request.args.get('limit', Config.HISTORY_PAGE_SIZE, type=int), Config.HISTORY_MAX_PAGE_SIZE))
+    
+    try:
+        rows, next_cursor = history_page(
+            model.query.filter_by(user_id=current_user.id), model,
+            cursor=request.args.get('cursor') or None,
+            limit=limit,
+            since=parse_datetime(request.args.get('since')),
+            until=parse_datetime(request.args.get('until'))
+        )
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'items': [serialize_row(row) for row in rows], 'next_cursor': next_cursor})
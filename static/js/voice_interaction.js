@@ -220,95 +220,23 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
     
-    // Process transcript with the backend
+    // Process transcript with the backend, rendering each part as it streams in
     function processTranscript(transcript) {
         console.log("Processing transcript:", transcript);
         
-        fetch('/process_voice', {
+        fetch('/process_voice/stream', {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
             },
-            body: JSON.stringify({ transcript: transcript })
+            body: JSON.stringify({ text: transcript })
         })
         .then(response => {
             if (!response.ok) {
                 throw new Error('Network response was not ok: ' + response.statusText);
             }
-            return response.json();
-        })
-        .then(data => {
-            console.log("Response from server:", data);
-            
-            // Show results UI
-            processingIndicator.style.display = 'none';
-            transcriptionResult.style.display = 'block';
-            
-            // Update sentiment display
-            const sentimentScore = data.sentiment_score;
-            const sentimentPercent = Math.round((sentimentScore + 1) * 50); // Convert -1 to 1 to 0-100%
-            
-            sentimentBar.style.width = sentimentPercent + '%';
-            sentimentBar.textContent = sentimentPercent + '%';
-            sentimentBar.setAttribute('aria-valuenow', sentimentPercent);
-            
-            // Set bar color based on sentiment
-            if (sentimentScore < -0.3) {
-                sentimentBar.className = 'progress-bar bg-danger';
-                sentimentDescription.textContent = 'Your responses indicate feelings of sadness or distress. This is common when adjusting to a new environment.';
-            } else if (sentimentScore < 0.3) {
-                sentimentBar.className = 'progress-bar bg-warning';
-                sentimentDescription.textContent = 'Your responses indicate mixed emotions. It is normal to have both positive and challenging experiences during adjustment.';
-            } else {
-                sentimentBar.className = 'progress-bar bg-success';
-                sentimentDescription.textContent = 'Your responses indicate positive emotions. Maintaining this outlook will help with adjustment.';
-            }
-            
-            // Update homesickness display
-            const homesicknessLevel = data.homesickness_level;
-            const homesicknessPercent = homesicknessLevel * 10;
-            
-            homesicknessBar.style.width = homesicknessPercent + '%';
-            homesicknessBar.textContent = homesicknessLevel + '/10';
-            homesicknessBar.setAttribute('aria-valuenow', homesicknessLevel);
-            
-            // Set homesickness description
-            if (homesicknessLevel >= 7) {
-                homesicknessDescription.textContent = 'Your responses suggest you may be experiencing significant homesickness. The strategies below are designed to help you address these feelings.';
-            } else if (homesicknessLevel >= 4) {
-                homesicknessDescription.textContent = 'Your responses suggest moderate homesickness. This is a common experience among international students.';
-            } else {
-                homesicknessDescription.textContent = 'Your responses suggest mild homesickness. The strategies below can help you maintain your emotional well-being.';
-            }
-            
-            // Display strategies
-            const strategies = data.strategies;
-            strategiesContainer.innerHTML = '';
-            
-            strategies.forEach(strategy => {
-                const strategyCard = document.createElement('div');
-                strategyCard.className = 'col-md-4 mb-3';
-                
-                strategyCard.innerHTML = `
-                    <div class="card h-100 shadow-sm strategy-card">
-                        <div class="card-body">
-                            <h5 class="card-title">${strategy.title}</h5>
-                            <p class="card-text">${strategy.description}</p>
-                            <h6>Steps:</h6>
-                            <ul class="list-unstyled">
-                                ${strategy.steps.map(step => `
-                                    <li class="step-item">
-                                        <i class="fas fa-chevron-right text-info"></i>
-                                        <span>${step}</span>
-                                    </li>
-                                `).join('')}
-                            </ul>
-                        </div>
-                    </div>
-                `;
-                
-                strategiesContainer.appendChild(strategyCard);
-            });
+            return readEventStream(response, handleStreamEvent);
         })
         .catch(error => {
             console.error('Error processing transcript:', error);
@@ -317,6 +245,139 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Read a text/event-stream response body and call onEvent(name, data) per message
+    function readEventStream(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        function pump() {
+            return reader.read().then(({ done, value }) => {
+                if (done) {
+                    return;
+                }
+                buffer += decoder.decode(value, { stream: true });
+                
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const message = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    
+                    let eventName = 'message';
+                    let data = '';
+                    message.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) {
+                            eventName = line.slice(6).trim();
+                        } else if (line.startsWith('data:')) {
+                            data += line.slice(5).trim();
+                        }
+                    });
+                    if (data) {
+                        onEvent(eventName, JSON.parse(data));
+                    }
+                }
+                return pump();
+            });
+        }
+        
+        return pump();
+    }
+    
+    function handleStreamEvent(eventName, data) {
+        console.log("Stream event:", eventName, data);
+        
+        if (eventName === 'local') {
+            // First meaningful paint: local sentiment, homesickness and strategies
+            processingIndicator.style.display = 'none';
+            transcriptionResult.style.display = 'block';
+            renderSentiment(data.sentiment_score);
+            renderHomesickness(data.homesickness_level);
+            renderStrategies(data.strategies);
+        } else if (eventName === 'insights') {
+            renderInsights(data.insights);
+        } else if (eventName === 'strategies') {
+            renderStrategies(data.strategies);
+        } else if (eventName === 'error') {
+            throw new Error(data.error);
+        }
+    }
+    
+    function renderSentiment(sentimentScore) {
+        const sentimentPercent = Math.round((sentimentScore + 1) * 50); // Convert -1 to 1 to 0-100%
+        
+        sentimentBar.style.width = sentimentPercent + '%';
+        sentimentBar.textContent = sentimentPercent + '%';
+        sentimentBar.setAttribute('aria-valuenow', sentimentPercent);
+        
+        // Set bar color based on sentiment
+        if (sentimentScore < -0.3) {
+            sentimentBar.className = 'progress-bar bg-danger';
+            sentimentDescription.textContent = 'Your responses indicate feelings of sadness or distress. This is common when adjusting to a new environment.';
+        } else if (sentimentScore < 0.3) {
+            sentimentBar.className = 'progress-bar bg-warning';
+            sentimentDescription.textContent = 'Your responses indicate mixed emotions. It is normal to have both positive and challenging experiences during adjustment.';
+        } else {
+            sentimentBar.className = 'progress-bar bg-success';
+            sentimentDescription.textContent = 'Your responses indicate positive emotions. Maintaining this outlook will help with adjustment.';
+        }
+    }
+    
+    function renderHomesickness(homesicknessLevel) {
+        const homesicknessPercent = homesicknessLevel * 10;
+        
+        homesicknessBar.style.width = homesicknessPercent + '%';
+        homesicknessBar.textContent = homesicknessLevel + '/10';
+        homesicknessBar.setAttribute('aria-valuenow', homesicknessLevel);
+        
+        // Set homesickness description
+        if (homesicknessLevel >= 7) {
+            homesicknessDescription.textContent = 'Your responses suggest you may be experiencing significant homesickness. The strategies below are designed to help you address these feelings.';
+        } else if (homesicknessLevel >= 4) {
+            homesicknessDescription.textContent = 'Your responses suggest moderate homesickness. This is a common experience among international students.';
+        } else {
+            homesicknessDescription.textContent = 'Your responses suggest mild homesickness. The strategies below can help you maintain your emotional well-being.';
+        }
+    }
+    
+    function renderInsights(insights) {
+        // Gemini's refined assessment replaces the local estimate when present
+        if (typeof insights.sentiment_score === 'number') {
+            renderSentiment(insights.sentiment_score);
+        }
+        if (typeof insights.homesickness_level === 'number') {
+            renderHomesickness(Math.round(insights.homesickness_level));
+        }
+    }
+    
+    function renderStrategies(strategies) {
+        strategiesContainer.innerHTML = '';
+        
+        strategies.forEach(strategy => {
+            const strategyCard = document.createElement('div');
+            strategyCard.className = 'col-md-4 mb-3';
+            
+            strategyCard.innerHTML = `
+                <div class="card h-100 shadow-sm strategy-card">
+                    <div class="card-body">
+                        <h5 class="card-title">${strategy.title}</h5>
+                        <p class="card-text">${strategy.description}</p>
+                        <h6>Steps:</h6>
+                        <ul class="list-unstyled">
+                            ${strategy.steps.map(step => `
+                                <li class="step-item">
+                                    <i class="fas fa-chevron-right text-info"></i>
+                                    <span>${step}</span>
+                                </li>
+                            `).join('')}
+                        </ul>
+                    </div>
+                </div>
+            `;
+            
+            strategiesContainer.appendChild(strategyCard);
+        });
+    }
+    
     // Update recording time display
     function updateRecordingTime() {
         const elapsedTime = Math.floor((Date.now() - recordingStartTime) / 1000);
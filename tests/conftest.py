@@ -0,0 +1,47 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app():
+    """Flask app bound to a fresh in-memory SQLite database with every model's table."""
+    from flask import Flask
+    from models import db
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def statements(app):
+    """
+    Context manager factory recording the (statement, parameters) of every
+    SQL statement the app's engine executes inside the block.
+    """
+    from sqlalchemy import event
+    from models import db
+
+    @contextmanager
+    def capture():
+        executed = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            executed.append((statement, parameters))
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield executed
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+
+    return capture
@@ -0,0 +1,90 @@
+import sqlite3
+
+import pytest
+
+from utils import analysis_cache
+from utils.analysis_cache import AnalysisCache, MemoryBackend, SQLiteBackend
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBackend
+    return lambda max_entries: SQLiteBackend(str(tmp_path / 'cache.db'), max_entries=max_entries)
+
+
+def test_stats_are_per_namespace(make_backend):
+    backend = make_backend(max_entries=3)
+    scores = AnalysisCache(backend, 'scores:1')
+    insights = AnalysisCache(backend, 'insights:1')
+
+    for text in ('a', 'b'):
+        scores.get_or_compute(text, lambda text: {'text': text})
+    for text in ('c', 'd'):
+        insights.get_or_compute(text, lambda text: {'text': text})
+
+    # The fourth entry evicted the oldest, which belonged to scores
+    assert len(backend) == 3
+    assert scores.stats()['entries'] == 1
+    assert scores.stats()['evictions'] == 1
+    assert insights.stats()['entries'] == 2
+    assert insights.stats()['evictions'] == 0
+
+
+def test_overwriting_a_key_does_not_change_the_count(make_backend):
+    backend = make_backend(max_entries=10)
+    backend.set('k', {'v': 1}, 60, namespace='n')
+    backend.set('k', {'v': 2}, 60, namespace='n')
+    assert len(backend) == 1
+    assert backend.namespace_stats('n')['entries'] == 1
+    assert backend.get('k') == {'v': 2}
+
+
+def test_expired_entries_are_counted_against_their_namespace(make_backend):
+    backend = make_backend(max_entries=10)
+    backend.set('k', {'v': 1}, -1, namespace='n')
+    assert backend.get('k') is None
+    assert backend.namespace_stats('n') == {'entries': 0, 'evictions': 0, 'expirations': 1}
+    assert len(backend) == 0
+
+
+def test_sqlite_count_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    first = SQLiteBackend(path, max_entries=3)
+    second = SQLiteBackend(path, max_entries=3)
+    for i in range(3):
+        first.set(f'first{i}', i, 60, namespace='n')
+    second.set('second', 0, 60, namespace='n')
+    assert len(first) == len(second) == 3
+    assert second.evictions == 1
+
+
+def test_sqlite_table_from_before_namespaces_is_recreated(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE analysis_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+        "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO analysis_cache VALUES ('k', '1', 1e12, 0)")
+    conn.commit()
+    conn.close()
+
+    backend = SQLiteBackend(path)
+    assert len(backend) == 0
+    backend.set('k', 1, 60, namespace='n')
+    assert backend.get('k') == 1
+
+
+def test_get_cache_is_keyed_on_name_and_version(monkeypatch):
+    monkeypatch.setattr(analysis_cache, '_caches', {})
+    monkeypatch.setattr(analysis_cache, '_backend', MemoryBackend())
+
+    old = analysis_cache.get_cache('scores', '1')
+    new = analysis_cache.get_cache('scores', '2')
+    assert old is not new
+    assert analysis_cache.get_cache('scores', '1') is old
+
+    old.get_or_compute('text', lambda text: {'version': 1})
+    assert new.get_or_compute('text', lambda text: {'version': 2}) == {'version': 2}
+    assert set(analysis_cache.all_stats()) == {'scores:1', 'scores:2'}
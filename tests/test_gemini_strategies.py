@@ -0,0 +1,22 @@
+import pytest
+
+from utils.gemini_integration import FALLBACK_STRATEGIES, valid_strategies
+
+
+def test_fallback_strategies_are_valid():
+    assert valid_strategies(FALLBACK_STRATEGIES)
+
+
+@pytest.mark.parametrize('payload', [
+    None,
+    [],
+    {'title': 'Call home', 'description': 'Talk to family', 'steps': []},
+    'Call home',
+    ['Call home'],
+    [{'title': 'Call home', 'description': 'Talk to family'}],
+    [{'name': 'Call home', 'description': 'Talk to family', 'steps': []}],
+    [{'title': 'Call home', 'description': 'Talk to family', 'steps': 'Pick a time'}],
+    [FALLBACK_STRATEGIES[0], None],
+])
+def test_malformed_payloads_are_rejected(payload):
+    assert not valid_strategies(payload)
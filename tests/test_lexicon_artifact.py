@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from utils import lexicon_artifact
+from utils.lexicon_artifact import LexiconArtifact, write_artifact
+
+VADER = {'good': 1.9, 'bad': -2.5, ':)': 2.0, "can't stand": -2.0}
+STOP_WORDS = ['a', 'the']
+KEYWORDS = {'homesickness': ['home', 'family']}
+
+
+@pytest.fixture
+def artifact_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'data' / 'lexicon.bin')
+    write_artifact(path, VADER, STOP_WORDS, KEYWORDS, lemmas={'families': 'family'})
+    monkeypatch.setattr(lexicon_artifact, '_artifact', LexiconArtifact(path))
+    monkeypatch.setattr(lexicon_artifact, '_artifact_loaded', True)
+    monkeypatch.setattr(lexicon_artifact, '_vader_lexicon', None)
+    return path
+
+
+def test_default_path_does_not_depend_on_the_working_directory():
+    if 'HOMEBRIDGE_LEXICON_PATH' not in os.environ:
+        assert os.path.isabs(lexicon_artifact.DEFAULT_ARTIFACT_PATH)
+
+
+def test_artifact_round_trip(artifact_path):
+    artifact = LexiconArtifact(artifact_path)
+    assert artifact.vader_lexicon() == VADER
+    assert artifact.stop_words() == frozenset(STOP_WORDS)
+    assert artifact.keyword_tables() == KEYWORDS
+    assert artifact.lemmas() == {'families': 'family'}
+
+
+def test_sentiment_analyzer_scores_with_the_artifact_lexicon(artifact_path):
+    sia = lexicon_artifact.sentiment_analyzer()
+    assert sia.lexicon == VADER
+    assert sia.lexicon is lexicon_artifact.vader_lexicon()
+    assert sia.polarity_scores('good')['compound'] > 0
+    assert sia.polarity_scores('bad')['compound'] < 0
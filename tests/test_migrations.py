@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from models import db
+from utils.migrations import MIGRATIONS, applied_versions, upgrade
+
+
+def fresh_engine(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={'timeout': 30})
+    db.metadata.create_all(engine)
+    return engine
+
+
+def test_upgrade_applies_everything_once(tmp_path):
+    engine = fresh_engine(tmp_path / 'app.db')
+    assert upgrade(engine) == [version for version, _, _ in MIGRATIONS]
+    assert upgrade(engine) == []
+    assert applied_versions(engine) == {version for version, _, _ in MIGRATIONS}
+    assert 'ix_mood_entries_user_created_at' in {ix['name'] for ix in inspect(engine).get_indexes('mood_entries')}
+
+
+def test_workers_booting_together_apply_each_migration_once(tmp_path):
+    path = tmp_path / 'app.db'
+    fresh_engine(path).dispose()
+    workers = 6
+    barrier = threading.Barrier(workers)
+    results, errors = [], []
+
+    def boot():
+        engine = create_engine(f"sqlite:///{path}", connect_args={'timeout': 30})
+        barrier.wait()
+        try:
+            results.append(upgrade(engine))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            engine.dispose()
+
+    threads = [threading.Thread(target=boot) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    applied = sorted(version for versions in results for version in versions)
+    assert applied == [version for version, _, _ in MIGRATIONS]
+    with create_engine(f"sqlite:///{path}").connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM schema_migrations")).scalar() == len(MIGRATIONS)
+
+
+def test_sqlite_upgrade_is_all_or_nothing(tmp_path, monkeypatch):
+    engine = fresh_engine(tmp_path / 'app.db')
+    monkeypatch.setattr('utils.migrations.MIGRATIONS', MIGRATIONS + [(99, 'Broken', ['NOT SQL'])])
+    with pytest.raises(Exception):
+        upgrade(engine)
+    assert applied_versions(engine) == set()
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, User, MoodEntry
+from utils.pagination import InvalidCursor, decode_sort_key, encode_cursor, history_page
+
+
+@pytest.fixture
+def entries(app):
+    now = datetime(2026, 1, 1, 12)
+    db.session.add(User(id=1, username='ana', email='ana@example.com', password_hash='x'))
+    db.session.add_all([
+        MoodEntry(user_id=1, mood_score=5, homesickness_level=5, created_at=now - timedelta(hours=i))
+        for i in range(5)
+    ])
+    db.session.commit()
+    return MoodEntry.query.filter_by(user_id=1)
+
+
+def test_pages_walk_the_whole_history_newest_first(entries):
+    seen, cursor = [], None
+    while True:
+        rows, cursor = history_page(entries, MoodEntry, cursor=cursor, limit=2)
+        seen.extend(rows)
+        if cursor is None:
+            break
+    assert len(seen) == 5
+    assert [row.created_at for row in seen] == sorted((row.created_at for row in seen), reverse=True)
+
+
+def test_decode_sort_key_round_trip():
+    assert decode_sort_key(encode_cursor('2026-01-01T12:00:00', 7)) == ('2026-01-01T12:00:00', 7)
+
+
+@pytest.mark.parametrize('cursor', [
+    encode_cursor('2026-01-01T12:00:00', '7'),
+    encode_cursor('2026-01-01T12:00:00', 7.5),
+    encode_cursor('2026-01-01T12:00:00', True),
+    encode_cursor('2026-01-01T12:00:00', [7]),
+    encode_cursor('2026-01-01T12:00:00'),
+    encode_cursor('2026-01-01T12:00:00', 7, 8),
+    encode_cursor(7, 7),
+    'not-a-cursor',
+], ids=['string id', 'float id', 'bool id', 'list id', 'short', 'long', 'bad date', 'garbage'])
+def test_malformed_cursors_are_rejected(entries, cursor):
+    with pytest.raises(InvalidCursor):
+        history_page(entries, MoodEntry, cursor=cursor)
@@ -0,0 +1,81 @@
+"""
+The per-user time-window statements AnalyticsProcessor and the history API
+actually issue must search their composite (user_id, time) index.
+
+Statements are captured as executed (before_cursor_execute) and replayed
+under EXPLAIN QUERY PLAN with the same parameters, so a change to how a
+query is built is checked, not a hand-written copy of it.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, MoodEntry, GratitudeEntry, VoiceInteractions
+from analytics_processor import AnalyticsProcessor
+from utils.pagination import encode_cursor, history_page
+
+INDEXES = {
+    'mood_entries': 'ix_mood_entries_user_created_at',
+    'gratitude_entries': 'ix_gratitude_entries_user_created_at',
+    'voice_interactions': 'ix_voice_interactions_user_created_at',
+    'user_resources': 'ix_user_resources_user_accessed_at',
+    'user_strategies': 'ix_user_strategies_user_tried_at',
+}
+
+
+def query_plan(statement, parameters):
+    cursor = db.session.connection().connection.driver_connection.cursor()
+    return [row[-1] for row in cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()]
+
+
+def searches(plan, table):
+    """The plan line that reads table, asserting it searches the table's composite index."""
+    lines = [line for line in plan if re.search(rf'\b{table}\b', line)]
+    assert lines, plan
+    for line in lines:
+        assert re.search(rf'USING (COVERING )?INDEX {INDEXES[table]}\b', line), line
+    return lines
+
+
+@pytest.fixture
+def plans_of(statements):
+    """Run fn and return the EXPLAIN QUERY PLAN of every SELECT it issued."""
+    def plans(fn):
+        with statements() as executed:
+            fn()
+        selects = [(sql, params) for sql, params in executed if sql.lstrip().upper().startswith('SELECT')]
+        assert selects
+        return [query_plan(sql, params) for sql, params in selects]
+    return plans
+
+
+@pytest.mark.parametrize('user_ids', [[1], [1, 2, 3]], ids=['one user', 'batch'])
+def test_engagement_union_searches_every_index(plans_of, user_ids):
+    processor = AnalyticsProcessor(db)
+    plan, = plans_of(lambda: processor.calculate_users_engagement(user_ids))
+    for table in INDEXES:
+        searches(plan, table)
+
+
+def test_mood_entry_query_searches_index(plans_of):
+    processor = AnalyticsProcessor(db)
+    rollup_plan, entries_plan = plans_of(lambda: processor.analyze_mood_trends(1))
+    assert any('daily_mood_rollup' in line for line in rollup_plan), rollup_plan
+    searches(entries_plan, 'mood_entries')
+
+
+def test_voice_aggregates_search_index(plans_of):
+    processor = AnalyticsProcessor(db)
+    _, voice_plan = plans_of(lambda: processor.count_users_social_activity([1]))
+    searches(voice_plan, 'voice_interactions')
+
+
+@pytest.mark.parametrize('model', [MoodEntry, GratitudeEntry, VoiceInteractions])
+def test_history_page_searches_index_without_sorting(plans_of, model):
+    since = datetime.now() - timedelta(days=30)
+    cursor = encode_cursor(datetime.now().isoformat(), 100)
+    plan, = plans_of(lambda: history_page(model.query.filter_by(user_id=1), model, cursor=cursor, since=since))
+    searches(plan, model.__tablename__)
+    # Newest-first order comes from walking the index backwards, not a sort
+    assert not any('TEMP B-TREE' in line for line in plan), plan
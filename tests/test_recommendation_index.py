@@ -0,0 +1,48 @@
+import pytest
+from flask import current_app
+
+from models import db, Resource
+from utils.recommendation_index import KIND_RESOURCE, KIND_STRATEGY, RecommendationIndex
+from utils.text_pipeline import TextPipeline
+
+
+class FakeStore:
+    def __init__(self, strategies):
+        self._snapshot = strategies
+
+    def snapshot(self):
+        return self._snapshot
+
+    def iter_strategies(self):
+        for i, (category, strategy) in enumerate(self._snapshot):
+            yield str(i), category, strategy
+
+
+@pytest.fixture
+def index(app):
+    db.session.add(Resource(id=1, name='Counselling services', category='health',
+                            description='Talk to a counsellor about feeling homesick'))
+    db.session.commit()
+    store = FakeStore([('social', {'title': 'Call home', 'description': 'Call your family at home', 'steps': []})])
+    index = RecommendationIndex({'levels': store}, pipeline=TextPipeline(stop_words=()))
+    yield index
+    index.stop_resource_refresh()
+
+
+def test_strategy_queries_issue_no_sql(index, statements):
+    with statements() as executed:
+        matches = index.top_k('I miss my family at home', kind=KIND_STRATEGY)
+    assert [match.item['title'] for match in matches] == ['Call home']
+    assert executed == []
+
+
+def test_resources_are_indexed_at_startup_and_on_sync_only(index):
+    index.start_resource_refresh(current_app, 0)
+    assert [match.key for match in index.top_k('counsellor', kind=KIND_RESOURCE)] == ['resource:1']
+
+    db.session.add(Resource(id=2, name='Counsellor drop-in', category='health', description='No appointment'))
+    db.session.commit()
+    assert len(index.top_k('counsellor', kind=KIND_RESOURCE)) == 1
+
+    index.sync_resources()
+    assert len(index.top_k('counsellor', kind=KIND_RESOURCE)) == 2
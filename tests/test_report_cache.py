@@ -0,0 +1,95 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models import (
+    db, User, MoodEntry, GratitudeEntry, ResilienceStrategy, UserStrategies, Resource, UserResources,
+    SupportGroup, UserGroups, VoiceInteractions
+)
+from analytics_processor import AnalyticsProcessor
+from utils import report_cache
+
+
+@pytest.fixture
+def processor(app, monkeypatch):
+    monkeypatch.setattr(report_cache, '_cache', None)
+    db.session.add_all([
+        User(id=1, username='ana', email='ana@example.com', password_hash='x'),
+        User(id=2, username='ben', email='ben@example.com', password_hash='x'),
+        ResilienceStrategy(id=1, name='Call home', category='social'),
+        Resource(id=1, name='Counselling', category='health'),
+        SupportGroup(id=1, name='Newcomers'),
+        MoodEntry(user_id=1, mood_score=5, homesickness_level=5, created_at=datetime.now() - timedelta(days=1)),
+        MoodEntry(user_id=2, mood_score=5, homesickness_level=5, created_at=datetime.now() - timedelta(days=1)),
+    ])
+    db.session.commit()
+    return AnalyticsProcessor(db)
+
+
+TRACKED_ROWS = {
+    'MoodEntry': lambda now: MoodEntry(user_id=1, mood_score=9, homesickness_level=2, created_at=now),
+    'GratitudeEntry': lambda now: GratitudeEntry(user_id=1, entry_text='A call with my sister', created_at=now),
+    'UserStrategies': lambda now: UserStrategies(user_id=1, strategy_id=1, effectiveness_score=5, tried_at=now),
+    'UserResources': lambda now: UserResources(user_id=1, resource_id=1, accessed_at=now),
+    'VoiceInteractions': lambda now: VoiceInteractions(user_id=1, transcript='Better', created_at=now),
+    'UserGroups': lambda now: UserGroups(user_id=1, group_id=1, role='member'),
+}
+
+
+@pytest.mark.parametrize('model', TRACKED_ROWS)
+def test_insert_of_each_tracked_model_invalidates_only_its_user(processor, model):
+    cache = report_cache.get_report_cache()
+    before = processor.get_wellness_report(1)
+    other = processor.get_wellness_report(2)
+
+    db.session.add(TRACKED_ROWS[model](datetime.now()))
+    db.session.commit()
+
+    misses = cache.misses
+    assert processor.get_wellness_report(1) != before
+    assert cache.misses == misses + 1
+    assert processor.get_wellness_report(2) == other
+    assert cache.misses == misses + 1
+
+
+def test_resource_access_is_not_served_stale(processor):
+    processor.get_wellness_report(1)
+    db.session.add(UserResources(user_id=1, resource_id=1, accessed_at=datetime.now()))
+    db.session.commit()
+    metrics = processor.get_wellness_report(1)['detailed_analysis']['engagement_metrics']['metrics']
+    assert metrics['resource_access'] == 1
+
+
+def test_update_and_delete_invalidate(processor):
+    cache = report_cache.get_report_cache()
+    entry = MoodEntry.query.filter_by(user_id=1).one()
+    processor.get_wellness_report(1)
+
+    entry.mood_score = 1
+    db.session.commit()
+    assert processor.get_wellness_report(1)['detailed_analysis']['mood_trends']['average_mood'] == 1
+    misses = cache.misses
+
+    db.session.delete(entry)
+    db.session.commit()
+    assert 'error' in processor.get_wellness_report(1)['detailed_analysis']['mood_trends']
+    assert cache.misses == misses + 1
+
+
+def test_key_includes_window_end_date(processor):
+    cache = report_cache.get_report_cache()
+    compute = lambda: {'n': cache.misses}
+    cache.get_or_compute(db.session, 1, 'test', compute, as_of=date(2026, 1, 1))
+    cache.get_or_compute(db.session, 1, 'test', compute, as_of=date(2026, 1, 1))
+    cache.get_or_compute(db.session, 1, 'test', compute, as_of=date(2026, 1, 2))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_callers_get_their_own_copy(processor):
+    report = processor.get_wellness_report(1)
+    report['overview']['mood_status'] = 'edited'
+    report['detailed_analysis'].clear()
+
+    cached = processor.get_wellness_report(1)
+    assert cached['overview']['mood_status'] != 'edited'
+    assert cached['detailed_analysis']
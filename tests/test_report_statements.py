@@ -0,0 +1,76 @@
+"""
+Wellness reports issue a fixed number of SQL statements, however much
+history a user has (no per-row lazy loads or per-section re-queries).
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import (
+    db, User, MoodEntry, ResilienceStrategy, UserStrategies, SupportGroup, UserGroups, VoiceInteractions
+)
+from analytics_processor import AnalyticsProcessor
+
+# rollup, mood entries, strategies + category, group memberships, voice aggregates, engagement
+MAX_REPORT_STATEMENTS = 6
+
+# user id -> rows per table
+USERS = {1: 3, 2: 300}
+
+
+@pytest.fixture
+def processor(app):
+    rng = random.Random(42)
+    now = datetime.now()
+    db.session.add_all([ResilienceStrategy(id=i, name=f'Strategy {i}', category=f'category {i % 3}')
+                        for i in range(1, 31)])
+    db.session.add_all([SupportGroup(id=i, name=f'Group {i}') for i in range(1, 11)])
+    for user_id, rows in USERS.items():
+        db.session.add(User(id=user_id, username=f'user{user_id}', email=f'user{user_id}@example.com',
+                            password_hash='x'))
+        for _ in range(rows):
+            when = now - timedelta(hours=rng.randint(1, 24 * 29))
+            db.session.add_all([
+                MoodEntry(user_id=user_id, mood_score=rng.randint(1, 10), homesickness_level=rng.randint(1, 10),
+                          created_at=when),
+                UserStrategies(user_id=user_id, strategy_id=rng.randint(1, 30), effectiveness_score=3,
+                               tried_at=when),
+                UserGroups(user_id=user_id, group_id=rng.randint(1, 10), role='member'),
+                VoiceInteractions(user_id=user_id, transcript='hello', created_at=when),
+            ])
+    db.session.commit()
+    db.session.expunge_all()
+    return AnalyticsProcessor(db)
+
+
+def test_report_statements_are_bounded_and_independent_of_history(processor, statements):
+    counts = {}
+    for user_id in USERS:
+        with statements() as executed:
+            report = processor.generate_wellness_report(user_id)
+        assert 'error' not in report['detailed_analysis']['resilience_insights']
+        counts[user_id] = len(executed)
+
+    assert max(counts.values()) <= MAX_REPORT_STATEMENTS, counts
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_cohort_reports_use_the_same_statements_for_a_whole_batch(processor, statements):
+    with statements() as executed:
+        written = processor.generate_cohort_reports(list(USERS), lambda user_id, report: None)
+    assert written == len(USERS)
+    assert len(executed) <= MAX_REPORT_STATEMENTS
+
+
+@pytest.mark.parametrize('method, expected', [
+    ('analyze_mood_trends', 2),
+    ('generate_resilience_insights', 1),
+    ('analyze_social_engagement', 2),
+    ('calculate_user_engagement', 1),
+])
+def test_sections_only_query_their_own_tables(processor, statements, method, expected):
+    for user_id in USERS:
+        with statements() as executed:
+            getattr(processor, method)(user_id)
+        assert len(executed) == expected, executed
@@ -0,0 +1,64 @@
+import pytest
+
+from models import db, Resource
+from utils import resource_search
+from utils.pagination import InvalidCursor, encode_cursor
+from utils.resource_search import query_terms, search_resources
+
+
+@pytest.fixture
+def resources(app, monkeypatch):
+    # Every test gets a new in-memory database, so the index must be set up again
+    monkeypatch.setattr(resource_search, '_backends', {})
+    db.session.add_all([
+        Resource(name='Self-care workshop', category='wellness', description='Practical self-care for exam season'),
+        Resource(name='Sleep clinic', category='health', description="For students who can't sleep"),
+        Resource(name='Well-being coaching', category='wellness', description='One-on-one sessions'),
+        Resource(name='Library tours', category='academic', description='Find your way around'),
+    ])
+    db.session.commit()
+    assert resource_search.ensure_search_index(db.engine) == 'fts5'
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('self-care', ['self', 'care']),
+    ('Well-being', ['well', 'being']),
+    ('e-mail', ['e', 'mail']),
+    ("can't sleep", ['can', 'sleep']),
+    ("my mom's advice", ['my', 'mom', 'advice']),
+    ('?!', []),
+])
+def test_query_terms(query, expected):
+    assert query_terms(query) == expected
+
+
+def names(page):
+    return [item['name'] for item in page['items']]
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('self-care', ['Self-care workshop']),
+    ('well-being', ['Well-being coaching']),
+    ("can't sleep", ['Sleep clinic']),
+])
+def test_hyphenated_and_contracted_queries_filter(resources, query, expected):
+    assert names(search_resources(db.session, query=query)) == expected
+
+
+def test_query_without_terms_matches_nothing(resources):
+    page = search_resources(db.session, query='?!')
+    assert page['items'] == [] and page['facets'] == {'category': []}
+    assert len(search_resources(db.session, query='   ')['items']) == 4
+
+
+def test_ranked_pages_follow_cursor(resources):
+    first = search_resources(db.session, query='wellness', limit=1)
+    second = search_resources(db.session, query='wellness', cursor=first['next_cursor'], limit=1)
+    assert second['next_cursor'] is None
+    assert sorted(names(first) + names(second)) == ['Self-care workshop', 'Well-being coaching']
+    assert first['facets'] == {'category': [{'value': 'wellness', 'count': 2}]}
+
+
+def test_cursor_with_non_integer_id_is_rejected(resources):
+    with pytest.raises(InvalidCursor):
+        search_resources(db.session, query='wellness', cursor=encode_cursor(1.0, '1 OR 1=1'))
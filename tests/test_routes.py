@@ -0,0 +1,212 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask_login import LoginManager
+
+import routes
+from config import Config
+from models import db, User, Interaction, MoodEntry, ProgressLog, Resource
+from utils import resource_search
+
+ANALYSIS = {
+    'sentiment': -0.4,
+    'homesickness_level': 7,
+    'keywords': ['home', 'family'],
+    'suggestions': [{'title': 'Call home', 'description': 'Call your family', 'steps': []}],
+}
+
+
+@pytest.fixture
+def client(app):
+    app.config.update(SECRET_KEY='test', TESTING=True)
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+    app.register_blueprint(routes.main)
+
+    user = User(username='student', email='student@example.com')
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.commit()
+
+    client = app.test_client()
+    assert client.post('/login', data={'username': 'student', 'password': 'secret'}).status_code == 302
+    return client
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Record the (template, context) of each page render instead of rendering it."""
+    calls = []
+
+    def render_template(template, **context):
+        calls.append((template, context))
+        return template
+
+    monkeypatch.setattr(routes, 'render_template', render_template)
+    return calls
+
+
+def events(body):
+    """Parse a text/event-stream body into (event, data) pairs."""
+    parsed = []
+    for message in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.split('\n'))
+        parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+def test_process_voice_async_submit_and_poll(client, monkeypatch):
+    monkeypatch.setattr(routes, 'route_text', lambda text: dict(ANALYSIS, tier='local'))
+
+    submitted = client.post('/process_voice', json={'text': 'I miss my family', 'async': True})
+    assert submitted.status_code == 202
+    job = submitted.get_json()
+    assert job['status'] == 'queued'
+
+    deadline = time.monotonic() + 5
+    while True:
+        status = client.get(job['status_url']).get_json()
+        if status['status'] in ('done', 'failed') or time.monotonic() > deadline:
+            break
+        time.sleep(0.01)
+
+    assert status['status'] == 'done'
+    assert status['response']['homesickness_level'] == 7
+    assert status['response']['strategies'][0]['title'] == 'Call home'
+    assert Interaction.query.filter_by(input_text='I miss my family').count() == 1
+
+
+def test_process_voice_unknown_job_is_404(client):
+    assert client.get('/process_voice/no-such-job').status_code == 404
+
+
+def test_process_voice_stream_emits_local_result_first(client, monkeypatch):
+    monkeypatch.setattr(routes, 'analyze_text', lambda text: dict(ANALYSIS))
+    monkeypatch.setattr(routes, 'iter_insights', lambda text, level: iter([('analysis', 'Homesick but coping')]))
+
+    response = client.post('/process_voice/stream', json={'text': 'I miss my family'})
+    assert response.mimetype == 'text/event-stream'
+    stream = events(response.get_data(as_text=True))
+
+    event, local = stream[0]
+    assert event == 'local'
+    assert local['sentiment_score'] == -0.4
+    assert local['keywords'] == ['home', 'family']
+    assert [event for event, _ in stream[1:]] == ['insights', 'done']
+    assert db.session.get(Interaction, stream[-1][1]['interaction_id']) is not None
+
+
+@pytest.fixture
+def resources(client, monkeypatch):
+    monkeypatch.setattr(resource_search, '_backends', {})
+    db.session.add_all([
+        Resource(name='Counselling service', category='health', description='Talk to a counsellor'),
+        Resource(name='Sleep clinic', category='health', description='For students who cannot sleep'),
+        Resource(name='Peer counselling', category='wellness', description='Students who have been homesick too'),
+        Resource(name='Library tours', category='academic', description='Find your way around'),
+    ])
+    db.session.commit()
+    return client
+
+
+def test_resources_search_with_facets(resources):
+    page = resources.get('/resources?q=counselling&format=json').get_json()
+    assert sorted(item['name'] for item in page['items']) == ['Counselling service', 'Peer counselling']
+    assert page['facets']['category'] == [{'value': 'health', 'count': 1}, {'value': 'wellness', 'count': 1}]
+
+    page = resources.get('/resources?q=counselling&category=wellness&format=json').get_json()
+    assert [item['name'] for item in page['items']] == ['Peer counselling']
+    assert len(page['facets']['category']) == 2
+
+
+def test_resources_cursor_walks_every_page(resources):
+    seen, cursor = [], ''
+    while True:
+        page = resources.get(f'/resources?limit=3&cursor={cursor}', headers={'Accept': 'application/json'}).get_json()
+        seen += [item['name'] for item in page['items']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert seen == ['Counselling service', 'Library tours', 'Peer counselling', 'Sleep clinic']
+
+
+def test_resources_bad_cursor(resources, rendered):
+    response = resources.get('/resources?cursor=not-a-cursor&format=json')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
+
+    # The HTML page falls back to the first page rather than erroring
+    assert resources.get('/resources?cursor=not-a-cursor').status_code == 200
+    [(template, context)] = rendered
+    assert template == 'resources.html'
+    assert [item['name'] for item in context['resources']][0] == 'Counselling service'
+
+
+def add_logs(count, user_id=1):
+    start = datetime(2024, 1, 1)
+    db.session.add_all([
+        ProgressLog(user_id=user_id, mood_score=i % 10, notes=f'day {i}', created_at=start + timedelta(days=i))
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def test_progress_shows_newest_window(client, rendered, monkeypatch, statements):
+    monkeypatch.setattr(Config, 'HISTORY_PAGE_SIZE', 2)
+    add_logs(3)
+    add_logs(4, user_id=2)
+    assert client.get('/progress').status_code == 200
+    [(template, context)] = rendered
+    assert template == 'progress.html'
+    assert [log.notes for log in context['logs']] == ['day 2', 'day 1']
+    assert context['next_cursor'] is not None
+    assert context['log_count'] == 3
+
+    # A history that fits in the first window is not counted separately
+    monkeypatch.setattr(Config, 'HISTORY_PAGE_SIZE', 5)
+    with statements() as executed:
+        client.get('/progress')
+    assert rendered[-1][1]['log_count'] == 3
+    assert not any('count(' in statement.lower() for statement, _ in executed)
+
+
+def test_history_pages_through_own_entries(client):
+    add_logs(5)
+    add_logs(2, user_id=2)
+    notes, cursor = [], ''
+    while True:
+        page = client.get(f'/api/history/progress?limit=2&cursor={cursor}').get_json()
+        notes += [item['notes'] for item in page['items']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert notes == ['day 4', 'day 3', 'day 2', 'day 1', 'day 0']
+    assert 'user_id' not in page['items'][0]
+
+    page = client.get('/api/history/progress?since=2024-01-02&until=2024-01-04').get_json()
+    assert [item['notes'] for item in page['items']] == ['day 2', 'day 1']
+
+
+def test_history_of_other_kinds(client):
+    db.session.add(MoodEntry(user_id=1, mood_score=6, homesickness_level=4))
+    db.session.commit()
+    page = client.get('/api/history/mood').get_json()
+    assert [item['mood_score'] for item in page['items']] == [6]
+    assert client.get('/api/history/gratitude').get_json() == {'items': [], 'next_cursor': None}
+
+
+@pytest.mark.parametrize('kind', ['users', 'interactions', 'progress_logs'])
+def test_history_rejects_unknown_kinds(client, kind):
+    response = client.get(f'/api/history/{kind}')
+    assert response.status_code == 404
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('query', ['cursor=not-a-cursor', 'cursor=WzEsIDJd', 'since=yesterday'])
+def test_history_bad_arguments_are_400(client, query):
+    add_logs(1)
+    response = client.get(f'/api/history/progress?{query}')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
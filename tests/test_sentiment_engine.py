@@ -0,0 +1,86 @@
+"""
+BatchSentimentScorer keeps its COMPOUND_TOLERANCE promise against nltk's
+SentimentIntensityAnalyzer.polarity_scores, over a small synthetic lexicon
+and texts that exercise each valence rule.
+"""
+import pytest
+
+from utils import lexicon_artifact
+from utils.sentiment_engine import BatchSentimentScorer, COMPOUND_TOLERANCE
+
+LEXICON = {
+    'good': 1.9, 'great': 3.1, 'happy': 2.7, 'love': 3.2, 'fun': 2.3, 'nice': 1.8, 'kind': 2.4,
+    'bad': -2.5, 'sad': -2.1, 'lonely': -2.0, 'hate': -2.7, 'worst': -3.1, 'hard': -0.4,
+    'miss': -0.6, 'no': -1.2, 'okay': 0.9, 'lol': 2.9, ':)': 2.0, ':(': -1.9, 'weather': 0.0,
+}
+
+CORPUS = [
+    "good",
+    "Good.",
+    "GOOD day, bad night",
+    "The food is GREAT but the weather is BAD",
+    "I am happy!!!",
+    "I am happy!!!!!!",
+    "Am I happy??",
+    "Am I happy????",
+    "not good",
+    "isn't good at all",
+    "I don't love it",
+    "never so happy",
+    "never this sad",
+    "at least it was fun",
+    "least happy",
+    "very good",
+    "extremely bad",
+    "kind of good",
+    "kind of sad, but okay",
+    "It was sort of fun but mostly hard",
+    "Classes are hard, but my friends are great",
+    "I miss home but the people here are nice but lonely",
+    "no no no",
+    "No, it is not bad",
+    "without doubt good",
+    "I am under the weather today",
+    "the bomb",
+    "yeah right, great",
+    "LOL that was fun :)",
+    "sad :(",
+    "I hate hate hate this, it is the worst",
+    "Really really GOOD, totally HAPPY",
+    "nothing matters, nobody cares",
+    "",
+    "!!!",
+    "Happy. Sad. Good? Bad!",
+    "I'm not sad, I'm just not happy either",
+    "this is not the worst, but it is hardly good",
+]
+
+
+@pytest.fixture
+def analyzers(monkeypatch):
+    monkeypatch.setattr(lexicon_artifact, '_vader_lexicon', dict(LEXICON))
+    sia = lexicon_artifact.sentiment_analyzer()
+    return sia, BatchSentimentScorer(sia.lexicon, sia.constants)
+
+
+def test_batch_compound_matches_nltk(analyzers):
+    sia, scorer = analyzers
+    expected = [sia.polarity_scores(text)['compound'] for text in CORPUS]
+    actual = scorer.compound_scores(CORPUS)
+    for text, a, e in zip(CORPUS, actual, expected):
+        assert abs(a - e) <= COMPOUND_TOLERANCE, (text, a, e)
+
+
+def test_corpus_exercises_the_rules(analyzers):
+    # Guard against a corpus that only ever scores 0
+    sia, _ = analyzers
+    compounds = {round(sia.polarity_scores(text)['compound'], 4) for text in CORPUS}
+    assert len(compounds) > len(CORPUS) // 2
+
+
+@pytest.mark.parametrize('size', [1, 7])
+def test_batch_size_does_not_change_scores(analyzers, size):
+    _, scorer = analyzers
+    whole = list(scorer.compound_scores(CORPUS))
+    chunked = [score for i in range(0, len(CORPUS), size) for score in scorer.compound_scores(CORPUS[i:i + size])]
+    assert chunked == whole
@@ -0,0 +1,83 @@
+import pytest
+
+from utils import text_pipeline
+from utils.text_analysis import preprocess_text
+from utils.text_pipeline import TextPipeline, theme_matcher
+
+STOP_WORDS = {'i', 'my', 'at', 'the', 's', 't', 'can', 'and'}
+LEMMAS = {'self': 'self', 'care': 'care', 'helps': 'help', 'long': 'long', 'distance': 'distance',
+          'calls': 'call', 'e': 'e', 'mail': 'mail', 'mom': 'mom', 'sleep': 'sleep', 'pm': 'pm',
+          'u': 'u', 'class': 'class', 'covid': 'covid'}
+
+
+class RecordingMatcher:
+    def __init__(self):
+        self.calls = []
+
+    def match(self, text, lowered=False):
+        self.calls.append((text, lowered))
+        return theme_matcher.match(text, lowered=lowered)
+
+
+def test_themes_read_the_normalized_stage():
+    matcher = RecordingMatcher()
+    pipeline = TextPipeline(stop_words=(), matcher=matcher)
+    doc = pipeline.document("I miss my Mom's cooking")
+
+    assert list(doc.themes) == ['Family Separation']
+    assert matcher.calls == [(doc.normalized, True)]
+    start, end = doc.themes['Family Separation'].positions[0]
+    assert doc.normalized[start:end] == "mom's"
+
+
+def test_lowered_match_equals_match_of_the_original_text():
+    text = 'My FRIENDS back HOME and my Classmates here'
+    assert theme_matcher.match(text.lower(), lowered=True) == theme_matcher.match(text)
+
+
+def test_scores_are_computed_once_and_not_overwritten():
+    doc = TextPipeline(stop_words=()).document('hello')
+    calls = []
+
+    def scorer(doc):
+        calls.append(doc)
+        return 0.5
+
+    assert doc.score('s', scorer) == doc.score('s', scorer) == 0.5
+    assert len(calls) == 1
+
+    doc.set_score('s', 0.9)
+    doc.set_score('batch', 0.1)
+    assert doc.score('s', scorer) == 0.5
+    assert doc.has_score('batch') and doc.score('batch', scorer) == 0.1
+    assert not hasattr(doc, 'scores')
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = TextPipeline(stop_words=STOP_WORDS, preloaded_lemmas=LEMMAS)
+    monkeypatch.setattr(text_pipeline, '_pipeline', pipeline)
+    return pipeline
+
+
+def test_hyphenated_words_keep_their_parts(pipeline):
+    assert preprocess_text('self-care helps') == ['self', 'care', 'help']
+    assert preprocess_text('Long-distance calls and e-mail') == ['long', 'distance', 'call', 'e', 'mail']
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("my mom's", ['mom']),
+    ("I can't sleep", ['sleep']),
+    ('the U.S. class', ['u', 'class']),
+    ('at 5:30pm', ['pm']),
+    ('1,000 covid19', ['covid']),
+])
+def test_punctuation_and_digits_separate_words(pipeline, text, expected):
+    assert preprocess_text(text) == expected
+
+
+def test_tokens_stage_still_matches_word_tokenize(pipeline):
+    # ml_processor's scores depend on word_tokenize's handling of compounds
+    doc = pipeline.document('self-care helps')
+    assert doc.tokens == ['helps']
+    assert doc.parts == ['self', 'care', 'helps']
@@ -0,0 +1,52 @@
+import pytest
+
+from utils.text_pipeline import THEME_KEYWORDS, theme_matcher
+from utils.theme_matcher import strip_clitic
+
+
+def legacy_themes(text):
+    """The substring checks identify_themes used before the matcher."""
+    return [theme for theme, words in THEME_KEYWORDS.items() if any(word in text.lower() for word in words)]
+
+
+@pytest.mark.parametrize('text', [
+    "I miss my mom's cooking",
+    "my family's house is so far away",
+    "My sister’s wedding is next month",
+    "my parents' place",
+    "I feel so homesick tonight",
+    "Homesickness hits hardest on Sundays",
+    "friendship is hard to build here",
+    "I don't think I fit in",
+    "I can't stop thinking about home",
+    "My classmates ignored me in the lecture",
+])
+def test_matches_legacy_substring_themes(text):
+    assert theme_matcher.themes(text) == legacy_themes(text)
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Substring false positives the matcher drops on purpose
+    ("The whole morning went smoothly", []),
+    ("It will benefit my grades", ['Academic Challenges']),
+])
+def test_matches_whole_words_only(text, expected):
+    assert theme_matcher.themes(text) == expected
+
+
+@pytest.mark.parametrize('token, expected', [
+    ("mom's", 'mom'),
+    ("they're", 'they'),
+    ("didn't", 'did'),
+    ("can't", 'can'),
+    ("won’t", 'will'),
+    ("o'clock", "o'clock"),
+])
+def test_strip_clitic(token, expected):
+    assert strip_clitic(token) == expected
+
+
+def test_possessive_span_covers_the_word():
+    text = "I miss my mom's cooking"
+    (start, end), = theme_matcher.match(text)['Family Separation'].positions
+    assert text[start:end] == "mom's"
@@ -0,0 +1,311 @@
+"""
+Content-addressed cache for text analysis results.
+
+Results are keyed by a SHA-256 of the normalized input text plus an analyzer
+version string, so a change to an analyzer (or its lexicon) naturally misses
+old entries. Two backends are provided:
+
+* MemoryBackend - per-process LRU with TTL, the default.
+* SQLiteBackend - a single SQLite file shared by every worker on the host,
+  for multi-worker gunicorn deployments.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text):
+    """
+    Canonical form used for cache keys.
+
+    Only Unicode form and whitespace are normalized; case and punctuation are
+    kept because VADER scores "SAD!!!" differently from "sad".
+    """
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def cache_key(text, version):
+    digest = hashlib.sha256()
+    digest.update(version.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(normalize_text(text).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class MemoryBackend:
+    """Thread-safe in-process LRU cache with per-entry expiry and per-namespace counters."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._namespaces = defaultdict(Counter)
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def _removed(self, namespace, reason):
+        counts = self._namespaces[namespace]
+        counts['entries'] -= 1
+        counts[reason] += 1
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, namespace = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                self._removed(namespace, 'expirations')
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, namespace=None):
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self._namespaces[replaced[2]]['entries'] -= 1
+            self._entries[key] = (time.time() + ttl, value, namespace)
+            self._namespaces[namespace]['entries'] += 1
+            while len(self._entries) > self.max_entries:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.evictions += 1
+                self._removed(evicted, 'evictions')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for counts in self._namespaces.values():
+                counts['entries'] = 0
+
+    def namespace_stats(self, namespace):
+        """Entries, evictions and expirations of the entries stored under namespace."""
+        with self._lock:
+            counts = self._namespaces.get(namespace, Counter())
+            return {name: counts[name] for name in ('entries', 'evictions', 'expirations')}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    LRU cache with expiry stored in a SQLite file shared across processes.
+
+    Values must be JSON-serializable. Each thread gets its own connection; the
+    database runs in WAL mode so concurrent readers do not block the writer.
+
+    Row counts per namespace live in ``<table>_counts``, kept current by
+    insert/delete triggers, so the size check on every set reads a handful
+    of rows instead of counting the table, and stays right when several
+    processes write. Eviction and expiration counters are per process.
+    """
+
+    def __init__(self, path, max_entries=10000, table='analysis_cache'):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self.counts_table = f"{table}_counts"
+        self._local = threading.local()
+        self.evictions = 0
+        self.expirations = 0
+        self._evicted = Counter()
+        self._expired = Counter()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if columns and 'namespace' not in columns:
+                # Created before entries had a namespace; the contents are only a cache
+                conn.execute(f"DROP TABLE {table}")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, namespace TEXT NOT NULL DEFAULT '', value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_accessed_at ON {table} (accessed_at)")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.counts_table} ("
+                "namespace TEXT PRIMARY KEY, entries INTEGER NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {self.counts_table} (namespace, entries) VALUES (NEW.namespace, 1) "
+                "ON CONFLICT (namespace) DO UPDATE SET entries = entries + 1; END"
+            )
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table} BEGIN "
+                f"UPDATE {self.counts_table} SET entries = entries - 1 WHERE namespace = OLD.namespace; END"
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute(
+            f"SELECT value, expires_at, namespace FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if row[1] <= now:
+            if conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,)).rowcount:
+                self.expirations += 1
+                self._expired[row[2]] += 1
+            return None
+        conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl, namespace=None):
+        conn = self._connection()
+        now = time.time()
+        # An upsert rather than INSERT OR REPLACE: REPLACE's implicit delete does not fire the count trigger
+        conn.execute(
+            f"INSERT INTO {self.table} (key, namespace, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, "
+            "accessed_at = excluded.accessed_at",
+            (key, namespace or '', json.dumps(value), now + ttl, now)
+        )
+        overflow = len(self) - self.max_entries
+        if overflow > 0:
+            evicted = conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?) RETURNING namespace",
+                (overflow,)
+            ).fetchall()
+            self.evictions += len(evicted)
+            self._evicted.update(row[0] for row in evicted)
+
+    def clear(self):
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def namespace_stats(self, namespace):
+        """Entries stored under namespace (host-wide), and this process's evictions and expirations of them."""
+        namespace = namespace or ''
+        row = self._connection().execute(
+            f"SELECT entries FROM {self.counts_table} WHERE namespace = ?", (namespace,)
+        ).fetchone()
+        return {
+            'entries': row[0] if row else 0,
+            'evictions': self._evicted[namespace],
+            'expirations': self._expired[namespace],
+        }
+
+    def __len__(self):
+        return self._connection().execute(
+            f"SELECT COALESCE(SUM(entries), 0) FROM {self.counts_table}"
+        ).fetchone()[0]
+
+
+class AnalysisCache:
+    """
+    Analysis results keyed by normalized text and analyzer version, with hit/miss counters.
+
+    The version string is also the entries' namespace in the backend, so
+    stats() reports this cache's own entries, evictions and expirations
+    when several caches share one backend.
+    """
+
+    def __init__(self, backend, version, ttl=3600):
+        self.backend = backend
+        self.version = version
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, text, compute):
+        """
+        Return the cached result for text, computing and storing it on a miss.
+
+        Empty results (None, {} or []) are not cached, so failures and
+        fallbacks are retried on the next call.
+        """
+        key = cache_key(text, self.version)
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Error reading analysis cache: {str(e)}")
+            value = None
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute(text)
+        if value:
+            try:
+                self.backend.set(key, value, self.ttl, namespace=self.version)
+            except Exception as e:
+                logger.error(f"Error writing analysis cache: {str(e)}")
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            **self.backend.namespace_stats(self.version),
+        }
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_caches = {}
+
+
+def _default_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if Config.ANALYSIS_CACHE_BACKEND == 'sqlite':
+                _backend = SQLiteBackend(Config.ANALYSIS_CACHE_PATH, max_entries=Config.ANALYSIS_CACHE_SIZE)
+            else:
+                _backend = MemoryBackend(max_entries=Config.ANALYSIS_CACHE_SIZE)
+        return _backend
+
+
+def get_cache(name, version, ttl=None):
+    """
+    Return the process-wide cache for name at version, creating it on first use.
+
+    Each (name, version) pair gets its own cache, so a caller asking for a
+    new version never reads entries written under an older one.
+    """
+    cache = _caches.get((name, version))
+    if cache is None:
+        cache = _caches.setdefault(
+            (name, version),
+            AnalysisCache(_default_backend(), f"{name}:{version}", ttl or Config.ANALYSIS_CACHE_TTL)
+        )
+    return cache
+
+
+def all_stats():
+    """Counters for every registered cache, keyed by "name:version"."""
+    return {cache.version: cache.stats() for cache in _caches.values()}
@@ -0,0 +1,161 @@
+"""
+Tiered analysis router.
+
+Every text is scored by the local NLTK analyzer first. Gemini is consulted
+only when the local result looks unreliable (low confidence) or the text is
+long enough that heuristics miss most of it, and only if enough of the
+per-request latency budget is left. Per-tier counters show how often each
+path answered so thresholds can be tuned against cost and latency.
+"""
+import time
+import logging
+import threading
+
+from config import Config
+import ml_processor
+from utils import gemini_integration
+
+logger = logging.getLogger(__name__)
+
+TIER_LOCAL = 'local'
+TIER_GEMINI = 'gemini'
+TIER_LOCAL_FALLBACK = 'local_fallback'
+
+
+def local_confidence(result):
+    """
+    Confidence (0-1) in a local analysis result.
+
+    Combines VADER magnitude (a clearly positive or negative compound score),
+    homesickness keyword density and the amount of text the heuristics had
+    to work with. Short, neutral texts without keywords score lowest.
+    """
+    token_count = result.get('token_count', 0)
+    if not token_count:
+        return 0.0
+    sentiment_strength = min(1.0, abs(result.get('sentiment', 0.0)))
+    keyword_density = min(1.0, result.get('keyword_count', 0) / token_count * 5)
+    length_support = min(1.0, token_count / 20)
+    return round(0.4 * sentiment_strength + 0.4 * keyword_density + 0.2 * length_support, 3)
+
+
+class AnalysisRouter:
+    """Route texts between the local analyzer and Gemini, counting which tier answered."""
+
+    def __init__(self, confidence_threshold=0.5, long_text_chars=1500,
+                 latency_budget=3.0, min_escalation_time=0.5):
+        self.confidence_threshold = confidence_threshold
+        self.long_text_chars = long_text_chars
+        self.latency_budget = latency_budget
+        self.min_escalation_time = min_escalation_time
+        self._lock = threading.Lock()
+        self._counters = {
+            TIER_LOCAL: 0,
+            TIER_GEMINI: 0,
+            TIER_LOCAL_FALLBACK: 0,
+            'escalated_low_confidence': 0,
+            'escalated_long_text': 0,
+            'budget_exhausted': 0,
+        }
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            confidence_threshold=Config.ROUTER_CONFIDENCE_THRESHOLD,
+            long_text_chars=Config.ROUTER_LONG_TEXT_CHARS,
+            latency_budget=Config.ROUTER_LATENCY_BUDGET,
+            min_escalation_time=Config.ROUTER_MIN_ESCALATION_TIME,
+        )
+
+    def _count(self, *names):
+        with self._lock:
+            for name in names:
+                self._counters[name] += 1
+
+    def escalation_reason(self, text, confidence):
+        """Why a text should go to Gemini ('long_text', 'low_confidence'), or None."""
+        if len(text) >= self.long_text_chars:
+            return 'long_text'
+        if confidence < self.confidence_threshold:
+            return 'low_confidence'
+        return None
+
+    def analyze(self, text, latency_budget=None):
+        """
+        Analyze text with the cheapest tier that is confident enough.
+
+        Args:
+            text (str): User input
+            latency_budget (float): Seconds this request may spend in total
+                (defaults to the router's budget)
+
+        Returns:
+            dict: ml_processor.analyze_text's result plus 'tier', 'confidence'
+            and, when Gemini answered, its analysis under 'insights'
+        """
+        started = time.monotonic()
+        budget = self.latency_budget if latency_budget is None else latency_budget
+
+        result = ml_processor.analyze_text(text)
+        confidence = local_confidence(result)
+        result['confidence'] = confidence
+
+        reason = self.escalation_reason(text, confidence)
+        if reason is None:
+            self._count(TIER_LOCAL)
+            result['tier'] = TIER_LOCAL
+            return result
+
+        remaining = budget - (time.monotonic() - started)
+        if remaining < self.min_escalation_time:
+            self._count(TIER_LOCAL_FALLBACK, 'budget_exhausted')
+            result['tier'] = TIER_LOCAL_FALLBACK
+            return result
+
+        insights = gemini_integration.generate_insights(
+            text, result['homesickness_level'], deadline=remaining, include_strategies=False
+        )
+        if insights['sources']['analysis'] != 'gemini':
+            self._count(TIER_LOCAL_FALLBACK, f'escalated_{reason}')
+            result['tier'] = TIER_LOCAL_FALLBACK
+            return result
+
+        analysis = insights['analysis']
+        self._count(TIER_GEMINI, f'escalated_{reason}')
+        result['tier'] = TIER_GEMINI
+        result['insights'] = analysis
+        sentiment = analysis.get('sentiment_score')
+        if isinstance(sentiment, (int, float)) and -1.0 <= sentiment <= 1.0:
+            result['sentiment'] = sentiment
+        level = analysis.get('homesickness_level')
+        if isinstance(level, (int, float)) and 1 <= level <= 10:
+            result['homesickness_level'] = int(round(level))
+        return result
+
+    def stats(self):
+        """Tier and escalation counters, plus each tier's share of answered requests."""
+        with self._lock:
+            counters = dict(self._counters)
+        total = counters[TIER_LOCAL] + counters[TIER_GEMINI] + counters[TIER_LOCAL_FALLBACK]
+        counters['total'] = total
+        counters['share'] = {
+            tier: counters[tier] / total if total else 0.0
+            for tier in (TIER_LOCAL, TIER_GEMINI, TIER_LOCAL_FALLBACK)
+        }
+        return counters
+
+
+_router = None
+
+
+def get_router():
+    """Process-wide router configured from Config."""
+    global _router
+    if _router is None:
+        _router = AnalysisRouter.from_config()
+    return _router
+
+
+def route_text(text, latency_budget=None):
+    """Analyze text through the process-wide router."""
+    return get_router().analyze(text, latency_budget=latency_budget)
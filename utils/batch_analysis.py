@@ -0,0 +1,93 @@
+import os
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+logger = logging.getLogger(__name__)
+
+# Batches smaller than this many chunks are scored in-process; spinning up a
+# pool and re-importing NLTK in each worker costs more than it saves.
+MIN_PARALLEL_CHUNKS = 2
+
+# Analyzer and chunk hook bound once per worker process by _init_worker
+_worker_analyzer = None
+_worker_prepare = None
+
+
+def _init_worker(analyzer, prepare=None):
+    global _worker_analyzer, _worker_prepare
+    _worker_analyzer = analyzer
+    _worker_prepare = prepare
+
+
+def _analyze_chunk(analyzer, prepare, chunk):
+    if prepare is not None:
+        prepare(chunk)
+    return [analyzer(text) for text in chunk]
+
+
+def _run_chunk(chunk):
+    return _analyze_chunk(_worker_analyzer, _worker_prepare, chunk)
+
+
+def _chunks(iterator, chunk_size):
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_in_batches(analyzer, texts, workers=None, chunk_size=64, prepare=None):
+    """
+    Apply a module-level analyzer function to many texts, fanning out over processes.
+
+    Results are yielded lazily and in input order. Each worker process imports
+    the analyzer's module once, so tokenizer and VADER state is built once per
+    worker rather than once per text. Batches that fit in fewer than
+    MIN_PARALLEL_CHUNKS chunks, or ``workers=1``, run in the calling process.
+
+    Args:
+        analyzer (callable): Picklable, module-level function taking one text
+        texts (iterable): Texts to analyze; consumed incrementally
+        workers (int): Number of worker processes (defaults to os.cpu_count())
+        chunk_size (int): Number of texts sent to a worker per task
+        prepare (callable): Optional picklable, module-level function called
+            with each chunk (a list of texts) before the analyzer runs on it,
+            e.g. to score the whole chunk in one vectorized call
+
+    Yields:
+        dict: One analysis result per input text
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+
+    chunks = _chunks(iter(texts), chunk_size)
+    head = list(islice(chunks, MIN_PARALLEL_CHUNKS))
+
+    if workers == 1 or len(head) < MIN_PARALLEL_CHUNKS:
+        for chunk in head:
+            yield from _analyze_chunk(analyzer, prepare, chunk)
+        for chunk in chunks:
+            yield from _analyze_chunk(analyzer, prepare, chunk)
+        return
+
+    logger.debug(f"Analyzing texts with {workers} workers, chunk size {chunk_size}")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(analyzer, prepare)) as executor:
+        # Keep a bounded window of chunks in flight so huge inputs stream
+        # through without being materialized up front.
+        pending = deque()
+        max_in_flight = workers * 2
+        for chunk in head:
+            pending.append(executor.submit(_run_chunk, chunk))
+
+        for chunk in chunks:
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(_run_chunk, chunk))
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,296 @@
+"""
+Cohort-wide wellness reports.
+
+Reports are built in batches of users, so a faculty's worth of students
+costs the same handful of statements per batch that one report does
+(``AnalyticsProcessor.generate_wellness_report`` and the per-section
+methods are a batch of one, loading only the tables their sections read):
+
+1. load - six grouped statements per batch (daily mood rollup, mood entry
+   timestamps and scores, strategies with their category, group
+   membership counts, voice interaction counts, engagement counts), columns
+   and aggregates only
+2. compute - every section for every user of the batch with NumPy
+   bincount aggregation keyed by a per-row user index
+3. write - ``write(user_id, report)`` for each report as its batch finishes
+
+With ``workers > 0`` the compute step runs in a process pool while the
+next batch loads. Reports are identical to ``generate_wellness_report``.
+
+    python -m utils.cohort_reports --output reports.jsonl [--workers 4] [--user ID ...]
+"""
+import sys
+import json
+import logging
+import argparse
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sqlalchemy import String, cast, select
+
+from utils import mood_trends
+
+logger = logging.getLogger(__name__)
+
+# Report sections, as named under the report's 'detailed_analysis'
+SECTIONS = ('mood_trends', 'resilience_insights', 'social_engagement', 'engagement_metrics')
+
+
+def _user_index(sorted_ids, user_ids):
+    return np.searchsorted(sorted_ids, np.asarray(user_ids, dtype=np.int64))
+
+
+def _columns(rows, count):
+    return list(zip(*rows)) if rows else [()] * count
+
+
+class CohortReportEngine:
+    """Batched, vectorized wellness reports; see the module docstring."""
+
+    def __init__(self, processor, days=30, workers=0, batch_size=500):
+        self.processor = processor
+        self.days = days
+        self.workers = workers
+        self.batch_size = batch_size
+
+    def run(self, user_ids, write):
+        """Compute a report for every user id and pass each to write(user_id, report)."""
+        user_ids = list(dict.fromkeys(user_ids))
+        batches = [user_ids[i:i + self.batch_size] for i in range(0, len(user_ids), self.batch_size)]
+        written = 0
+
+        if not self.workers:
+            for batch in batches:
+                for user_id, report in compute_reports(self.load(batch), self.processor):
+                    write(user_id, report)
+                    written += 1
+            return written
+
+        # Load batch k+1 on this thread (it owns the session) while the pool
+        # computes batch k; keep at most two batches per worker in flight
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = []
+            for batch in batches:
+                pending.append(pool.submit(compute_reports, self.load(batch)))
+                while len(pending) >= 2 * self.workers:
+                    written += self._drain(pending.pop(0), write)
+            for future in pending:
+                written += self._drain(future, write)
+        return written
+
+    @staticmethod
+    def _drain(future, write):
+        reports = future.result()
+        for user_id, report in reports:
+            write(user_id, report)
+        return len(reports)
+
+    def load(self, user_ids, sections=SECTIONS):
+        """
+        Snapshot everything a batch's reports (or only some sections) need, as plain picklable data.
+
+        One statement per table (strategies are joined to their category),
+        however many users the batch holds; tables only the other sections
+        read are skipped.
+
+        Returns:
+            dict: Column arrays and per-user lists, see compute_sections
+        """
+        user_ids = sorted(user_ids)
+        data = {'user_ids': user_ids, 'sections': tuple(sections)}
+        if 'mood_trends' in sections:
+            data.update(self._load_mood(user_ids))
+        if 'resilience_insights' in sections:
+            data['strategies'] = self._load_strategies(user_ids)
+        if 'social_engagement' in sections:
+            data['social'] = self.processor.count_users_social_activity(user_ids)
+        if 'engagement_metrics' in sections:
+            data['engagement'] = self.processor.calculate_users_engagement(user_ids, self.days)
+        return data
+
+    def _load_mood(self, user_ids):
+        from models import DailyMoodRollup, MoodEntry
+
+        connection = self.processor.db.session.connection()
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=self.days)
+
+        rollup = connection.execute(
+            select(DailyMoodRollup.user_id, DailyMoodRollup.day, DailyMoodRollup.entry_count,
+                   DailyMoodRollup.mood_sum, DailyMoodRollup.mood_sum_sq, DailyMoodRollup.homesickness_sum)
+            .where(DailyMoodRollup.user_id.in_(user_ids),
+                   DailyMoodRollup.day.between(start_date.date(), end_date.date()))
+        ).all()
+        entries = connection.execute(
+            select(MoodEntry.user_id, cast(MoodEntry.created_at, String),
+                   MoodEntry.mood_score, MoodEntry.homesickness_level)
+            .where(MoodEntry.user_id.in_(user_ids), MoodEntry.created_at.between(start_date, end_date))
+        ).all()
+
+        rollup_users, days, counts, mood_sums, mood_sums_sq, homesickness_sums = _columns(rollup, 6)
+        entry_users, timestamps, mood_scores, homesickness_levels = _columns(entries, 4)
+        return {
+            'rollup': {
+                'users': np.asarray(rollup_users, dtype=np.int64),
+                'day_offsets': np.asarray([(day - start_date.date()).days for day in days], dtype=float),
+                'counts': np.asarray(counts, dtype=float),
+                'mood_sums': np.asarray(mood_sums, dtype=float),
+                'mood_sums_sq': np.asarray(mood_sums_sq, dtype=float),
+                'homesickness_sums': np.asarray(homesickness_sums, dtype=float),
+            },
+            'entries': {
+                'users': np.asarray(entry_users, dtype=np.int64),
+                'timestamps': list(timestamps),
+                'mood_scores': np.asarray(mood_scores, dtype=float),
+                'homesickness_levels': np.asarray(homesickness_levels, dtype=float),
+            },
+        }
+
+    def _load_strategies(self, user_ids):
+        from models import ResilienceStrategy, UserStrategies
+
+        strategies = self.processor.db.session.connection().execute(
+            select(UserStrategies.user_id, UserStrategies.effectiveness_score, ResilienceStrategy.category)
+            .join(ResilienceStrategy, UserStrategies.strategy_id == ResilienceStrategy.id)
+            .where(UserStrategies.user_id.in_(user_ids))
+            .order_by(UserStrategies.user_id, UserStrategies.id)
+        ).all()
+        per_user = {user_id: [] for user_id in user_ids}
+        for user_id, effectiveness_score, category in strategies:
+            per_user[user_id].append((effectiveness_score, category))
+        return per_user
+
+
+# Stand-in for the UserStrategies field the section builders read
+_Strategy = namedtuple('_Strategy', ['effectiveness_score'])
+
+
+def _default_processor(processor):
+    if processor is None:
+        from analytics_processor import AnalyticsProcessor
+        processor = AnalyticsProcessor(None)
+    return processor
+
+
+def _mood_sections(data, processor):
+    user_ids = np.asarray(data['user_ids'], dtype=np.int64)
+    n_users = len(user_ids)
+
+    rollup = data['rollup']
+    owners = _user_index(user_ids, rollup['users'])
+    entry_counts = np.bincount(owners, weights=rollup['counts'], minlength=n_users)
+    mood_sums = np.bincount(owners, weights=rollup['mood_sums'], minlength=n_users)
+    mood_sums_sq = np.bincount(owners, weights=rollup['mood_sums_sq'], minlength=n_users)
+    homesickness_sums = np.bincount(owners, weights=rollup['homesickness_sums'], minlength=n_users)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        daily_homesickness = rollup['homesickness_sums'] / rollup['counts']
+    slopes, trend_points = mood_trends.trend_slopes(owners, n_users, daily_homesickness, rollup['day_offsets'])
+
+    entries = data['entries']
+    patterns = mood_trends.cohort_patterns(
+        _user_index(user_ids, entries['users']), n_users,
+        entries['timestamps'], entries['mood_scores'], entries['homesickness_levels']
+    )
+
+    sections = []
+    for i in range(n_users):
+        if not entry_counts[i]:
+            sections.append({'error': 'No mood entries found for the period'})
+            continue
+        trend = 'insufficient_data' if trend_points[i] < 2 else processor._trend_label(slopes[i])
+        sections.append(processor._build_mood_trends(
+            entry_counts[i], mood_sums[i], mood_sums_sq[i], homesickness_sums[i],
+            trend, processor._build_mood_patterns(patterns[i])
+        ))
+    return sections
+
+
+def compute_sections(data, processor=None):
+    """
+    Compute the loaded sections (see ``load``) of every user in a batch.
+
+    Runs in pool workers, so it only touches ``data`` and the processor's
+    pure section builders (a db-less AnalyticsProcessor by default).
+
+    Returns:
+        list: (user_id, {section name: section}) in user id order
+    """
+    processor = _default_processor(processor)
+    loaded = data['sections']
+    mood = _mood_sections(data, processor) if 'mood_trends' in loaded else None
+
+    results = []
+    for i, user_id in enumerate(data['user_ids']):
+        sections = {}
+        if mood is not None:
+            sections['mood_trends'] = mood[i]
+        if 'resilience_insights' in loaded:
+            strategies = data['strategies'][user_id]
+            sections['resilience_insights'] = processor._build_resilience_insights(
+                [_Strategy(score) for score, _ in strategies], [category for _, category in strategies]
+            )
+        if 'social_engagement' in loaded:
+            sections['social_engagement'] = processor._build_social_engagement(**data['social'][user_id])
+        if 'engagement_metrics' in loaded:
+            sections['engagement_metrics'] = data['engagement'][user_id]
+        results.append((user_id, sections))
+    return results
+
+
+def compute_reports(data, processor=None):
+    """
+    Build the wellness report of every user in a batch loaded with every section.
+
+    Returns:
+        list: (user_id, report) in user id order
+    """
+    processor = _default_processor(processor)
+    return [
+        (user_id, processor._build_wellness_report(*(sections[name] for name in SECTIONS)))
+        for user_id, sections in compute_sections(data, processor)
+    ]
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', required=True, help="JSON lines file, one report per user")
+    parser.add_argument('--user', type=int, action='append', default=[], metavar='ID',
+                        help="Report on this user (repeatable; default: every active user)")
+    parser.add_argument('--days', type=int, default=30, help="Mood and engagement window")
+    parser.add_argument('--workers', type=int, default=0, help="Processes for the compute step")
+    parser.add_argument('--batch-size', type=int, default=500, help="Users per batch")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from models import db, User
+    from analytics_processor import AnalyticsProcessor
+
+    app = create_app()
+    with app.app_context(), open(args.output, 'w') as output:
+        user_ids = args.user or [
+            row[0] for row in db.session.execute(select(User.id).where(User.is_active.is_(True)))
+        ]
+
+        def write(user_id, report):
+            output.write(json.dumps({'user_id': user_id, 'report': report}, default=_json_default) + '\n')
+
+        written = AnalyticsProcessor(db).generate_cohort_reports(
+            user_ids, write, days=args.days, workers=args.workers, batch_size=args.batch_size
+        )
+    print(f"Wrote {written} reports to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -1,27 +1,151 @@
 
 import os
+import json
+import threading
 import google.generativeai as genai
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from config import Config
+from utils.analysis_cache import get_cache
+from utils.prompt_cache import get_prompt_cache, prompt_key
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MODEL_NAME = "gemini-1.0-pro"
+
+# Part of the cache key for Gemini analyses; bump when the prompt or model changes
+ANALYSIS_PROMPT_VERSION = 'gemini-1.0-pro:1'
+
+# Generation settings per prompt kind; each kind gets one long-lived model
+GENERATION_CONFIGS = {
+    'analysis': {
+        "temperature": 0.2,
+        "top_p": 0.8,
+        "top_k": 40,
+        "max_output_tokens": 1024,
+    },
+    'strategies': {
+        "temperature": 0.7,  # More creative for strategies
+        "top_p": 0.9,
+        "top_k": 40,
+        "max_output_tokens": 1024,
+    },
+}
+
+# Used when Gemini is unavailable, too slow, or returns unparseable strategies
+FALLBACK_STRATEGIES = [
+    {
+        "title": "Connect with UBC International Community",
+        "description": "Building social connections can significantly reduce homesickness.",
+        "steps": ["Join the International Student Association", "Attend cultural events on campus", "Create a study group with diverse students"]
+    },
+    {
+        "title": "Gratitude Journaling Practice",
+        "description": "Research shows gratitude increases prefrontal activity by 29%, creating emotional resilience.",
+        "steps": ["Write 3 things you appreciate daily", "Include both home memories and new experiences", "Review weekly to track your adjustment progress"]
+    },
+    {
+        "title": "Vancouver Cultural Immersion",
+        "description": "Creating positive experiences in your new environment builds new neural pathways.",
+        "steps": ["Visit a new Vancouver neighborhood weekly", "Try a local cuisine you've never experienced", "Document your discoveries in photos or writing"]
+    }
+]
+
+def valid_strategies(strategies):
+    """True if strategies is a non-empty list of dicts with a string title and description and a list of steps."""
+    return isinstance(strategies, list) and bool(strategies) and all(
+        isinstance(strategy, dict)
+        and isinstance(strategy.get('title'), str)
+        and isinstance(strategy.get('description'), str)
+        and isinstance(strategy.get('steps'), list)
+        for strategy in strategies
+    )
+
+_lock = threading.Lock()
+_configured_key = None
+_models = {}
+_executor = None
+
 def initialize_gemini():
-    """Initialize the Gemini API with the API key from environment variables."""
+    """
+    Configure the Gemini API with the API key from environment variables.
+    
+    The client is configured once per process; later calls are a cheap check
+    and only reconfigure if the key in the environment changes.
+    """
+    global _configured_key
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         logger.warning("GEMINI_API_KEY not found in environment variables")
         return False
+    if api_key == _configured_key:
+        return True
     
+    with _lock:
+        if api_key == _configured_key:
+            return True
+        try:
+            genai.configure(api_key=api_key)
+            _models.clear()
+            _configured_key = api_key
+            logger.info("Gemini API initialized successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Error initializing Gemini API: {str(e)}")
+            return False
+
+def get_model(kind):
+    """Return the shared GenerativeModel for a prompt kind ('analysis' or 'strategies')."""
+    model = _models.get(kind)
+    if model is None:
+        with _lock:
+            model = _models.get(kind)
+            if model is None:
+                model = genai.GenerativeModel(
+                    model_name=MODEL_NAME,
+                    generation_config=GENERATION_CONFIGS[kind]
+                )
+                _models[kind] = model
+    return model
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=Config.GEMINI_MAX_CONCURRENCY,
+                    thread_name_prefix='gemini'
+                )
+    return _executor
+
+def _is_json(text):
     try:
-        genai.configure(api_key=api_key)
-        logger.info("Gemini API initialized successfully")
+        json.loads(text)
         return True
-    except Exception as e:
-        logger.error(f"Error initializing Gemini API: {str(e)}")
+    except ValueError:
         return False
 
+def _generate(kind, prompt):
+    """
+    Response text for a prompt.
+    
+    Served from the persistent prompt cache when possible; identical prompts
+    in flight at the same time share a single Gemini call. Only responses
+    that parse as JSON are cached.
+    """
+    def call():
+        response = get_model(kind).generate_content(
+            prompt,
+            request_options={'timeout': Config.GEMINI_REQUEST_TIMEOUT}
+        )
+        return response.text
+    
+    key = prompt_key(MODEL_NAME, GENERATION_CONFIGS[kind], prompt)
+    return get_prompt_cache().get_or_call(key, call, validate=_is_json)
+
 def generate_analysis(text):
     """
     Generate enhanced sentiment analysis and homesickness assessment using Gemini.
@@ -32,6 +156,11 @@ def generate_analysis(text):
     Returns:
         dict: Analysis results including sentiment score, homesickness level, and insights
     """
+    cache = get_cache('gemini_analysis', ANALYSIS_PROMPT_VERSION)
+    return cache.get_or_compute(text, _request_analysis)
+
+def _request_analysis(text):
+    """Call Gemini for an analysis of text; None when the API is unavailable or fails."""
     if not initialize_gemini():
         logger.warning("Using fallback analysis due to Gemini API initialization failure")
         return None
@@ -52,32 +181,18 @@ def generate_analysis(text):
         Student text: "{text}"
         """
         
-        # Configure the model
-        generation_config = {
-            "temperature": 0.2,
-            "top_p": 0.8,
-            "top_k": 40,
-            "max_output_tokens": 1024,
-        }
-        
-        model = genai.GenerativeModel(
-            model_name="gemini-1.0-pro",
-            generation_config=generation_config
-        )
-        
-        response = model.generate_content(prompt)
+        response_text = _generate('analysis', prompt)
         
         # Process the response into a structured format
         try:
-            import json
-            analysis_data = json.loads(response.text)
+            analysis_data = json.loads(response_text)
             return analysis_data
         except json.JSONDecodeError:
             # Fallback if response isn't proper JSON
             logger.warning("Could not parse Gemini response as JSON")
             
             # Attempt to extract key values from text
-            lines = response.text.strip().split('\n')
+            lines = response_text.strip().split('\n')
             analysis_data = {}
             
             for line in lines:
@@ -114,7 +229,19 @@ def generate_resilience_strategies(text, homesickness_level):
         return None
     
     try:
-        prompt = f"""
+        strategies = _request_strategies(text, homesickness_level)
+        if strategies is None:
+            # Return a simplified fallback
+            return list(FALLBACK_STRATEGIES)
+        return strategies
+    
+    except Exception as e:
+        logger.error(f"Error generating strategies with Gemini: {str(e)}")
+        return None
+
+def _request_strategies(text, homesickness_level):
+    """Call Gemini for strategies; None if the response is not valid JSON, raises on API errors."""
+    prompt = f"""
         An international student at UBC has shared the following thoughts about their experience:
         
         "{text}"
@@ -136,48 +263,148 @@ def generate_resilience_strategies(text, homesickness_level):
         - Both immediate coping mechanisms and long-term resilience building
         - UBC-specific resources and Vancouver opportunities
         """
+    
+    response_text = _generate('strategies', prompt)
+    
+    # Process the response into a structured format
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        logger.warning("Could not parse Gemini response as JSON")
+        return None
+
+def _request_theme_strategies(homesickness_level, themes):
+    """
+    Call Gemini for strategies keyed only on homesickness level and themes.
+    
+    The prompt contains no student text, so it is identical for every student
+    with the same level and theme set and is answered from the prompt cache
+    after the first request.
+    """
+    theme_list = ', '.join(sorted(set(themes))) or 'General Wellbeing'
+    prompt = f"""
+        An international student at UBC is experiencing homesickness assessed as {homesickness_level} out of 10.
+        The main themes in what they shared are: {theme_list}.
         
-        # Configure the model
-        generation_config = {
-            "temperature": 0.7,  # More creative for strategies
-            "top_p": 0.9,
-            "top_k": 40,
-            "max_output_tokens": 1024,
-        }
-        
-        model = genai.GenerativeModel(
-            model_name="gemini-1.0-pro",
-            generation_config=generation_config
-        )
+        Generate 3 resilience strategies to help them cope with homesickness and cultural adjustment.
+        Each strategy should include:
+        1. A title (concise and action-oriented)
+        2. A brief description explaining the rationale and benefit
+        3. 3-5 specific, actionable steps they can take to implement the strategy
         
-        response = model.generate_content(prompt)
+        Format your response as a JSON array containing strategy objects with "title", "description", and "steps" keys.
+        The "steps" should be an array of strings.
         
-        # Process the response into a structured format
-        try:
-            import json
-            strategies = json.loads(response.text)
-            return strategies
-        except json.JSONDecodeError:
-            logger.warning("Could not parse Gemini response as JSON")
-            # Return a simplified fallback
-            return [
-                {
-                    "title": "Connect with UBC International Community",
-                    "description": "Building social connections can significantly reduce homesickness.",
-                    "steps": ["Join the International Student Association", "Attend cultural events on campus", "Create a study group with diverse students"]
-                },
-                {
-                    "title": "Gratitude Journaling Practice",
-                    "description": "Research shows gratitude increases prefrontal activity by 29%, creating emotional resilience.",
-                    "steps": ["Write 3 things you appreciate daily", "Include both home memories and new experiences", "Review weekly to track your adjustment progress"]
-                },
-                {
-                    "title": "Vancouver Cultural Immersion",
-                    "description": "Creating positive experiences in your new environment builds new neural pathways.",
-                    "steps": ["Visit a new Vancouver neighborhood weekly", "Try a local cuisine you've never experienced", "Document your discoveries in photos or writing"]
-                }
-            ]
-            
+        Consider:
+        - Neuroplasticity research showing gratitude practices increase dorsolateral prefrontal activity
+        - Cultural context and social connection opportunities
+        - Both immediate coping mechanisms and long-term resilience building
+        - UBC-specific resources and Vancouver opportunities
+        """
+    
+    response_text = _generate('strategies', prompt)
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        logger.warning("Could not parse Gemini response as JSON")
+        return None
+
+def generate_theme_strategies(homesickness_level, themes):
+    """
+    Generate resilience strategies for a homesickness level and set of themes.
+    
+    Args:
+        homesickness_level (int): Homesickness level (1-10)
+        themes (iterable): Themes identified in the student's text
+        
+    Returns:
+        list: Strategy dictionaries, FALLBACK_STRATEGIES if Gemini's response
+        cannot be parsed, or None if Gemini is unavailable
+    """
+    if not initialize_gemini():
+        logger.warning("Using fallback strategies due to Gemini API initialization failure")
+        return None
+    
+    try:
+        return _request_theme_strategies(homesickness_level, themes) or list(FALLBACK_STRATEGIES)
     except Exception as e:
         logger.error(f"Error generating strategies with Gemini: {str(e)}")
         return None
+
+def iter_insights(text, homesickness_level, deadline=None, themes=None, include_strategies=True):
+    """
+    Yield Gemini insight parts as soon as each one finishes.
+    
+    Runs the analysis and (optionally) strategy prompts concurrently and
+    yields ``(part, value)`` pairs in completion order, where part is
+    'analysis' or 'strategies'. Parts that fail, return nothing, or miss the
+    shared deadline are simply not yielded; they keep running in the
+    background, and a late analysis still lands in the analysis cache.
+    
+    Args:
+        text (str): User's input text
+        homesickness_level (int): Homesickness level (1-10) used in the strategy prompt
+        deadline (float): Seconds to wait for all parts (defaults to GEMINI_DEADLINE)
+        themes (iterable): If given, use the shareable level/theme strategy
+            prompt instead of one that embeds the student's text
+        include_strategies (bool): Skip the strategy prompt when False
+    """
+    if not initialize_gemini():
+        logger.warning("Using fallback insights due to Gemini API initialization failure")
+        return
+    
+    executor = _get_executor()
+    futures = {executor.submit(generate_analysis, text): 'analysis'}
+    if include_strategies and themes is not None:
+        futures[executor.submit(_request_theme_strategies, homesickness_level, themes)] = 'strategies'
+    elif include_strategies:
+        futures[executor.submit(_request_strategies, text, homesickness_level)] = 'strategies'
+    
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline if deadline is not None else Config.GEMINI_DEADLINE):
+            pending.discard(future)
+            part = futures[future]
+            try:
+                value = future.result()
+            except Exception as e:
+                logger.error(f"Error generating {part} with Gemini: {str(e)}")
+                continue
+            if value:
+                yield part, value
+    except FuturesTimeoutError:
+        for future in pending:
+            logger.warning(f"Gemini {futures[future]} missed the deadline; using fallback")
+
+def generate_insights(text, homesickness_level, deadline=None, fallback_analysis=None, themes=None,
+                      include_strategies=True):
+    """
+    Run the analysis and strategy prompts concurrently under one shared deadline.
+    
+    Parts that fail or do not finish in time are replaced by their fallback
+    (``fallback_analysis`` and FALLBACK_STRATEGIES); see iter_insights.
+    
+    Args:
+        text (str): User's input text
+        homesickness_level (int): Homesickness level (1-10) used in the strategy prompt
+        deadline (float): Seconds to wait for both parts (defaults to GEMINI_DEADLINE)
+        fallback_analysis (dict): Analysis to return if Gemini's does not arrive
+        themes (iterable): If given, use the shareable level/theme strategy
+            prompt instead of one that embeds the student's text
+        include_strategies (bool): Skip the strategy prompt when False
+    
+    Returns:
+        dict: 'analysis', 'strategies', and 'sources' mapping each part to
+        'gemini' or 'fallback'
+    """
+    result = {
+        'analysis': fallback_analysis,
+        'strategies': list(FALLBACK_STRATEGIES) if include_strategies else None,
+        'sources': {'analysis': 'fallback', 'strategies': 'fallback' if include_strategies else None}
+    }
+    for part, value in iter_insights(text, homesickness_level, deadline=deadline, themes=themes,
+                                     include_strategies=include_strategies):
+        result[part] = value
+        result['sources'][part] = 'gemini'
+    
+    return result
@@ -0,0 +1,95 @@
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at max_pending."""
+
+
+class JobQueue:
+    """
+    Bounded in-process job runner with status polling.
+
+    Jobs run on a thread pool of ``max_workers``. At most ``max_pending``
+    jobs may be queued or running at once; further submissions raise
+    QueueFull. Finished jobs are kept for ``ttl`` seconds so clients can
+    poll for the result, then dropped.
+    """
+
+    def __init__(self, max_workers=4, max_pending=32, ttl=600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._pending = 0
+
+    def submit(self, fn, *args, owner=None, **kwargs):
+        """Queue fn(*args, **kwargs) and return the new job's id."""
+        with self._lock:
+            self._purge_expired()
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} jobs already pending")
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id,
+                'owner': owner,
+                'status': JOB_QUEUED,
+                'result': None,
+                'error': None,
+                'created_at': time.time(),
+                'finished_at': None,
+            }
+            self._pending += 1
+
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        job = self._jobs[job_id]
+        job['status'] = JOB_RUNNING
+        try:
+            job['result'] = fn(*args, **kwargs)
+            job['status'] = JOB_DONE
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            job['error'] = str(e)
+            job['status'] = JOB_FAILED
+        finally:
+            job['finished_at'] = time.time()
+            with self._lock:
+                self._pending -= 1
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and job['finished_at'] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id, owner=None):
+        """Return a copy of the job's state, or None if unknown, expired or owned by someone else."""
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+            if job is None or (owner is not None and job['owner'] != owner):
+                return None
+            return dict(job)
+
+    def stats(self):
+        with self._lock:
+            return {'pending': self._pending, 'tracked': len(self._jobs),
+                    'max_workers': self.max_workers, 'max_pending': self.max_pending}
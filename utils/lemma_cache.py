@@ -0,0 +1,101 @@
+"""
+Bounded lemma memoization for the text pipeline.
+
+Journal and voice texts draw on a small, heavily repeated vocabulary, so
+most WordNet lookups return a lemma that has already been computed. The
+cache answers those from memory in two tiers:
+
+* preloaded - lemmas for the top-N vocabulary, packed into the lexicon
+  artifact at build time; never evicted.
+* LRU - everything else, bounded to ``max_entries``.
+
+Keys and lemmas are interned, so every cached document refers to one shared
+string object per word instead of a fresh copy per occurrence.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+
+class LemmaCache:
+    """Memoize a token -> lemma function, with hit/miss/eviction stats."""
+
+    def __init__(self, lemmatize, max_entries=50000, preloaded=None):
+        self._lemmatize = lemmatize
+        self.max_entries = max_entries
+        self._preloaded = {
+            sys.intern(token): sys.intern(lemma) for token, lemma in (preloaded or {}).items()
+        }
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.preloaded_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lemmatize(self, token):
+        return self.lemmatize_many([token])[0]
+
+    def lemmatize_many(self, tokens):
+        """
+        Lemmatize a token list, computing only tokens not seen before.
+
+        The lock is taken once for the lookups and once for the inserts, not
+        per token; the lemmatizer itself runs outside the lock.
+        """
+        preloaded = self._preloaded
+        entries = self._entries
+        lemmas = []
+        missing = {}
+
+        with self._lock:
+            for i, token in enumerate(tokens):
+                lemma = preloaded.get(token)
+                if lemma is not None:
+                    self.preloaded_hits += 1
+                else:
+                    lemma = entries.get(token)
+                    if lemma is not None:
+                        entries.move_to_end(token)
+                        self.hits += 1
+                    else:
+                        missing.setdefault(token, []).append(i)
+                lemmas.append(lemma)
+
+        if not missing:
+            return lemmas
+
+        computed = {sys.intern(token): sys.intern(self._lemmatize(token)) for token in missing}
+        for token, lemma in computed.items():
+            for i in missing[token]:
+                lemmas[i] = lemma
+
+        with self._lock:
+            self.misses += len(computed)
+            self.hits += sum(len(positions) - 1 for positions in missing.values())
+            entries.update(computed)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self.evictions += 1
+        return lemmas
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._preloaded) + len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.preloaded_hits + self.hits + self.misses
+            return {
+                'preloaded_hits': self.preloaded_hits,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.preloaded_hits + self.hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'preloaded': len(self._preloaded),
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+            }
@@ -0,0 +1,355 @@
+"""
+Prebuilt lexicon artifact for the text analyzers.
+
+The build step packs the VADER lexicon, the English stopword list, the
+keyword tables and, optionally, WordNet lemmas for the most frequent
+vocabulary into a single versioned binary file. At runtime the file is
+read on first use, so importing the analyzers never touches NLTK data or
+the network.
+
+Build it once per deploy:
+    python -m utils.lexicon_artifact build --download
+
+Add ``--lemmas N`` (and optionally ``--lemma-corpus FILE``) to precompute
+lemmas for the N most frequent words, so steady-state preprocessing does no
+WordNet lookups.
+"""
+import os
+import sys
+import mmap
+import struct
+import hashlib
+import logging
+import argparse
+import threading
+from array import array
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MAGIC = b'HBLEX\x00\x00\x00'
+DEFAULT_ARTIFACT_PATH = os.environ.get(
+    'HOMEBRIDGE_LEXICON_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'data', 'lexicon.bin')
+)
+
+# magic, format version, section count, sha256 of all section payloads
+_HEADER = struct.Struct('<8sII32s')
+# section name, payload offset, payload length
+_SECTION = struct.Struct('<32sQQ')
+
+VADER_WORDS = 'vader.words'
+VADER_VALENCES = 'vader.valences'
+STOPWORDS = 'stopwords.english'
+KEYWORD_PREFIX = 'keywords.'
+LEMMA_TOKENS = 'lemmas.tokens'
+LEMMA_FORMS = 'lemmas.forms'
+
+
+class LexiconArtifactError(Exception):
+    """Raised when an artifact is missing, truncated or of an unknown version."""
+
+
+def _pack_words(words):
+    return '\x00'.join(words).encode('utf-8')
+
+
+def _unpack_words(payload):
+    if not payload:
+        return []
+    return bytes(payload).decode('utf-8').split('\x00')
+
+
+def write_artifact(path, vader_lexicon, stop_words, keyword_tables, lemmas=None):
+    """
+    Write a lexicon artifact.
+
+    Args:
+        path (str): Destination file
+        vader_lexicon (dict): VADER word -> valence
+        stop_words (iterable): Stopwords
+        keyword_tables (dict): Table name -> list of keywords
+        lemmas (dict): Optional precomputed token -> lemma table
+
+    Returns:
+        str: Hex digest identifying the artifact contents
+    """
+    words = sorted(vader_lexicon)
+    sections = [
+        (VADER_WORDS, _pack_words(words)),
+        (VADER_VALENCES, array('d', (vader_lexicon[w] for w in words)).tobytes()),
+        (STOPWORDS, _pack_words(sorted(stop_words))),
+    ]
+    for name in sorted(keyword_tables):
+        sections.append((KEYWORD_PREFIX + name, _pack_words(keyword_tables[name])))
+    if lemmas:
+        tokens = sorted(lemmas)
+        sections.append((LEMMA_TOKENS, _pack_words(tokens)))
+        sections.append((LEMMA_FORMS, _pack_words(lemmas[t] for t in tokens)))
+
+    digest = hashlib.sha256()
+    for name, payload in sections:
+        digest.update(name.encode('utf-8'))
+        digest.update(payload)
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for name, payload in sections:
+        table.append(_SECTION.pack(name.encode('utf-8'), offset, len(payload)))
+        offset += len(payload)
+
+    tmp_path = f"{path}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), digest.digest()))
+        f.writelines(table)
+        for _, payload in sections:
+            f.write(payload)
+    os.replace(tmp_path, path)
+    return digest.hexdigest()
+
+
+class LexiconArtifact:
+    """Read-only, memory-mapped view of a lexicon artifact."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            raise LexiconArtifactError(f"Truncated lexicon artifact: {path}")
+        magic, version, count, digest = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise LexiconArtifactError(f"Not a lexicon artifact: {path}")
+        if version != FORMAT_VERSION:
+            raise LexiconArtifactError(
+                f"Lexicon artifact {path} has format version {version}, expected {FORMAT_VERSION}"
+            )
+        self.version = version
+        self.digest = digest.hex()
+
+        self._sections = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(self._mmap, _HEADER.size + i * _SECTION.size)
+            if offset + length > len(self._mmap):
+                raise LexiconArtifactError(f"Truncated lexicon artifact: {path}")
+            self._sections[name.rstrip(b'\x00').decode('utf-8')] = (offset, length)
+
+    def _payload(self, name):
+        try:
+            offset, length = self._sections[name]
+        except KeyError:
+            raise LexiconArtifactError(f"Section {name!r} missing from {self.path}") from None
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def section_names(self):
+        return list(self._sections)
+
+    def words(self, name):
+        return _unpack_words(self._payload(name))
+
+    def vader_lexicon(self):
+        valences = array('d')
+        valences.frombytes(self._payload(VADER_VALENCES))
+        return dict(zip(self.words(VADER_WORDS), valences))
+
+    def stop_words(self):
+        return frozenset(self.words(STOPWORDS))
+
+    def keyword_tables(self):
+        return {
+            name[len(KEYWORD_PREFIX):]: self.words(name)
+            for name in self._sections if name.startswith(KEYWORD_PREFIX)
+        }
+
+    def lemmas(self):
+        """Precomputed token -> lemma table; empty if the artifact was built without one."""
+        if LEMMA_TOKENS not in self._sections:
+            return {}
+        return dict(zip(self.words(LEMMA_TOKENS), self.words(LEMMA_FORMS)))
+
+
+_lock = threading.Lock()
+_artifact = None
+_artifact_loaded = False
+_vader_lexicon = None
+_stop_words = None
+
+
+def get_artifact():
+    """Return the process-wide artifact, mapping it on first use (None if absent)."""
+    global _artifact, _artifact_loaded
+    if _artifact_loaded:
+        return _artifact
+    with _lock:
+        if not _artifact_loaded:
+            if os.path.exists(DEFAULT_ARTIFACT_PATH):
+                _artifact = LexiconArtifact(DEFAULT_ARTIFACT_PATH)
+                logger.info(f"Loaded lexicon artifact {DEFAULT_ARTIFACT_PATH} ({_artifact.digest[:12]})")
+            else:
+                logger.warning(
+                    f"Lexicon artifact {DEFAULT_ARTIFACT_PATH} not found; falling back to local NLTK data. "
+                    "Run `python -m utils.lexicon_artifact build` to create it."
+                )
+            _artifact_loaded = True
+    return _artifact
+
+
+def _nltk_vader_lexicon():
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer().lexicon
+
+
+def _nltk_stop_words():
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+def vader_lexicon():
+    """VADER word -> valence mapping, from the artifact or installed NLTK data."""
+    global _vader_lexicon
+    if _vader_lexicon is None:
+        artifact = get_artifact()
+        _vader_lexicon = artifact.vader_lexicon() if artifact else _nltk_vader_lexicon()
+    return _vader_lexicon
+
+
+def stop_words():
+    """English stopwords, from the artifact or installed NLTK data."""
+    global _stop_words
+    if _stop_words is None:
+        artifact = get_artifact()
+        _stop_words = artifact.stop_words() if artifact else _nltk_stop_words()
+    return _stop_words
+
+
+def precomputed_lemmas():
+    """Token -> lemma table packed into the artifact (empty without one)."""
+    artifact = get_artifact()
+    return artifact.lemmas() if artifact else {}
+
+
+def sentiment_analyzer():
+    """
+    Build a VADER SentimentIntensityAnalyzer over vader_lexicon(), so the
+    analyzer scores with the artifact's lexicon (or installed NLTK data if
+    the artifact has not been built).
+    """
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+    class ArtifactSentimentAnalyzer(SentimentIntensityAnalyzer):
+        """SentimentIntensityAnalyzer whose lexicon is given rather than read from NLTK data."""
+
+        def __init__(self, lexicon):
+            self._lexicon = lexicon
+            self.lexicon_file = None
+            self.lexicon = self.make_lex_dict()
+            self.constants = VaderConstants()
+
+        def make_lex_dict(self):
+            return self._lexicon
+
+    return ArtifactSentimentAnalyzer(vader_lexicon())
+
+
+def source_keyword_tables():
+    """Keyword tables as currently defined in the analyzer modules."""
+    import ml_processor
+    from utils import text_analysis
+
+    return {
+        'homesickness': list(ml_processor.HOMESICKNESS_KEYWORDS),
+        'text_analysis.homesickness': list(text_analysis.homesickness_keywords),
+        'text_analysis.positive': list(text_analysis.positive_words),
+        'text_analysis.negative': list(text_analysis.negative_words),
+    }
+
+
+def lemma_vocabulary(size, keyword_tables, stop_words, corpus_paths=(), vader_words=()):
+    """
+    The ``size`` most frequent words to precompute lemmas for.
+
+    Words are counted in the corpus files (for example exported journal
+    entries), tokenized the way the text pipeline tokenizes them. Keyword
+    table words always come first; without a corpus the rest is filled from
+    the alphabetic VADER lexicon words.
+    """
+    from collections import Counter
+    from utils.lexicon_engine import tokenize
+
+    counts = Counter()
+    for corpus_path in corpus_paths:
+        with open(corpus_path, encoding='utf-8') as f:
+            for line in f:
+                counts.update(t for t in tokenize(line.lower()) if t not in stop_words and not t.isdigit())
+
+    vocabulary = dict.fromkeys(
+        word for table in keyword_tables.values() for word in table if word not in stop_words
+    )
+    vocabulary.update(dict.fromkeys(word for word, _ in counts.most_common()))
+    if not corpus_paths:
+        vocabulary.update(dict.fromkeys(word for word in vader_words if word.isalpha()))
+    return list(vocabulary)[:size]
+
+
+def build(path=DEFAULT_ARTIFACT_PATH, download=False, lemma_count=0, lemma_corpus=()):
+    """Pack NLTK data, keyword tables and optionally top-N lemmas into an artifact at path."""
+    import nltk
+
+    resources = ['vader_lexicon', 'stopwords']
+    if lemma_count:
+        resources.append('wordnet')
+    if download:
+        for resource in resources:
+            nltk.download(resource, quiet=True)
+
+    vader = _nltk_vader_lexicon()
+    stops = _nltk_stop_words()
+    keyword_tables = source_keyword_tables()
+
+    lemmas = None
+    if lemma_count:
+        from nltk.stem import WordNetLemmatizer
+
+        lemmatizer = WordNetLemmatizer()
+        vocabulary = lemma_vocabulary(lemma_count, keyword_tables, stops, lemma_corpus, sorted(vader))
+        lemmas = {word: lemmatizer.lemmatize(word) for word in vocabulary}
+    return write_artifact(path, vader, stops, keyword_tables, lemmas=lemmas)
+
+
+def verify(path=DEFAULT_ARTIFACT_PATH):
+    """Return the names of keyword tables that differ between the artifact and the code."""
+    packed = LexiconArtifact(path).keyword_tables()
+    current = source_keyword_tables()
+    return sorted(name for name in set(packed) | set(current) if packed.get(name) != current.get(name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('command', choices=['build', 'verify'])
+    parser.add_argument('--output', default=DEFAULT_ARTIFACT_PATH, help="Artifact path")
+    parser.add_argument('--download', action='store_true',
+                        help="Fetch missing NLTK data before building")
+    parser.add_argument('--lemmas', type=int, default=0, metavar='N',
+                        help="Precompute WordNet lemmas for the N most frequent words")
+    parser.add_argument('--lemma-corpus', action='append', default=[], metavar='FILE',
+                        help="Text file to count word frequencies in (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        digest = build(args.output, download=args.download,
+                       lemma_count=args.lemmas, lemma_corpus=args.lemma_corpus)
+        print(f"Wrote {args.output} (format v{FORMAT_VERSION}, {digest[:12]})")
+        return 0
+
+    stale = verify(args.output)
+    if stale:
+        print(f"{args.output} is stale; keyword tables changed: {', '.join(stale)}")
+        return 1
+    print(f"{args.output} is up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
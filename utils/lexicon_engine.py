@@ -0,0 +1,102 @@
+import re
+from collections import namedtuple
+
+# Runs of letters/digits, optionally joined by the in-word punctuation that the
+# Treebank tokenizer keeps inside a single token ("well-known", "u.s", "can't").
+_TOKEN_RE = re.compile(r"[^\W_]+(?:[-.'][^\W_]+)*")
+
+# Clitics that word_tokenize splits off into their own (non-alphanumeric) token
+_CLITICS = frozenset(['s', 'm', 'd', 're', 've', 'll'])
+
+# Words that word_tokenize splits into two alphanumeric tokens
+_CONTRACTION_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+LexiconScan = namedtuple('LexiconScan', ['tokens', 'keyword_counts', 'keyword_total'])
+
+
+def tokenize(text):
+    """
+    Split lowercased text into the alphanumeric tokens word_tokenize would keep.
+
+    Tokens containing inner hyphens or periods are dropped, "n't" and the
+    common clitics are split off, and the remaining punctuation is ignored,
+    so the result matches ``[t for t in word_tokenize(text) if t.isalnum()]``
+    for ordinary prose without loading the punkt models.
+    """
+    tokens = []
+    append = tokens.append
+    for token in _TOKEN_RE.findall(text):
+        if token.isalnum():
+            split = _CONTRACTION_SPLITS.get(token)
+            if split:
+                tokens.extend(split)
+            else:
+                append(token)
+            continue
+
+        head, sep, tail = token.rpartition("'")
+        if not sep:
+            continue
+        if tail == 't' and head.endswith('n'):
+            head = head[:-1]
+        elif tail not in _CLITICS:
+            continue
+        if head.isalnum():
+            append(head)
+    return tokens
+
+
+class LexiconAnalyzer:
+    """
+    Compiled keyword matcher for homesickness analysis.
+
+    Keyword and stopword tables are frozen once at construction so every
+    lookup is a hash probe, and ``scan`` produces the filtered tokens, the
+    keyword hits and their total in a single pass over the text.
+    """
+
+    __slots__ = ('keywords', 'stop_words')
+
+    def __init__(self, keywords, stop_words):
+        self.keywords = frozenset(keywords)
+        self.stop_words = frozenset(stop_words)
+
+    def scan(self, text):
+        """
+        Tokenize text and match it against the keyword table.
+
+        Args:
+            text (str): Raw user input
+
+        Returns:
+            LexiconScan: Filtered tokens, per-keyword hit counts (in order of
+            first appearance) and the total number of keyword hits
+        """
+        stop_words = self.stop_words
+        tokens = [token for token in tokenize(text.lower()) if token not in stop_words]
+        keyword_counts, keyword_total = self.count_keywords(tokens)
+        return LexiconScan(tokens, keyword_counts, keyword_total)
+
+    def count_keywords(self, tokens):
+        """
+        Match already filtered tokens against the keyword table.
+
+        Returns:
+            tuple: (per-keyword hit counts in order of first appearance,
+            total number of keyword hits)
+        """
+        keywords = self.keywords
+        keyword_counts = {}
+        keyword_total = 0
+        for token in tokens:
+            if token in keywords:
+                keyword_total += 1
+                keyword_counts[token] = keyword_counts.get(token, 0) + 1
+        return keyword_counts, keyword_total
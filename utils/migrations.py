@@ -0,0 +1,170 @@
+"""
+Versioned schema migrations for existing databases.
+
+``db.create_all()`` creates missing tables but never alters existing ones,
+so schema changes to tables that already hold data (new indexes, new
+columns) are listed here as numbered migrations. Applied versions are
+recorded in ``schema_migrations``; each pending migration runs once, in
+order.
+
+Every gunicorn worker runs ``upgrade`` as it boots, so upgrades are
+serialized with a database lock: a session advisory lock on Postgres (each
+migration then commits on its own) and ``BEGIN IMMEDIATE`` on SQLite (all
+pending migrations commit together). Applied versions are read after the
+lock is taken, so a worker that waited finds the migrations already applied
+and does nothing.
+
+A step is either a SQL statement or a ``'module:function'`` reference,
+called with the migration's connection for data migrations. Steps must be
+safe to run against a database that ``create_all`` has just built with
+the current models (use IF NOT EXISTS), since fresh databases get both.
+
+    python -m utils.migrations upgrade [--database URL]
+    python -m utils.migrations status [--database URL]
+"""
+import sys
+import logging
+import importlib
+import argparse
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+from sqlalchemy import create_engine, text
+
+logger = logging.getLogger(__name__)
+
+# (version, description, statements); append only, never edit an applied entry
+MIGRATIONS = [
+    (1, 'Composite (user_id, time) indexes on per-user event tables', [
+        "CREATE INDEX IF NOT EXISTS ix_mood_entries_user_created_at ON mood_entries (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_gratitude_entries_user_created_at ON gratitude_entries (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_user_strategies_user_tried_at ON user_strategies (user_id, tried_at)",
+        "CREATE INDEX IF NOT EXISTS ix_user_resources_user_accessed_at ON user_resources (user_id, accessed_at)",
+        "CREATE INDEX IF NOT EXISTS ix_voice_interactions_user_created_at ON voice_interactions (user_id, created_at)",
+    ]),
+    (2, 'Create and backfill daily_mood_rollup', [
+        'utils.mood_rollup:backfill',
+    ]),
+    (3, 'Per-user data versions for the report cache', [
+        "CREATE TABLE IF NOT EXISTS user_data_versions ("
+        "user_id INTEGER NOT NULL PRIMARY KEY REFERENCES users (id), version INTEGER NOT NULL)",
+    ]),
+]
+
+# pg_advisory_lock key shared by every process that runs upgrade()
+MIGRATION_LOCK_ID = 0x48424D47
+
+_CREATE_VERSION_TABLE = (
+    "CREATE TABLE IF NOT EXISTS schema_migrations ("
+    "version INTEGER PRIMARY KEY, description VARCHAR(200), applied_at TIMESTAMP)"
+)
+
+
+def _run_step(conn, step):
+    if ':' in step and ' ' not in step:
+        module, function = step.split(':')
+        getattr(importlib.import_module(module), function)(conn)
+    else:
+        conn.execute(text(step))
+
+
+def _applied(conn):
+    conn.execute(text(_CREATE_VERSION_TABLE))
+    return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def applied_versions(engine):
+    with engine.begin() as conn:
+        return _applied(conn)
+
+
+def pending_migrations(engine):
+    applied = applied_versions(engine)
+    return [migration for migration in MIGRATIONS if migration[0] not in applied]
+
+
+@contextmanager
+def _locked(engine):
+    """
+    Yield (connection, per-migration transaction factory) while holding the
+    migration lock.
+    """
+    dialect = engine.dialect.name
+    with engine.connect() as conn:
+        if dialect == 'sqlite':
+            # pysqlite would otherwise open (and commit) transactions itself
+            conn.execution_options(isolation_level='AUTOCOMMIT')
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+            try:
+                yield conn, nullcontext
+            except BaseException:
+                conn.exec_driver_sql('ROLLBACK')
+                raise
+            conn.exec_driver_sql('COMMIT')
+        elif dialect == 'postgresql':
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {'id': MIGRATION_LOCK_ID})
+            conn.commit()
+            try:
+                yield conn, conn.begin
+            finally:
+                if conn.in_transaction():
+                    conn.rollback()
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {'id': MIGRATION_LOCK_ID})
+                conn.commit()
+        else:
+            logger.warning(f"No migration lock for {dialect}; run upgrades from a single process")
+            yield conn, conn.begin
+
+
+def upgrade(engine):
+    """
+    Apply every pending migration, holding the migration lock throughout.
+
+    Returns:
+        list: Versions applied by this call (empty if another process
+        applied them first)
+    """
+    done = []
+    with _locked(engine) as (conn, transaction):
+        with transaction():
+            applied = _applied(conn)
+        for version, description, statements in MIGRATIONS:
+            if version in applied:
+                continue
+            with transaction():
+                for statement in statements:
+                    _run_step(conn, statement)
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version, description, applied_at) "
+                         "VALUES (:version, :description, :applied_at)"),
+                    {'version': version, 'description': description, 'applied_at': datetime.utcnow()}
+                )
+            logger.info(f"Applied migration {version}: {description}")
+            done.append(version)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('command', choices=['upgrade', 'status'])
+    parser.add_argument('--database', default=None, help="Database URL (default: Config.SQLALCHEMY_DATABASE_URI)")
+    args = parser.parse_args(argv)
+
+    if args.database is None:
+        from config import Config
+        args.database = Config.SQLALCHEMY_DATABASE_URI
+    engine = create_engine(args.database)
+
+    if args.command == 'upgrade':
+        applied = upgrade(engine)
+        print(f"Applied {len(applied)} migration(s)" + (f": {applied}" if applied else ""))
+    else:
+        applied = applied_versions(engine)
+        for version, description, _ in MIGRATIONS:
+            print(f"{version:>4}  {'applied' if version in applied else 'pending':<8} {description}")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
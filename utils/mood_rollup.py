@@ -0,0 +1,191 @@
+"""
+Per-user daily mood and homesickness rollup (``daily_mood_rollup``).
+
+Each (user_id, day) row holds the entry count plus sum, sum of squares,
+min and max of mood_score and homesickness_level for that day, enough to
+derive means and standard deviations over any range of days. Trend and
+volatility queries then read one row per day instead of every entry.
+
+Rows are maintained by SQLAlchemy mapper events on MoodEntry (see
+``track``): an insert is folded into its day with a single upsert, an
+update or delete recomputes the affected days from mood_entries. History
+written before the rollup existed, or outside the ORM, is recomputed with
+
+    python -m utils.mood_rollup rebuild [--database URL] [--user ID ...]
+"""
+import sys
+import logging
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, inspect, text
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'daily_mood_rollup'
+
+_AGGREGATES = (
+    "COUNT(*), "
+    "SUM(mood_score), SUM(mood_score * mood_score), MIN(mood_score), MAX(mood_score), "
+    "SUM(homesickness_level), SUM(homesickness_level * homesickness_level), "
+    "MIN(homesickness_level), MAX(homesickness_level)"
+)
+_COLUMNS = (
+    "user_id, day, entry_count, "
+    "mood_sum, mood_sum_sq, mood_min, mood_max, "
+    "homesickness_sum, homesickness_sum_sq, homesickness_min, homesickness_max"
+)
+
+
+def _least(column):
+    return (f"{column} = CASE WHEN excluded.{column} < {TABLE}.{column} "
+            f"THEN excluded.{column} ELSE {TABLE}.{column} END")
+
+
+def _greatest(column):
+    return (f"{column} = CASE WHEN excluded.{column} > {TABLE}.{column} "
+            f"THEN excluded.{column} ELSE {TABLE}.{column} END")
+
+
+# ON CONFLICT upsert; same syntax on SQLite (3.24+) and Postgres
+_UPSERT = (
+    f"INSERT INTO {TABLE} ({_COLUMNS}) VALUES ("
+    ":user_id, :day, 1, :mood, :mood_sq, :mood, :mood, "
+    ":homesickness, :homesickness_sq, :homesickness, :homesickness) "
+    "ON CONFLICT (user_id, day) DO UPDATE SET "
+    f"entry_count = {TABLE}.entry_count + 1, "
+    f"mood_sum = {TABLE}.mood_sum + excluded.mood_sum, "
+    f"mood_sum_sq = {TABLE}.mood_sum_sq + excluded.mood_sum_sq, "
+    f"{_least('mood_min')}, {_greatest('mood_max')}, "
+    f"homesickness_sum = {TABLE}.homesickness_sum + excluded.homesickness_sum, "
+    f"homesickness_sum_sq = {TABLE}.homesickness_sum_sq + excluded.homesickness_sum_sq, "
+    f"{_least('homesickness_min')}, {_greatest('homesickness_max')}"
+)
+
+
+def _day(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def add_entry(connection, user_id, created_at, mood_score, homesickness_level):
+    """Fold one new entry into its day's rollup row."""
+    day = _day(created_at)
+    if connection.dialect.name not in ('sqlite', 'postgresql'):
+        refresh_day(connection, user_id, day)
+        return
+    connection.execute(text(_UPSERT), {
+        'user_id': user_id,
+        'day': day.isoformat(),
+        'mood': mood_score,
+        'mood_sq': mood_score * mood_score,
+        'homesickness': homesickness_level,
+        'homesickness_sq': homesickness_level * homesickness_level,
+    })
+
+
+def refresh_day(connection, user_id, day):
+    """Recompute one user's rollup row for one day from mood_entries."""
+    day = _day(day)
+    params = {'user_id': user_id, 'day': day.isoformat(),
+              'start': datetime.combine(day, datetime.min.time()),
+              'end': datetime.combine(day + timedelta(days=1), datetime.min.time())}
+    connection.execute(text(f"DELETE FROM {TABLE} WHERE user_id = :user_id AND day = :day"), params)
+    connection.execute(text(
+        f"INSERT INTO {TABLE} ({_COLUMNS}) "
+        f"SELECT user_id, :day, {_AGGREGATES} FROM mood_entries "
+        "WHERE user_id = :user_id AND created_at >= :start AND created_at < :end "
+        "GROUP BY user_id"
+    ), params)
+
+
+def rebuild(connection, user_ids=None):
+    """
+    Recompute the rollup from mood_entries, for all users or only user_ids.
+
+    Returns:
+        int: Rollup rows written
+    """
+    where, params = '', {}
+    if user_ids:
+        names = [f"u{i}" for i in range(len(user_ids))]
+        where = f"AND user_id IN ({', '.join(':' + name for name in names)})"
+        params = dict(zip(names, user_ids))
+    connection.execute(text(f"DELETE FROM {TABLE} WHERE 1 = 1 {where}"), params)
+    result = connection.execute(text(
+        f"INSERT INTO {TABLE} ({_COLUMNS}) "
+        f"SELECT user_id, date(created_at), {_AGGREGATES} FROM mood_entries "
+        f"WHERE created_at IS NOT NULL {where} "
+        "GROUP BY user_id, date(created_at)"
+    ), params)
+    return result.rowcount
+
+
+def backfill(connection):
+    """Migration step: create the rollup table if needed and fill it from history."""
+    from models import DailyMoodRollup
+    DailyMoodRollup.__table__.create(connection, checkfirst=True)
+    rows = rebuild(connection)
+    logger.info(f"Backfilled {rows} {TABLE} rows")
+
+
+def _after_insert(mapper, connection, target):
+    if target.created_at is not None:
+        add_entry(connection, target.user_id, target.created_at,
+                  target.mood_score, target.homesickness_level)
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    return history.deleted[0] if history.deleted else getattr(state.object, key)
+
+
+_ROLLUP_INPUTS = ('user_id', 'created_at', 'mood_score', 'homesickness_level')
+
+
+def _after_update(mapper, connection, target):
+    state = inspect(target)
+    if not any(state.attrs[key].history.has_changes() for key in _ROLLUP_INPUTS):
+        return
+    days = {(_previous(state, 'user_id'), _day(_previous(state, 'created_at'))),
+            (target.user_id, _day(target.created_at))}
+    for user_id, day in days:
+        if day is not None:
+            refresh_day(connection, user_id, day)
+
+
+def _after_delete(mapper, connection, target):
+    if target.created_at is not None:
+        refresh_day(connection, target.user_id, target.created_at)
+
+
+def track(model):
+    """Keep the rollup in step with ORM writes to model (MoodEntry)."""
+    event.listen(model, 'after_insert', _after_insert)
+    event.listen(model, 'after_update', _after_update)
+    event.listen(model, 'after_delete', _after_delete)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('command', choices=['rebuild'])
+    parser.add_argument('--database', default=None, help="Database URL (default: Config.SQLALCHEMY_DATABASE_URI)")
+    parser.add_argument('--user', type=int, action='append', default=[], metavar='ID',
+                        help="Only rebuild this user's rows (repeatable)")
+    args = parser.parse_args(argv)
+
+    if args.database is None:
+        from config import Config
+        args.database = Config.SQLALCHEMY_DATABASE_URI
+    engine = create_engine(args.database)
+
+    with engine.begin() as connection:
+        rows = rebuild(connection, args.user or None)
+    print(f"Rebuilt {rows} {TABLE} rows")
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are addressed by the sort key of the last row already seen rather
+than by OFFSET, so the database seeks straight to the next page through an
+index instead of reading and discarding every earlier row. Cursors are
+opaque URL-safe strings; clients pass back the ``next_cursor`` they got.
+"""
+import json
+import base64
+import binascii
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(*key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def decode_sort_key(cursor):
+    """
+    Decode a ``(sort key, row id)`` cursor.
+
+    Raises InvalidCursor unless the cursor holds exactly two values and the
+    id is an integer, so a tampered cursor is a client error rather than a
+    comparison of the id column against a string or list.
+    """
+    key = decode_cursor(cursor)
+    if not isinstance(key, list) or len(key) != 2:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+    last_key, last_id = key
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}")
+    return last_key, last_id
+
+
+def parse_datetime(value):
+    """Parse an ISO date or datetime query argument, or return None if blank."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as e:
+        raise InvalidCursor(f"Invalid date: {value!r}") from e
+
+
+def history_page(query, model, cursor=None, limit=50, since=None, until=None):
+    """
+    One page of a history query, newest first.
+
+    Rows are ordered by (created_at, id) descending. Each page filters on the
+    last row's key, so fetching an old page costs the same as the first one.
+
+    Args:
+        query: Query over model, already filtered (e.g. by user_id)
+        model: Mapped class with ``created_at`` and ``id`` columns
+        cursor (str): ``next_cursor`` from the previous page
+        limit (int): Page size
+        since (datetime): Only rows created at or after this time
+        until (datetime): Only rows created before this time
+
+    Returns:
+        tuple: (rows, next_cursor), next_cursor None on the last page
+    """
+    created_at, row_id = model.created_at, model.id
+    if since is not None:
+        query = query.filter(created_at >= since)
+    if until is not None:
+        query = query.filter(created_at < until)
+    if cursor:
+        last_created, last_id = decode_sort_key(cursor)
+        try:
+            last_created = datetime.fromisoformat(last_created)
+        except (TypeError, ValueError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+        query = query.filter(or_(
+            created_at < last_created,
+            and_(created_at == last_created, row_id < last_id)
+        ))
+
+    rows = query.order_by(created_at.desc(), row_id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at.isoformat(), rows[-1].id)
+    return rows, next_cursor
+
+
+def serialize_row(row, exclude=('user_id',)):
+    """Column values of a model instance as a JSON-ready dict."""
+    item = {}
+    for column in row.__table__.columns:
+        if column.key in exclude:
+            continue
+        value = getattr(row, column.key)
+        item[column.key] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return item
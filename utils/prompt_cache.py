@@ -0,0 +1,127 @@
+"""
+Request coalescing and a persistent prompt -> response cache for LLM calls.
+
+Identical prompts that are in flight at the same time share one upstream
+call (single-flight), and completed responses are kept in a SQLite file
+shared by all workers on the host, with expiry and a size cap.
+"""
+import json
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+
+from config import Config
+from utils.analysis_cache import SQLiteBackend
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers wait for and share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+def prompt_key(model, generation_config, prompt):
+    """Hash identifying a prompt sent to a given model with given settings."""
+    payload = json.dumps([model, generation_config, prompt], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class PromptCache:
+    """Persistent, coalescing cache of LLM response texts."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_call(self, key, call, validate=None):
+        """
+        Return the cached response text for key, or call upstream once for it.
+
+        ``call`` must return the response text. Empty responses, exceptions
+        and responses rejected by ``validate`` are returned but not cached.
+        """
+        try:
+            text = self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Error reading prompt cache: {str(e)}")
+            text = None
+        if text is not None:
+            self.hits += 1
+            return text
+
+        self.misses += 1
+        return self.flights.do(key, lambda: self._call_and_store(key, call, validate))
+
+    def _call_and_store(self, key, call, validate):
+        text = call()
+        if text and (validate is None or validate(text)):
+            try:
+                self.backend.set(key, text, self.ttl)
+            except Exception as e:
+                logger.error(f"Error writing prompt cache: {str(e)}")
+        return text
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'coalesced': self.flights.coalesced,
+            'evictions': self.backend.evictions,
+            'expirations': self.backend.expirations,
+            'entries': len(self.backend),
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_prompt_cache():
+    """Process-wide prompt cache, backed by GEMINI_PROMPT_CACHE_PATH."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = SQLiteBackend(
+                    Config.GEMINI_PROMPT_CACHE_PATH,
+                    max_entries=Config.GEMINI_PROMPT_CACHE_SIZE,
+                    table='prompt_cache'
+                )
+                _cache = PromptCache(backend, Config.GEMINI_PROMPT_CACHE_TTL)
+    return _cache
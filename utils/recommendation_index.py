@@ -0,0 +1,311 @@
+"""
+TF-IDF index for matching strategies and resources to student text.
+
+Every strategy in the resilience strategy catalogs and every row of the
+Resource table is tokenized once (through the shared text pipeline) into a
+sparse term-frequency vector. Queries are scored against an inverted index
+of precomputed, L2-normalized TF-IDF weights held in NumPy arrays, so
+``top_k`` only touches the postings of the query's own terms.
+
+The index is incremental: catalogs are re-indexed only when their snapshot
+changes, and new Resource rows are picked up by id watermark, so a resource
+sync tokenizes just the rows it added. IDF weights are recomputed from the
+stored term frequencies on the next query after any change.
+
+Resources are never synced on the query path. The app indexes them at
+startup and re-checks the table on a background timer
+(``start_resource_refresh``); ``sync_all_resources`` also syncs after
+importing new rows.
+"""
+import math
+import logging
+import threading
+from collections import Counter, namedtuple
+
+import numpy as np
+
+from utils.text_pipeline import get_pipeline
+
+logger = logging.getLogger(__name__)
+
+KIND_STRATEGY = 'strategy'
+KIND_RESOURCE = 'resource'
+
+Match = namedtuple('Match', ['score', 'kind', 'key', 'category', 'item'])
+
+
+class TfidfIndex:
+    """
+    Sparse TF-IDF vectors with cosine top-k queries.
+
+    Weights follow scikit-learn's TfidfVectorizer(sublinear_tf=True) defaults:
+    tf = 1 + ln(count), idf = ln((1 + n) / (1 + df)) + 1, L2-normalized rows.
+    """
+
+    def __init__(self, pipeline=None):
+        self._pipeline = pipeline
+        self._lock = threading.Lock()
+        self._docs = {}
+        self._df = Counter()
+        self._postings = None
+        self._idf = {}
+        self._matches = []
+        self._kinds = {}
+
+    @property
+    def pipeline(self):
+        return self._pipeline or get_pipeline()
+
+    def _terms(self, text):
+        # Indexed documents bypass the pipeline's document LRU so a large
+        # resource sync doesn't evict the texts users are analyzing
+        pipeline = self.pipeline
+        return Counter(pipeline.filter(pipeline.tokenize(pipeline.normalize(text))))
+
+    def upsert(self, key, text, kind, category, item):
+        """Add or replace one document."""
+        terms = self._terms(text)
+        with self._lock:
+            self._discard(key)
+            self._docs[key] = (Match(0.0, kind, key, category, item), terms)
+            self._df.update(terms.keys())
+            self._postings = None
+
+    def remove(self, key):
+        with self._lock:
+            if self._discard(key):
+                self._postings = None
+
+    def _discard(self, key):
+        entry = self._docs.pop(key, None)
+        if entry is None:
+            return False
+        self._df.subtract(entry[1].keys())
+        return True
+
+    def keys(self, kind=None):
+        with self._lock:
+            return [key for key, (match, _) in self._docs.items() if kind is None or match.kind == kind]
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _build_postings(self):
+        # Called with the lock held; O(total postings), no re-tokenization
+        n = len(self._docs)
+        idf = {
+            term: math.log((1 + n) / (1 + df)) + 1
+            for term, df in self._df.items() if df > 0
+        }
+        matches = []
+        rows = {}
+        for row, (match, terms) in enumerate(self._docs.values()):
+            matches.append(match)
+            weights = {term: (1 + math.log(count)) * idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for term, weight in weights.items():
+                doc_rows, doc_weights = rows.setdefault(term, ([], []))
+                doc_rows.append(row)
+                doc_weights.append(weight / norm)
+        self._idf = idf
+        self._matches = matches
+        self._kinds = {
+            kind: np.array([match.kind == kind for match in matches], dtype=bool)
+            for kind in {match.kind for match in matches}
+        }
+        self._postings = {
+            term: (np.array(doc_rows, dtype=np.intp), np.array(doc_weights))
+            for term, (doc_rows, doc_weights) in rows.items()
+        }
+
+    def top_k(self, text, k=5, kind=None):
+        """
+        The k documents most similar to text, best first.
+
+        Returns:
+            list: Match(score, kind, key, category, item) with score > 0
+        """
+        terms = Counter(self.pipeline.document(text).filtered)
+        with self._lock:
+            if self._postings is None:
+                self._build_postings()
+            postings = self._postings
+            idf = self._idf
+            matches = self._matches
+            kinds = self._kinds
+
+        query = {term: (1 + math.log(count)) * idf[term] for term, count in terms.items() if term in idf}
+        if not query:
+            return []
+        norm = math.sqrt(sum(w * w for w in query.values()))
+
+        # Each term's rows are unique, so plain fancy-index accumulation is exact
+        scores = np.zeros(len(matches))
+        for term, weight in query.items():
+            doc_rows, doc_weights = postings[term]
+            scores[doc_rows] += doc_weights * (weight / norm)
+        if kind is not None:
+            scores[~kinds.get(kind, np.zeros(len(matches), dtype=bool))] = 0.0
+
+        k = min(k, len(matches))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [matches[row]._replace(score=round(float(scores[row]), 4)) for row in top if scores[row] > 0]
+
+
+def _strategy_text(category, strategy):
+    parts = [strategy.get('title') or strategy.get('name') or '', strategy.get('description') or '']
+    parts.extend(strategy.get('steps') or [])
+    parts.append(category)
+    return ' '.join(parts)
+
+
+def _resource_text(resource):
+    return ' '.join(filter(None, [resource.name, resource.description, resource.category]))
+
+
+def _resource_item(resource):
+    return {
+        'id': resource.id,
+        'name': resource.name,
+        'description': resource.description,
+        'category': resource.category,
+        'location': resource.location,
+        'url': resource.url,
+    }
+
+
+class RecommendationIndex:
+    """
+    TF-IDF index over strategy catalogs and the Resource table.
+
+    Strategy catalogs are StrategyStore instances; each is re-indexed when its
+    snapshot object changes. Resources are loaded from the database by
+    ``sync_resources``: rows above the highest indexed id are added, and the
+    table is re-read in full only if rows disappeared.
+    """
+
+    def __init__(self, strategy_sources=None, pipeline=None):
+        self.index = TfidfIndex(pipeline)
+        self.strategy_sources = dict(strategy_sources or {})
+        self._snapshots = {}
+        self._resource_max_id = 0
+        self._resource_count = 0
+        self._sync_lock = threading.Lock()
+        self._refresh_thread = None
+        self._refresh_stop = threading.Event()
+
+    def refresh_strategies(self):
+        for source, store in self.strategy_sources.items():
+            snapshot = store.snapshot()
+            if self._snapshots.get(source) is snapshot:
+                continue
+            prefix = f"{KIND_STRATEGY}:{source}:"
+            stale = set(self.index.keys(KIND_STRATEGY))
+            for sid, category, strategy in store.iter_strategies():
+                key = prefix + sid
+                stale.discard(key)
+                self.index.upsert(key, _strategy_text(category, strategy), KIND_STRATEGY, category, strategy)
+            for key in stale:
+                if key.startswith(prefix):
+                    self.index.remove(key)
+            self._snapshots[source] = snapshot
+
+    def add_resources(self, resources):
+        """Index (or re-index) the given Resource rows."""
+        for resource in resources:
+            self.index.upsert(f"{KIND_RESOURCE}:{resource.id}", _resource_text(resource),
+                              KIND_RESOURCE, resource.category, _resource_item(resource))
+            self._resource_max_id = max(self._resource_max_id, resource.id)
+
+    def sync_resources(self):
+        """
+        Pick up Resource rows added since the last sync.
+
+        Needs an app context; without one the resource part of the index is
+        left as is.
+        """
+        from flask import has_app_context
+        if not has_app_context():
+            return
+
+        from models import Resource
+        with self._sync_lock:
+            count = Resource.query.count()
+            if count < self._resource_count:
+                # Rows were deleted: drop the resource part and re-read it
+                for key in self.index.keys(KIND_RESOURCE):
+                    self.index.remove(key)
+                self._resource_max_id = 0
+                self._resource_count = 0
+            if count != self._resource_count:
+                new_rows = Resource.query.filter(Resource.id > self._resource_max_id) \
+                    .order_by(Resource.id).all()
+                self.add_resources(new_rows)
+                self._resource_count = count
+                logger.debug(f"Indexed {len(new_rows)} new resources")
+
+    def _sync_resources_in(self, app):
+        with app.app_context():
+            try:
+                self.sync_resources()
+            except Exception as e:
+                logger.error(f"Error indexing resources: {str(e)}")
+
+    def start_resource_refresh(self, app, interval):
+        """
+        Index the Resource table now, then re-check it every interval seconds
+        on a daemon thread (no thread if interval is 0). Calling it again
+        while the thread runs only repeats the initial sync.
+        """
+        self._sync_resources_in(app)
+        if not interval or (self._refresh_thread is not None and self._refresh_thread.is_alive()):
+            return
+
+        def refresh():
+            while not self._refresh_stop.wait(interval):
+                self._sync_resources_in(app)
+
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(target=refresh, name='recommendation-index-refresh', daemon=True)
+        self._refresh_thread.start()
+
+    def stop_resource_refresh(self):
+        self._refresh_stop.set()
+
+    def top_k(self, text, k=5, kind=None):
+        """
+        Most relevant strategies and/or resources for text (see TfidfIndex.top_k).
+
+        Only the strategy catalogs are checked for changes here; resources are
+        as of the last sync_resources.
+        """
+        self.refresh_strategies()
+        return self.index.top_k(text, k=k, kind=kind)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_recommendation_index():
+    """Process-wide index over both strategy catalogs and the Resource table."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                import ml_processor
+                from utils import resilience_strategies
+
+                _index = RecommendationIndex({
+                    'levels': ml_processor.strategy_store,
+                    'themes': resilience_strategies.strategy_store,
+                })
+    return _index
+
+
+def top_k(text, k=5, kind=None):
+    """Query the process-wide recommendation index."""
+    return get_recommendation_index().top_k(text, k=k, kind=kind)
@@ -0,0 +1,134 @@
+"""
+Versioned cache for per-user reports (wellness reports and their sections).
+
+Reports are keyed by ``(user_id, report_type, data_version, as_of)``, where
+data_version is a per-user counter in ``user_data_versions``. A SQLAlchemy
+``after_flush`` session listener (see ``track``) bumps the counter of every
+user whose report inputs were inserted, updated or deleted, in the same
+transaction as the write. A write therefore makes every cached report of
+that user unreachable, in every worker, and an unchanged user is answered
+with one primary key lookup plus an in-memory dict hit.
+
+Reports also cover a window ending "now", so entries age out of them
+without a write. ``as_of`` (the window's end date) moves the key to a new
+entry every day, and REPORT_CACHE_TTL bounds the lag within a day. Writes
+made outside the ORM session (bulk imports) should call ``bump``.
+"""
+import pickle
+import logging
+import threading
+from datetime import date
+from itertools import chain
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from config import Config
+from utils.analysis_cache import MemoryBackend
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'user_data_versions'
+
+_SELECT_VERSION = text(f"SELECT version FROM {TABLE} WHERE user_id = :user_id")
+
+# ON CONFLICT upsert; same syntax on SQLite (3.24+) and Postgres
+_BUMP = text(
+    f"INSERT INTO {TABLE} (user_id, version) VALUES (:user_id, 1) "
+    f"ON CONFLICT (user_id) DO UPDATE SET version = {TABLE}.version + 1"
+)
+_UPDATE = text(f"UPDATE {TABLE} SET version = version + 1 WHERE user_id = :user_id")
+_INSERT = text(f"INSERT INTO {TABLE} (user_id, version) VALUES (:user_id, 1)")
+
+
+def data_version(connection, user_id):
+    """The user's current data version; 0 until their first tracked write."""
+    return connection.execute(_SELECT_VERSION, {'user_id': user_id}).scalar() or 0
+
+
+def bump(connection, user_ids):
+    """Advance the data version of each user id, invalidating their cached reports."""
+    params = [{'user_id': user_id} for user_id in sorted(set(user_ids))]
+    if not params:
+        return
+    if connection.dialect.name in ('sqlite', 'postgresql'):
+        connection.execute(_BUMP, params)
+        return
+    for row in params:
+        if not connection.execute(_UPDATE, row).rowcount:
+            connection.execute(_INSERT, row)
+
+
+class ReportCache:
+    """Reports keyed by user id, report type and the user's data version, with hit/miss counters."""
+
+    def __init__(self, backend, ttl=3600):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, session, user_id, report_type, compute, as_of=None):
+        """
+        Return the cached report_type report for user_id, or compute() and store it.
+
+        The version is read before computing, so a write that lands while the
+        report is being built leaves it under the older version. Reports are
+        stored pickled, so every caller gets its own copy to modify (unpickling
+        is several times cheaper than copy.deepcopy).
+
+        Args:
+            as_of: End date of the report's window (default: today)
+        """
+        key = (user_id, report_type, data_version(session.connection(), user_id), as_of or date.today())
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return pickle.loads(value)
+
+        self.misses += 1
+        value = compute()
+        self.backend.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), self.ttl)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.backend.evictions,
+            'expirations': self.backend.expirations,
+            'entries': len(self.backend),
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Process-wide report cache, sized by REPORT_CACHE_SIZE."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReportCache(MemoryBackend(max_entries=Config.REPORT_CACHE_SIZE), ttl=Config.REPORT_CACHE_TTL)
+        return _cache
+
+
+_tracked = ()
+
+
+def _after_flush(session, flush_context):
+    changed = chain(session.new, session.deleted, (obj for obj in session.dirty if session.is_modified(obj)))
+    user_ids = {obj.user_id for obj in changed if isinstance(obj, _tracked) and obj.user_id is not None}
+    if user_ids:
+        bump(session.connection(), user_ids)
+
+
+def track(*models):
+    """Bump a user's data version whenever a session flushes changes to their rows of models."""
+    global _tracked
+    if not _tracked:
+        event.listen(Session, 'after_flush', _after_flush)
+    _tracked = tuple(dict.fromkeys(_tracked + models))
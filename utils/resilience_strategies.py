@@ -1,4 +1,5 @@
 import random
+from utils.strategy_store import StrategyStore
 
 # Dictionary of resilience strategies organized by theme
 RESILIENCE_STRATEGIES = {
@@ -116,19 +117,24 @@ RESILIENCE_STRATEGIES = {
     ]
 }
 
+# Indexed view of the theme catalog shared with the rest of the app
+strategy_store = StrategyStore(defaults=RESILIENCE_STRATEGIES)
+
 def get_resilience_strategies(analysis):
     """Generate resilience strategies based on text analysis"""
     strategies = []
     
     # Add strategies based on identified themes
     for theme in analysis.get('themes', []):
-        if theme in RESILIENCE_STRATEGIES:
+        theme_catalog = strategy_store.by_category(theme)
+        if theme_catalog:
             # Add 1-2 strategies for each identified theme
-            theme_strategies = random.sample(RESILIENCE_STRATEGIES[theme], min(2, len(RESILIENCE_STRATEGIES[theme])))
+            theme_strategies = random.sample(theme_catalog, min(2, len(theme_catalog)))
             strategies.extend(theme_strategies)
     
     # Always include at least 2 general wellbeing strategies
-    general_strategies = random.sample(RESILIENCE_STRATEGIES['General Wellbeing'], min(2, len(RESILIENCE_STRATEGIES['General Wellbeing'])))
+    general_catalog = strategy_store.by_category('General Wellbeing')
+    general_strategies = random.sample(general_catalog, min(2, len(general_catalog)))
     strategies.extend(general_strategies)
     
     # Adjust strategy selection based on sentiment
@@ -137,7 +143,7 @@ def get_resilience_strategies(analysis):
     if sentiment_score < -0.5:  # Very negative
         # Add more supportive strategies
         if 'Social Isolation' not in analysis.get('themes', []):
-            social_strategy = random.choice(RESILIENCE_STRATEGIES['Social Isolation'])
+            social_strategy = random.choice(strategy_store.by_category('Social Isolation'))
             strategies.append(social_strategy)
     
     # Ensure we don't have too many strategies (max 5)
@@ -0,0 +1,215 @@
+"""
+Full-text search and keyset-paginated listing for the Resource table.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers;
+Postgres uses a stored, weighted tsvector column with a GIN index. Other
+databases (or SQLite builds without FTS5) fall back to LIKE matching.
+
+Pages are addressed by an opaque cursor holding the last row's sort key,
+so fetching page N costs the same as fetching page 1 regardless of how
+large the table has grown.
+"""
+import re
+import logging
+
+from sqlalchemy import text
+
+from utils.theme_matcher import strip_clitic
+from utils.pagination import encode_cursor, decode_sort_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+_SQLITE_SETUP = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5("
+    "name, description, category, content='resources', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS resources_fts_insert AFTER INSERT ON resources BEGIN "
+    "INSERT INTO resources_fts(rowid, name, description, category) "
+    "VALUES (new.id, new.name, new.description, new.category); END",
+    "CREATE TRIGGER IF NOT EXISTS resources_fts_delete AFTER DELETE ON resources BEGIN "
+    "INSERT INTO resources_fts(resources_fts, rowid, name, description, category) "
+    "VALUES ('delete', old.id, old.name, old.description, old.category); END",
+    "CREATE TRIGGER IF NOT EXISTS resources_fts_update AFTER UPDATE ON resources BEGIN "
+    "INSERT INTO resources_fts(resources_fts, rowid, name, description, category) "
+    "VALUES ('delete', old.id, old.name, old.description, old.category); "
+    "INSERT INTO resources_fts(rowid, name, description, category) "
+    "VALUES (new.id, new.name, new.description, new.category); END",
+]
+
+_POSTGRES_SETUP = [
+    "ALTER TABLE resources ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_resources_search_vector ON resources USING GIN (search_vector)",
+]
+
+# Backend chosen per engine URL by ensure_search_index
+_backends = {}
+
+
+def ensure_search_index(engine):
+    """
+    Create the full-text index for resources if needed and return the backend name.
+
+    Safe to call on every startup: all DDL is idempotent. The FTS5 table is
+    rebuilt from the resources table only when it is first created.
+    """
+    key = str(engine.url)
+    if key in _backends:
+        return _backends[key]
+
+    backend = 'like'
+    try:
+        if engine.dialect.name == 'sqlite':
+            with engine.begin() as conn:
+                existed = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resources_fts'"
+                )).first() is not None
+                for statement in _SQLITE_SETUP:
+                    conn.execute(text(statement))
+                if not existed:
+                    conn.execute(text("INSERT INTO resources_fts(resources_fts) VALUES ('rebuild')"))
+            backend = 'fts5'
+        elif engine.dialect.name == 'postgresql':
+            with engine.begin() as conn:
+                for statement in _POSTGRES_SETUP:
+                    conn.execute(text(statement))
+            backend = 'tsvector'
+    except Exception as e:
+        logger.warning(f"Full-text search unavailable, falling back to LIKE: {str(e)}")
+
+    _backends[key] = backend
+    return backend
+
+
+_WORD_RE = re.compile(r"[^\W_]+(?:['\u2019][^\W_]+)?")
+
+
+def query_terms(query):
+    """
+    Search terms of a user query: words split on any non-word character
+    ('self-care' -> self, care), with possessive and contraction endings
+    dropped ("can't" -> can).
+    """
+    return [strip_clitic(word) for word in _WORD_RE.findall(query.lower())]
+
+
+def _fts5_query(terms):
+    # Quote every term so user input can't inject FTS5 syntax; prefix-match the last one
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _tsquery(terms):
+    # Terms are alphanumeric, so they can't inject tsquery operators
+    return ' & '.join(terms) + ':*'
+
+
+def _match_clause(backend, query, params):
+    """
+    SQL for (join, filter, rank expression, rank order) of a text query.
+
+    Returns None when the query has no searchable terms.
+    """
+    if backend in ('fts5', 'tsvector'):
+        terms = query_terms(query)
+        if not terms:
+            return None
+        if backend == 'fts5':
+            params['match'] = _fts5_query(terms)
+            # bm25() of the joined FTS row; no second MATCH per result row
+            return ("JOIN resources_fts ON resources_fts.rowid = r.id",
+                    "resources_fts MATCH :match",
+                    "bm25(resources_fts, 10.0, 1.0, 5.0)",
+                    'asc')
+        params['match'] = _tsquery(terms)
+        return ('',
+                "r.search_vector @@ to_tsquery('english', :match)",
+                "ts_rank_cd(r.search_vector, to_tsquery('english', :match))",
+                'desc')
+    params['match'] = f"%{query.lower()}%"
+    return ('',
+            "(lower(r.name) LIKE :match OR lower(r.description) LIKE :match "
+            "OR lower(r.category) LIKE :match)",
+            "CASE WHEN lower(r.name) LIKE :match THEN 0 ELSE 1 END",
+            'asc')
+
+
+def search_resources(session, query=None, category=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of resources matching query, with category facet counts.
+
+    Without a query, resources are listed by name. With one, they are ordered
+    by relevance (best first); ties and listings are broken by id. A query
+    with no searchable words (only punctuation) matches nothing.
+
+    Args:
+        session: SQLAlchemy session bound to the app database
+        query (str): Free-text search over name, description and category
+        category (str): Restrict results to one category ('all' or None for any)
+        cursor (str): ``next_cursor`` from the previous page
+        limit (int): Page size, capped at MAX_PAGE_SIZE
+
+    Returns:
+        dict: {'items': [...], 'next_cursor': str or None,
+               'facets': {'category': [{'value', 'count'}, ...]}, 'backend': str}
+    """
+    backend = ensure_search_index(session.get_bind())
+    limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+    category = None if category in (None, '', 'all') else category
+
+    params = {}
+    query = (query or '').strip()
+    if query:
+        match = _match_clause(backend, query, params)
+        if match is None:
+            return {'items': [], 'next_cursor': None, 'facets': {'category': []}, 'backend': backend}
+        match_join, match_filter, sort_expr, direction = match
+        match_where = f"{match_join} WHERE {match_filter}"
+    else:
+        match_where = ''
+        sort_expr, direction = 'r.name', 'asc'
+
+    # Facet counts ignore the category filter so every category stays selectable
+    facets = session.execute(text(
+        f"SELECT r.category AS value, COUNT(*) AS count FROM resources r {match_where} "
+        "GROUP BY r.category ORDER BY count DESC, value"
+    ), params).mappings().all()
+
+    filters = []
+    if category:
+        filters.append("p.category = :category")
+        params['category'] = category
+    if cursor:
+        last_key, last_id = decode_sort_key(cursor)
+        op = '>' if direction == 'asc' else '<'
+        filters.append(f"(p.sort_key {op} :last_key OR (p.sort_key = :last_key AND p.id > :last_id))")
+        params['last_key'] = last_key
+        params['last_id'] = last_id
+    page_where = f"WHERE {' AND '.join(filters)}" if filters else ''
+
+    params['limit'] = limit + 1
+    rows = session.execute(text(
+        "SELECT p.* FROM ("
+        "SELECT r.id, r.name, r.description, r.category, r.location, r.contact_info, "
+        f"r.hours, r.url, {sort_expr} AS sort_key FROM resources r {match_where}"
+        f") p {page_where} ORDER BY p.sort_key {direction}, p.id LIMIT :limit"
+    ), params).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['sort_key'], rows[-1]['id'])
+
+    return {
+        'items': [{key: value for key, value in row.items() if key != 'sort_key'} for row in rows],
+        'next_cursor': next_cursor,
+        'facets': {'category': [dict(facet) for facet in facets]},
+        'backend': backend,
+    }
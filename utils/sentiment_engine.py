@@ -0,0 +1,331 @@
+"""
+Batched, NumPy-vectorized VADER scorer.
+
+Reproduces nltk's SentimentIntensityAnalyzer.polarity_scores for a whole
+batch of texts at once. Tokenization and per-word lookups run once per
+token in Python; the valence rules (caps emphasis, boosters, negation, the
+"never so/this" and "least" checks, idioms, the "but" shift) are applied to
+flat arrays covering every token in the batch, and per-text sums are taken
+with np.bincount.
+
+Compatibility: ``compound`` matches nltk to within COMPOUND_TOLERANCE.
+Valences are summed in the same order as nltk, so the unrounded sums are
+normally identical; the tolerance covers a last-digit difference after
+rounding to 4 places. nltk quirks are kept on purpose, notably that every
+repeat of a token is scored with the context of its first occurrence.
+"""
+import math
+import re
+import string
+
+import numpy as np
+
+# Largest difference from nltk's rounded compound score
+COMPOUND_TOLERANCE = 1e-4
+
+_PUNCTUATION = re.escape(string.punctuation)
+# A word with a run of ASCII punctuation on exactly one side, as SentiText strips it
+_EDGE_PUNCT_RE = re.compile(
+    rf"(?:([{_PUNCTUATION}]+)([^{_PUNCTUATION}]{{2,}})|([^{_PUNCTUATION}]{{2,}})([{_PUNCTUATION}]+))"
+)
+_PUNCT_CHARS = frozenset(string.punctuation)
+
+
+class BatchSentimentScorer:
+    """
+    VADER-compatible scorer over batches of texts.
+
+    Args:
+        lexicon (dict): VADER word -> valence (e.g. lexicon_artifact.vader_lexicon())
+        constants: nltk VaderConstants instance, for the booster/negation tables
+    """
+
+    def __init__(self, lexicon, constants=None):
+        if constants is None:
+            from nltk.sentiment.vader import VaderConstants
+            constants = VaderConstants()
+        self.lexicon = lexicon
+        self.constants = constants
+        self._punc_list = frozenset(constants.PUNC_LIST)
+        self._negate = frozenset(constants.NEGATE)
+        self._boosters = constants.BOOSTER_DICT
+
+        # Word features, indexed by a per-scorer id for each lowercase form
+        self._ids = {}
+        self._valence = []
+        self._booster = []
+        self._negated = []
+        self._arrays = None
+
+        self._special = {}
+        for word in ('never', 'so', 'this', 'least', 'at', 'very', 'kind', 'of', 'but'):
+            self._special[word] = self._word_id(word)
+
+        # Multi-word entries compared against exact (case-sensitive) token sequences
+        self._idioms = [
+            (tuple(self._word_id(w) for w in phrase.split()), value)
+            for phrase, value in constants.SPECIAL_CASE_IDIOMS.items()
+        ]
+        self._booster_phrases = [
+            tuple(self._word_id(w) for w in phrase.split())
+            for phrase in self._boosters if ' ' in phrase
+        ]
+
+    def _word_id(self, lower):
+        word_id = self._ids.get(lower)
+        if word_id is None:
+            word_id = self._ids[lower] = len(self._valence)
+            self._valence.append(self.lexicon.get(lower, np.nan))
+            self._booster.append(self._boosters.get(lower, 0.0))
+            self._negated.append(lower in self._negate or "n't" in lower)
+        return word_id
+
+    def _tables(self):
+        # Feature arrays over word ids, rebuilt only when new words were seen
+        if self._arrays is None or len(self._arrays[0]) != len(self._valence):
+            self._arrays = (
+                np.array(self._valence, dtype=float),
+                np.array(self._booster, dtype=float),
+                np.array(self._negated, dtype=bool),
+            )
+        return self._arrays
+
+    def _words(self, text):
+        """SentiText.words_and_emoticons, without building the punctuation product table."""
+        words = []
+        for word in text.split():
+            if len(word) < 2:
+                continue
+            if word[0] in _PUNCT_CHARS or word[-1] in _PUNCT_CHARS:
+                match = _EDGE_PUNCT_RE.fullmatch(word)
+                if match:
+                    before, core, core_after, after = match.groups()
+                    if before is not None and before in self._punc_list:
+                        word = core
+                    elif after is not None and after in self._punc_list:
+                        word = core_after
+            words.append(word)
+        return words
+
+    def _tokenize(self, texts):
+        word_id = self._word_id
+        doc_ids = []
+        positions = []
+        first = []
+        lower_ids = []
+        is_upper = []
+        is_lower = []
+        cap_diff = []
+        doc_lengths = []
+
+        offset = 0
+        for doc, text in enumerate(texts):
+            words = self._words(text)
+            first_index = {}
+            upper_count = 0
+            for pos, word in enumerate(words):
+                lower = word.lower()
+                upper = word.isupper()
+                upper_count += upper
+                doc_ids.append(doc)
+                positions.append(pos)
+                first.append(offset + first_index.setdefault(word, pos))
+                lower_ids.append(word_id(lower))
+                is_upper.append(upper)
+                is_lower.append(word == lower)
+            cap_diff.append(0 < len(words) - upper_count < len(words))
+            doc_lengths.append(len(words))
+            offset += len(words)
+
+        return (
+            np.array(doc_ids, dtype=np.intp),
+            np.array(positions, dtype=np.intp),
+            np.array(first, dtype=np.intp),
+            np.array(lower_ids, dtype=np.intp),
+            np.array(is_upper, dtype=bool),
+            np.array(is_lower, dtype=bool),
+            np.array(cap_diff, dtype=bool),
+            np.array(doc_lengths, dtype=np.intp),
+        )
+
+    def _valences(self, texts):
+        """Per-token sentiment valences (nltk's ``sentiments`` lists, flattened) and doc ids."""
+        doc_ids, pos, first, ids, upper, lower, cap_diff, lengths = self._tokenize(texts)
+        n = len(ids)
+        if not n:
+            return doc_ids, np.zeros(0)
+
+        c = self.constants
+        valences, boosters, negations = self._tables()
+        valence = valences[ids]
+        in_lex = ~np.isnan(valence)
+        booster = boosters[ids]
+        is_booster = booster != 0
+        negated = negations[ids]
+        cap = upper & cap_diff[doc_ids]
+        cap_lex = cap & in_lex
+        remaining = lengths[doc_ids] - pos - 1
+
+        def shift(values, d, fill):
+            # values[i - d], or fill where i - d falls outside the token's document
+            out = np.full(n, fill, dtype=values.dtype)
+            out[d:] = values[:-d]
+            return np.where(pos >= d, out, fill)
+
+        def ahead(values, d, fill):
+            out = np.full(n, fill, dtype=values.dtype)
+            out[:-d] = values[d:]
+            return np.where(remaining >= d, out, fill)
+
+        def exact(word_id):
+            # Token equals a lowercase word exactly (nltk compares these case-sensitively)
+            return (ids == word_id) & lower
+
+        sp = self._special
+        so_this = exact(sp['so']) | exact(sp['this'])
+        never = exact(sp['never'])
+
+        v = np.where(in_lex, valence, 0.0)
+        v = np.where(cap_lex, np.where(v > 0, v + c.C_INCR, v - c.C_INCR), v)
+
+        for d, damp in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            valid = in_lex & (pos >= d) & ~shift(in_lex, d, True)
+
+            # Booster words before a lexicon word, with their own caps emphasis
+            s = shift(booster, d, 0.0)
+            s = np.where(v < 0, -s, s)
+            boost_cap = shift(cap & is_booster, d, False)
+            s = np.where(boost_cap, np.where(v > 0, s + c.C_INCR, s - c.C_INCR), s)
+            v = np.where(valid, v + s * damp, v)
+
+            neg = shift(negated, d, False)
+            if d == 1:
+                v = np.where(valid & neg, v * c.N_SCALAR, v)
+            elif d == 2:
+                never_so = shift(never, 2, False) & shift(so_this, 1, False)
+                v = np.where(valid & never_so, v * 1.5, np.where(valid & neg, v * c.N_SCALAR, v))
+            else:
+                never_so = (shift(never, 3, False) & shift(so_this, 2, False)) | shift(so_this, 1, False)
+                v = np.where(valid & never_so, v * 1.25, np.where(valid & neg, v * c.N_SCALAR, v))
+                v = self._idioms_check(v, valid, ids, lower, shift, ahead)
+
+        least = shift(ids == sp['least'], 1, False) & ~shift(in_lex, 1, True)
+        at_very = shift(ids == sp['at'], 2, False) | shift(ids == sp['very'], 2, False)
+        v = np.where(in_lex & least & ((pos == 1) | ~at_very), v * c.N_SCALAR, v)
+
+        # Booster words and "kind" in "kind of" carry no valence themselves
+        kind_of = (ids == sp['kind']) & ahead(ids == sp['of'], 1, False)
+        v = np.where(is_booster | kind_of, 0.0, v)
+
+        # nltk scores every repeat of a token with its first occurrence's context
+        v = v[first]
+
+        # "but" shifts weight from the clause before it to the clause after it
+        is_but = ids == sp['but']
+        but_pos = np.full(len(lengths), -1, dtype=np.intp)
+        but_docs, but_first = np.unique(doc_ids[is_but], return_index=True)
+        but_pos[but_docs] = pos[np.flatnonzero(is_but)[but_first]]
+        doc_but = but_pos[doc_ids]
+        has_but = doc_but >= 0
+        v = np.where(has_but & (pos < doc_but), v * 0.5, np.where(has_but & (pos > doc_but), v * 1.5, v))
+        return doc_ids, v
+
+    def _idioms_check(self, v, valid, ids, lower, shift, ahead):
+        # Only phrases whose words all occur in the batch can match
+        present = set(np.unique(ids).tolist())
+        idioms = [(word_ids, value) for word_ids, value in self._idioms if present.issuperset(word_ids)]
+        phrases = [word_ids for word_ids in self._booster_phrases if present.issuperset(word_ids)]
+        if not (idioms or phrases) or not valid.any():
+            return v
+
+        def seq(word_ids, start):
+            # Exact match of word_ids at token offsets start, start + 1, ...
+            match = np.ones(len(ids), dtype=bool)
+            for k, word_id in enumerate(word_ids):
+                offset = start + k
+                tokens = (ids == word_id) & lower
+                if offset < 0:
+                    match &= shift(tokens, -offset, False)
+                elif offset > 0:
+                    match &= ahead(tokens, offset, False)
+                else:
+                    match &= tokens
+            return match
+
+        # nltk checks the sequences ending at or before i in this order and
+        # takes the first hit, then lets sequences starting at i override it
+        override = np.full(len(ids), np.nan)
+        for start, length in reversed(((-1, 2), (-2, 3), (-2, 2), (-3, 3), (-3, 2))):
+            for word_ids, value in idioms:
+                if len(word_ids) == length:
+                    override = np.where(seq(word_ids, start), value, override)
+        for length in (2, 3):
+            for word_ids, value in idioms:
+                if len(word_ids) == length:
+                    override = np.where(seq(word_ids, 0), value, override)
+        v = np.where(valid & ~np.isnan(override), override, v)
+
+        phrase = np.zeros(len(ids), dtype=bool)
+        for word_ids in phrases:
+            if len(word_ids) == 2:
+                phrase |= seq(word_ids, -3) | seq(word_ids, -2)
+        return np.where(valid & phrase, v + self.constants.B_DECR, v)
+
+    def _sums(self, texts):
+        doc_ids, v = self._valences(texts)
+        count = len(texts)
+        total = np.bincount(doc_ids, weights=v, minlength=count)
+        pos_sum = np.bincount(doc_ids, weights=np.where(v > 0, v + 1, 0.0), minlength=count)
+        neg_sum = np.bincount(doc_ids, weights=np.where(v < 0, v - 1, 0.0), minlength=count)
+        neu_count = np.bincount(doc_ids, weights=(v == 0), minlength=count)
+        tokens = np.bincount(doc_ids, minlength=count)
+        return total, pos_sum, neg_sum, neu_count, tokens
+
+    @staticmethod
+    def _punctuation_emphasis(text):
+        ep_amplifier = min(text.count('!'), 4) * 0.292
+        qm_count = text.count('?')
+        qm_amplifier = 0
+        if qm_count > 1:
+            qm_amplifier = qm_count * 0.18 if qm_count <= 3 else 0.96
+        return ep_amplifier + qm_amplifier
+
+    def compound_scores(self, texts):
+        """Compound scores for texts, as a float array in input order."""
+        texts = list(texts)
+        total, _, _, _, tokens = self._sums(texts)
+        amplifier = np.array([self._punctuation_emphasis(text) for text in texts]) if texts else np.zeros(0)
+        total = np.where(total > 0, total + amplifier, np.where(total < 0, total - amplifier, total))
+        compound = np.where(tokens > 0, total / np.sqrt(total * total + 15), 0.0)
+        # Python's round, as nltk uses, rather than np.round's scaled rounding
+        return np.array([round(value, 4) for value in compound.tolist()])
+
+    def polarity_scores(self, texts):
+        """nltk-style {'neg', 'neu', 'pos', 'compound'} dicts for texts, in input order."""
+        texts = list(texts)
+        total, pos_sums, neg_sums, neu_counts, tokens = self._sums(texts)
+        results = []
+        for text, sum_s, pos_sum, neg_sum, neu_count, n in zip(
+                texts, total.tolist(), pos_sums.tolist(), neg_sums.tolist(), neu_counts.tolist(), tokens.tolist()):
+            if not n:
+                results.append({'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0})
+                continue
+            amplifier = self._punctuation_emphasis(text)
+            if sum_s > 0:
+                sum_s += amplifier
+            elif sum_s < 0:
+                sum_s -= amplifier
+            compound = sum_s / math.sqrt(sum_s * sum_s + 15)
+
+            if pos_sum > math.fabs(neg_sum):
+                pos_sum += amplifier
+            elif pos_sum < math.fabs(neg_sum):
+                neg_sum -= amplifier
+            total_weight = pos_sum + math.fabs(neg_sum) + neu_count
+            results.append({
+                'neg': round(math.fabs(neg_sum / total_weight), 3),
+                'neu': round(math.fabs(neu_count / total_weight), 3),
+                'pos': round(math.fabs(pos_sum / total_weight), 3),
+                'compound': round(compound, 4),
+            })
+        return results
@@ -0,0 +1,113 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+StrategySnapshot = namedtuple('StrategySnapshot', ['categories', 'by_id', 'digest'])
+
+
+def strategy_id(category, strategy):
+    """Stable id for a strategy: its own 'id', else category plus slugified title."""
+    if strategy.get('id'):
+        return str(strategy['id'])
+    title = strategy.get('title') or strategy.get('name') or ''
+    slug = re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+    return f"{category}/{slug}"
+
+
+def _index(categories, digest):
+    frozen = {}
+    by_id = {}
+    for category, strategies in categories.items():
+        frozen[category] = tuple(strategies)
+        for strategy in strategies:
+            by_id.setdefault(strategy_id(category, strategy), (category, strategy))
+    return StrategySnapshot(frozen, by_id, digest)
+
+
+class StrategyStore:
+    """
+    In-process, indexed view of a resilience strategy catalog.
+
+    The catalog is read from a JSON file (category -> list of strategies) when
+    one is given and exists, otherwise from ``defaults``. The file is parsed
+    once; afterwards it is stat-ed at most every ``check_interval`` seconds and
+    only re-parsed when its mtime or size changes *and* its content hash
+    differs from the loaded version. Snapshots are shared between callers and
+    must be treated as read-only.
+    """
+
+    def __init__(self, path=None, defaults=None, check_interval=1.0):
+        self.path = path
+        self.defaults = defaults or {}
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._stat = None
+        self._checked_at = 0.0
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _reload(self, stat):
+        if stat is None:
+            if self._stat is not None or self._snapshot is None:
+                if self.path:
+                    logger.warning("Resilience strategies file not found, using defaults")
+                self._snapshot = _index(self.defaults, None)
+            self._stat = None
+            return
+
+        try:
+            with open(self.path, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if self._snapshot is None or digest != self._snapshot.digest:
+                self._snapshot = _index(json.loads(raw), digest)
+                logger.info(f"Loaded resilience strategies from {self.path} ({digest[:12]})")
+            self._stat = stat
+        except Exception as e:
+            logger.error(f"Error loading resilience strategies: {str(e)}")
+            if self._snapshot is None:
+                self._snapshot = _index({category: [] for category in self.defaults}, None)
+
+    def snapshot(self):
+        """Return the current StrategySnapshot, reloading the file if it changed."""
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            if self._snapshot is None or now - self._checked_at >= self.check_interval:
+                stat = self._file_stat() if self.path else None
+                if self._snapshot is None or stat != self._stat:
+                    self._reload(stat)
+                self._checked_at = now
+            return self._snapshot
+
+    def categories(self):
+        """Mapping of category -> tuple of strategies."""
+        return self.snapshot().categories
+
+    def by_category(self, category):
+        return self.snapshot().categories.get(category, ())
+
+    def get(self, strategy_id):
+        """Return the strategy dict with the given id, or None."""
+        entry = self.snapshot().by_id.get(strategy_id)
+        return entry[1] if entry else None
+
+    def iter_strategies(self):
+        """Yield (strategy_id, category, strategy) for every strategy in the catalog."""
+        for sid, (category, strategy) in self.snapshot().by_id.items():
+            yield sid, category, strategy
@@ -1,24 +1,11 @@
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-import re
 from collections import Counter
+from utils.batch_analysis import analyze_in_batches
+from utils.text_pipeline import get_pipeline
 
-# Ensure required NLTK data is downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('wordnet')
-
-# Initialize lemmatizer and stop words
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
+# Normalization, tokenization, stopword filtering, lemmatization and theme
+# matching run through the shared text pipeline (utils/text_pipeline.py).
+# WordNet is read lazily on the first lemmatize call; stopwords come from the
+# lexicon artifact. Neither is loaded (or downloaded) at import time.
 
 # Keywords related to homesickness and adaptation
 homesickness_keywords = [
@@ -44,21 +31,8 @@ negative_words = [
 ]
 
 def preprocess_text(text):
-    """Preprocess text for analysis"""
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove special characters and digits
-    text = re.sub(r'[^\w\s]', ' ', text)
-    text = re.sub(r'\d+', ' ', text)
-    
-    # Tokenize
-    tokens = word_tokenize(text)
-    
-    # Remove stop words and lemmatize
-    filtered_tokens = [lemmatizer.lemmatize(word) for word in tokens if word not in stop_words]
-    
-    return filtered_tokens
+    """Preprocess text for analysis: lowercase, split into letter runs ("self-care" -> self, care), drop stop words, lemmatize"""
+    return list(get_pipeline().document(text).lemmas)
 
 def extract_keywords(tokens):
     """Extract relevant keywords from the processed text"""
@@ -88,50 +62,30 @@ def calculate_sentiment(tokens):
     
     return (positive_count - negative_count) / total_count  # Range: -1 to 1
 
+def _word_list_sentiment(doc):
+    return calculate_sentiment(doc.lemmas)
+
 def identify_themes(text):
     """Identify themes in the text"""
-    themes = []
-    
-    # Academic challenges
-    academic_words = ['class', 'course', 'study', 'professor', 'grade', 'exam', 'assignment', 'lecture']
-    if any(word in text.lower() for word in academic_words):
-        themes.append('Academic Challenges')
-    
-    # Social isolation
-    social_words = ['friend', 'lonely', 'alone', 'social', 'party', 'talk', 'connection', 'relationship']
-    if any(word in text.lower() for word in social_words):
-        themes.append('Social Isolation')
-    
-    # Cultural adjustment
-    cultural_words = ['culture', 'different', 'food', 'tradition', 'custom', 'language', 'adapt', 'adjust']
-    if any(word in text.lower() for word in cultural_words):
-        themes.append('Cultural Adjustment')
-    
-    # Family separation
-    family_words = ['family', 'parent', 'mom', 'dad', 'mother', 'father', 'sibling', 'brother', 'sister', 'home']
-    if any(word in text.lower() for word in family_words):
-        themes.append('Family Separation')
-    
-    # Identity issues
-    identity_words = ['identity', 'belong', 'fit', 'who', 'myself', 'change', 'same', 'different']
-    if any(word in text.lower() for word in identity_words):
-        themes.append('Identity Issues')
-    
-    return themes
+    return list(get_pipeline().document(text).themes)
+
+def match_themes(text):
+    """Per-theme keyword hit counts and (start, end) positions in the lowercased text"""
+    return get_pipeline().document(text).themes
 
 def analyze_text(text):
     """Analyze text to identify themes, emotions, and keywords"""
-    # Preprocess the text
-    tokens = preprocess_text(text)
+    # Each stage runs once per text, shared with ml_processor
+    doc = get_pipeline().document(text)
     
     # Extract keywords
-    keywords = extract_keywords(tokens)
+    keywords = extract_keywords(doc.lemmas)
     
     # Calculate sentiment
-    sentiment_score = calculate_sentiment(tokens)
+    sentiment_score = doc.score('word_list_sentiment', _word_list_sentiment)
     
     # Identify themes
-    themes = identify_themes(text)
+    themes = list(doc.themes)
     
     # Determine the emotional state
     if sentiment_score > 0.3:
@@ -151,3 +105,7 @@ def analyze_text(text):
     }
     
     return analysis
+
+def analyze_texts(texts, workers=None, chunk_size=64):
+    """Analyze many texts in input order, using worker processes for large batches"""
+    return analyze_in_batches(analyze_text, texts, workers=workers, chunk_size=chunk_size)
@@ -0,0 +1,257 @@
+"""
+Stage-based text pipeline shared by the analyzers.
+
+    normalize -> tokenize -> filter -> score        (ml_processor)
+    normalize -> split -> filter -> lemmatize       (utils.text_analysis)
+    normalize -> themes
+
+``tokens`` match the alphanumeric tokens of NLTK's word_tokenize, which
+drops hyphenated and dotted words ("self-care", "e.g") and keeps numbers.
+``parts`` are the runs of letters instead: compounds and contractions are
+split into their parts and digits are dropped ("5:30pm" -> "pm", "1,000" ->
+nothing), as text_analysis's original punctuation/digit stripping did.
+
+A Document computes each stage the first time it is asked for and keeps the
+result, so ml_processor and utils.text_analysis looking at the same text
+share one lowercase pass, one tokenization and one stopword filter. Callers
+only pay for the stages they read. Documents for recently seen texts are
+kept in a small LRU, so separate callers in the same process get the same
+object back.
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from config import Config
+from utils import lexicon_artifact
+from utils.lemma_cache import LemmaCache
+from utils.lexicon_engine import tokenize
+from utils.theme_matcher import ThemeMatcher
+
+STAGES = ('normalized', 'tokens', 'filtered', 'parts', 'lemmas', 'themes')
+
+# Runs of letters; everything else (punctuation, digits, underscores) separates words
+_WORD_PARTS_RE = re.compile(r'[^\W\d_]+')
+
+# Vocabulary for each theme, in the order themes are reported
+THEME_KEYWORDS = {
+    'Academic Challenges': ['class', 'course', 'study', 'professor', 'grade', 'exam', 'assignment', 'lecture'],
+    'Social Isolation': ['friend', 'lonely', 'alone', 'social', 'party', 'talk', 'connection', 'relationship'],
+    'Cultural Adjustment': ['culture', 'different', 'food', 'tradition', 'custom', 'language', 'adapt', 'adjust'],
+    'Family Separation': ['family', 'parent', 'mom', 'dad', 'mother', 'father', 'sibling', 'brother', 'sister', 'home'],
+    'Identity Issues': ['identity', 'belong', 'fit', 'who', 'myself', 'change', 'same', 'different']
+}
+
+# Compounds and derived words that should count as a theme keyword; plain
+# inflections ('friends', 'studying') are handled by the matcher
+THEME_DERIVED_FORMS = {
+    'homesick': 'home', 'homesickness': 'home', 'hometown': 'home', 'homeland': 'home',
+    'friendship': 'friend', 'friendships': 'friend', 'friendless': 'friend',
+    'socially': 'social', 'socialize': 'social', 'socializing': 'social',
+    'classmate': 'class', 'classmates': 'class', 'classroom': 'class', 'coursework': 'course',
+    'studies': 'study', 'studied': 'study',
+    'families': 'family', 'parental': 'parent', 'grandparent': 'parent', 'grandparents': 'parent',
+    'grandmother': 'mother', 'grandfather': 'father', 'siblings': 'sibling',
+    'cultural': 'culture', 'culturally': 'culture', 'traditional': 'tradition',
+    'adaptation': 'adapt', 'adjustment': 'adjust', 'relationships': 'relationship',
+    'identities': 'identity', 'loneliness': 'lonely',
+}
+
+# Compiled once; one linear scan per text matches every theme at word boundaries
+theme_matcher = ThemeMatcher(THEME_KEYWORDS, derived_forms=THEME_DERIVED_FORMS)
+
+
+class Document:
+    """
+    One text moving through the pipeline.
+
+    Stage outputs are properties computed on first access and cached on the
+    instance. Scores are cached per scorer name, see ``score`` and
+    ``set_score``.
+    """
+
+    __slots__ = ('text', 'pipeline', '_normalized', '_tokens', '_filtered',
+                 '_parts', '_lemmas', '_themes', '_scores')
+
+    def __init__(self, text, pipeline):
+        self.text = text
+        self.pipeline = pipeline
+        self._normalized = None
+        self._tokens = None
+        self._filtered = None
+        self._parts = None
+        self._lemmas = None
+        self._themes = None
+        self._scores = {}
+
+    @property
+    def normalized(self):
+        """Lowercased text."""
+        if self._normalized is None:
+            self._normalized = self.pipeline.normalize(self.text)
+        return self._normalized
+
+    @property
+    def tokens(self):
+        """Alphanumeric word tokens of the normalized text."""
+        if self._tokens is None:
+            self._tokens = self.pipeline.tokenize(self.normalized)
+        return self._tokens
+
+    @property
+    def filtered(self):
+        """Tokens with English stopwords removed."""
+        if self._filtered is None:
+            self._filtered = self.pipeline.filter(self.tokens)
+        return self._filtered
+
+    @property
+    def parts(self):
+        """Letter runs of the normalized text with English stopwords removed."""
+        if self._parts is None:
+            self._parts = self.pipeline.filter(self.pipeline.split(self.normalized))
+        return self._parts
+
+    @property
+    def lemmas(self):
+        """WordNet lemmas of the parts."""
+        if self._lemmas is None:
+            self._lemmas = self.pipeline.lemmatize(self.parts)
+        return self._lemmas
+
+    @property
+    def themes(self):
+        """theme -> ThemeHits(count, positions in the normalized text) for every theme present."""
+        if self._themes is None:
+            self._themes = self.pipeline.match_themes(self.normalized)
+        return self._themes
+
+    def score(self, name, scorer):
+        """
+        Return scorer(self), computed once per document and scorer name.
+
+        Scorers read whichever stages they need from the document, so two
+        analyzers asking for the same score share one computation.
+        """
+        try:
+            return self._scores[name]
+        except KeyError:
+            value = self._scores[name] = scorer(self)
+            return value
+
+    def has_score(self, name):
+        return name in self._scores
+
+    def set_score(self, name, value):
+        """Store a score computed elsewhere (e.g. in a batch), unless one is already cached."""
+        self._scores.setdefault(name, value)
+
+
+class TextPipeline:
+    """
+    Shared normalize/tokenize/filter/lemmatize/themes stages.
+
+    Stopwords come from the lexicon artifact and the WordNet lemmatizer is
+    created on the first lemma cache miss, so building a pipeline loads
+    nothing. Lemmas go through a bounded LemmaCache seeded with the lemmas
+    precomputed in the artifact.
+    """
+
+    def __init__(self, stop_words=None, matcher=theme_matcher, cache_size=256,
+                 lemma_cache_size=50000, preloaded_lemmas=None):
+        self._stop_words = frozenset(stop_words) if stop_words is not None else None
+        self._lemmatizer = None
+        self.lemma_cache_size = lemma_cache_size
+        self._preloaded_lemmas = preloaded_lemmas
+        self._lemma_cache = None
+        self.matcher = matcher
+        self.cache_size = cache_size
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            self._stop_words = frozenset(lexicon_artifact.stop_words())
+        return self._stop_words
+
+    @property
+    def lemmatizer(self):
+        if self._lemmatizer is None:
+            from nltk.stem import WordNetLemmatizer
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @property
+    def lemma_cache(self):
+        if self._lemma_cache is None:
+            preloaded = self._preloaded_lemmas
+            if preloaded is None:
+                preloaded = lexicon_artifact.precomputed_lemmas()
+            self._lemma_cache = LemmaCache(
+                lambda token: self.lemmatizer.lemmatize(token),
+                max_entries=self.lemma_cache_size,
+                preloaded=preloaded
+            )
+        return self._lemma_cache
+
+    def normalize(self, text):
+        return text.lower()
+
+    def tokenize(self, normalized):
+        return tokenize(normalized)
+
+    def split(self, normalized):
+        return _WORD_PARTS_RE.findall(normalized)
+
+    def filter(self, tokens):
+        stop_words = self.stop_words
+        return [token for token in tokens if token not in stop_words]
+
+    def lemmatize(self, tokens):
+        return self.lemma_cache.lemmatize_many([token for token in tokens if not token.isdigit()])
+
+    def match_themes(self, normalized):
+        return self.matcher.match(normalized, lowered=True) if self.matcher is not None else {}
+
+    def document(self, text):
+        """Return the (possibly already processed) Document for text."""
+        with self._lock:
+            doc = self._documents.get(text)
+            if doc is not None:
+                self._documents.move_to_end(text)
+                return doc
+            doc = Document(text, self)
+            if self.cache_size:
+                self._documents[text] = doc
+                if len(self._documents) > self.cache_size:
+                    self._documents.popitem(last=False)
+            return doc
+
+    def run(self, text, stages=STAGES):
+        """Return the Document for text with the named stages computed."""
+        doc = self.document(text)
+        for stage in stages:
+            if stage not in STAGES:
+                raise ValueError(f"Unknown pipeline stage: {stage}")
+            getattr(doc, stage)
+        return doc
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Process-wide pipeline shared by ml_processor and utils.text_analysis."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = TextPipeline(lemma_cache_size=Config.LEMMA_CACHE_SIZE)
+    return _pipeline
+
+
+def lemma_stats():
+    """Hit/miss/eviction counters of the shared pipeline's lemma cache."""
+    return get_pipeline().lemma_cache.stats()
@@ -0,0 +1,162 @@
+"""
+Aho-Corasick theme matcher.
+
+Theme vocabularies are compiled once into a single automaton whose alphabet
+is words rather than characters: the text is split into word tokens by one
+compiled regex, and the token sequence is run through the automaton in one
+linear pass. Matching on whole tokens gives word boundaries for free ('who'
+no longer matches 'whole', nor 'fit' 'benefit') while still supporting
+multi-word phrases. Common inflections ('friends', 'studying') and
+listed derived forms ('homesick', 'friendship') are folded onto their
+keyword through a precomputed surface-form table, and clitics are dropped
+first, so "mom's" matches 'mom'.
+"""
+import re
+from collections import deque, namedtuple
+
+_WORD_RE = re.compile(r"[^\W_]+(?:['\u2019][^\W_]+)?")
+
+# Suffixes accepted after a keyword so plural/tense variants still match
+INFLECTION_SUFFIXES = ('s', 'es', 'd', 'ed', 'ing')
+
+# Endings after an apostrophe that are not part of the word: possessive 's
+# and the contractions ('re, 've, 'll, 'm, 'd, n't)
+CLITICS = frozenset({'s', 're', 've', 'll', 'm', 'd', 't'})
+
+# Stems whose n't contraction is irregular
+_IRREGULAR_NEGATIONS = {'ca': 'can', 'wo': 'will', 'sha': 'shall'}
+
+
+def strip_clitic(token):
+    """
+    Drop a possessive or contraction ending: "mom's" -> 'mom', "they're" -> 'they',
+    "didn't" -> 'did', "can't" -> 'can'. Other apostrophes ("o'clock") are kept.
+    """
+    for apostrophe in ("'", '\u2019'):
+        if apostrophe in token:
+            base, _, ending = token.partition(apostrophe)
+            if ending not in CLITICS:
+                return token
+            if ending == 't' and base.endswith('n'):
+                base = base[:-1]
+                base = _IRREGULAR_NEGATIONS.get(base, base)
+            return base
+    return token
+
+ThemeHits = namedtuple('ThemeHits', ['count', 'positions'])
+
+
+class ThemeMatcher:
+    """
+    Multi-pattern matcher over a {theme: [keyword or phrase, ...]} vocabulary.
+
+    ``match`` returns, per theme, the number of keyword occurrences and their
+    (start, end) character spans in the lowercased text.
+    """
+
+    def __init__(self, themes, suffixes=INFLECTION_SUFFIXES, derived_forms=None):
+        self.theme_names = list(themes)
+
+        patterns = {}
+        for theme, keywords in themes.items():
+            for keyword in keywords:
+                patterns.setdefault(tuple(keyword.lower().split()), []).append(theme)
+        self._max_length = max((len(words) for words in patterns), default=0)
+
+        # Map every surface form (keyword + optional suffix) to its keyword;
+        # exact keywords win over inflected forms of other keywords
+        vocabulary = {word for words in patterns for word in words}
+        self._surface = {word: word for word in vocabulary}
+        for word in sorted(vocabulary):
+            for suffix in suffixes:
+                self._surface.setdefault(word + suffix, word)
+        # Compounds and derivations (surface form -> keyword) that suffixes miss
+        for form, word in (derived_forms or {}).items():
+            if word in vocabulary:
+                self._surface.setdefault(form, word)
+
+        # Trie over keyword tuples
+        self._goto = [{}]
+        self._output = [[]]
+        for words, pattern_themes in patterns.items():
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].extend((theme, len(words)) for theme in pattern_themes)
+
+        # Failure links, breadth first; outputs are merged along them
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _scan(self, text, lowered=False):
+        """Yield (theme, (start, end)) for every keyword occurrence in text."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        surface = self._surface
+
+        spans = []
+        state = 0
+        for match in _WORD_RE.finditer(text if lowered else text.lower()):
+            token = match.group()
+            if len(token) > 1 and not token.isalnum():
+                token = strip_clitic(token)
+            word = surface.get(token)
+            if word is None:
+                state = 0
+                spans.clear()
+                continue
+
+            spans.append(match.span())
+            if len(spans) > self._max_length:
+                del spans[0]
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for theme, length in output[state]:
+                yield theme, (spans[-length][0], spans[-1][1])
+
+    def match(self, text, lowered=False):
+        """
+        Scan text once and collect theme hits.
+
+        Pass lowered=True when text is already lowercase (e.g. a pipeline
+        document's normalized stage) to skip lowercasing it again.
+
+        Returns:
+            dict: theme -> ThemeHits(count, positions) for every theme with at
+            least one hit, in vocabulary order
+        """
+        hits = {}
+        for theme, span in self._scan(text, lowered):
+            hits.setdefault(theme, []).append(span)
+
+        return {
+            theme: ThemeHits(len(hits[theme]), hits[theme])
+            for theme in self.theme_names if theme in hits
+        }
+
+    def themes(self, text, lowered=False):
+        """Names of the themes present in text, in vocabulary order."""
+        found = set()
+        for theme, _ in self._scan(text, lowered):
+            found.add(theme)
+            if len(found) == len(self.theme_names):
+                break
+        return [theme for theme in self.theme_names if theme in found]